@@ -0,0 +1,131 @@
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from scipy.io import wavfile
+
+
+# Activity indexes kept, least recently used dropped first.
+MAX_FILES = 4
+
+_lock = threading.Lock()
+_indexes: OrderedDict[tuple, "ActivityIndex"] = OrderedDict()
+
+
+@dataclass
+class ActivityIndex:
+    """
+    Energy of consecutive frames of a signal and the spans where the signal
+    is active, that is where the analyses have something to find.
+    """
+    frame_step: float
+    energies: npt.NDArray  # dB, one per frame
+    threshold: float  # dB
+    mask: npt.NDArray  # active frames, after filling short silences
+    spans: list[tuple[float, float]]  # active times with margins, disjoint and sorted
+
+    def spans_between(self, start: float, end: float) -> list[tuple[float, float]]:
+        """The active spans overlapping [start, end], cut to it."""
+        return [
+            (max(span_start, start), min(span_end, end))
+            for span_start, span_end in self.spans
+            if span_end > start and span_start < end
+        ]
+
+    def active_at(self, times: npt.NDArray) -> npt.NDArray:
+        """Whether each time is within an active span."""
+        times = np.asarray(times)
+        if not self.spans:
+            return np.zeros(times.shape, dtype=bool)
+        starts, ends = np.array(self.spans).T
+        span = np.searchsorted(starts, times, side="right") - 1
+        return (span >= 0) & (times <= ends[np.maximum(span, 0)])
+
+
+def _runs(mask: npt.NDArray) -> tuple[npt.NDArray, npt.NDArray]:
+    """First and past-the-end indices of the runs of True."""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def activity_index(
+    x: npt.NDArray,
+    sr: float,
+    frame_step: float = 0.01,
+    dynamic_range: float = 35.0,
+    min_silence: float = 0.25,
+    min_activity: float = 0.05,
+    margin: float = 0.1,
+    block_frames: int = 100000,
+) -> ActivityIndex:
+    """
+    Activity index of the first channel of x.
+
+    A frame is active when its energy is within dynamic_range dB of the
+    level of the loud frames (their 95th percentile). Silences shorter than
+    min_silence are filled, activities shorter than min_activity dropped, and
+    the spans get margin secs on both sides so that the analysis windows of
+    their edge frames are within them.
+    """
+    if x.ndim > 1:
+        x = x[:, 0]
+    hop = max(1, int(round(frame_step * sr)))
+    frame_count = len(x) // hop
+
+    # by blocks, a long int16 file would take gigabytes as float
+    energies = np.empty(frame_count)
+    for first in range(0, frame_count, block_frames):
+        last = min(first + block_frames, frame_count)
+        frames = np.asarray(x[first * hop:last * hop], dtype=float).reshape(last - first, hop)
+        energies[first:last] = np.mean(np.square(frames), axis=1)
+    energies = 10 * np.log10(energies + 1e-12)
+
+    threshold = np.percentile(energies, 95) - dynamic_range if frame_count else 0.0
+    mask = energies > threshold
+
+    starts, ends = _runs(~mask)
+    for start, end in zip(starts, ends):
+        if 0 < start and end < frame_count and (end - start) * frame_step < min_silence:
+            mask[start:end] = True
+    starts, ends = _runs(mask)
+    for start, end in zip(starts, ends):
+        if (end - start) * frame_step < min_activity:
+            mask[start:end] = False
+
+    duration = len(x) / sr
+    spans = []
+    for start, end in zip(*_runs(mask)):
+        span_start = max(0.0, start * frame_step - margin)
+        span_end = min(duration, end * frame_step + margin)
+        if spans and span_start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], span_end)
+        else:
+            spans.append((span_start, span_end))
+
+    return ActivityIndex(frame_step, energies, threshold, mask, spans)
+
+
+def file_activity(audio_path: str) -> ActivityIndex:
+    """Activity index of a file, computed once while the file is unchanged."""
+    status = os.stat(audio_path)
+    key = (os.path.realpath(audio_path), status.st_mtime_ns, status.st_size)
+    with _lock:
+        if key in _indexes:
+            _indexes.move_to_end(key)
+            return _indexes[key]
+
+    try:
+        sample_rate, audio_data = wavfile.read(audio_path, mmap=True)
+    except ValueError:
+        # e.g. 24 bit files cannot be memory-mapped
+        sample_rate, audio_data = wavfile.read(audio_path)
+    index = activity_index(audio_data, sample_rate)
+
+    with _lock:
+        _indexes[key] = index
+        if len(_indexes) > MAX_FILES:
+            _indexes.popitem(last=False)
+    return index
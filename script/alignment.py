@@ -0,0 +1,101 @@
+import numpy as np
+import numpy.typing as npt
+
+
+ALIGNMENT_MODES = ("linear", "nearest", "previous")
+
+
+def time_grid(start: float, end: float, step: float) -> npt.NDArray:
+    """Regular time grid from start to end (included when it falls on the grid)."""
+    count = int(np.floor((end - start) / step + 1e-9)) + 1
+    return start + np.arange(max(count, 0)) * step
+
+
+def default_max_gap(x: npt.NDArray, factor: float = 2.0) -> float:
+    """Largest distance between two samples still considered continuous."""
+    if len(x) < 2:
+        return np.inf
+    return factor * float(np.median(np.diff(x)))
+
+
+def align_curve(
+    x: npt.ArrayLike,
+    y: npt.ArrayLike,
+    grid: npt.ArrayLike,
+    mode: str = "linear",
+    max_gap: float | None = None,
+) -> npt.NDArray:
+    """
+    Resamples the curve (x, y) on the time grid.
+
+    @Param mode: 'linear' interpolates between the surrounding samples,
+    'nearest' takes the closest sample and 'previous' holds the last sample
+    @Param max_gap: grid points between two samples further apart than this
+    are NaN (by default twice the median sampling step). Points outside of
+    the curve are always NaN.
+    """
+    if mode not in ALIGNMENT_MODES:
+        raise ValueError(f"Unknown alignment mode '{mode}'")
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+
+    result = np.full(len(grid), np.nan)
+    if len(x) == 0:
+        return result
+    if max_gap is None:
+        max_gap = default_max_gap(x)
+
+    # sample at or before each grid point, and the one after it
+    left = np.searchsorted(x, grid, side='right') - 1
+    inside = (left >= 0) & (grid <= x[-1])
+    left = np.clip(left, 0, len(x) - 1)
+    right = np.minimum(left + 1, len(x) - 1)
+
+    # on the last sample both neighbours are the same
+    gap = x[right] - x[left]
+    inside &= gap <= max_gap
+
+    if mode == "previous":
+        values = y[left]
+    elif mode == "nearest":
+        closer_right = (x[right] - grid) < (grid - x[left])
+        values = np.where(closer_right, y[right], y[left])
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(gap > 0, (grid - x[left]) / gap, 0.0)
+        values = y[left] + weight * (y[right] - y[left])
+        # avoid 0 * nan when the grid point is exactly on a sample
+        values = np.where(weight == 0, y[left], values)
+
+    result[inside] = values[inside]
+    return result
+
+
+def align_curves(
+    curves: dict[str, tuple[npt.ArrayLike, npt.ArrayLike]],
+    step: float,
+    mode: str = "linear",
+    start: float | None = None,
+    end: float | None = None,
+    max_gap: float | None = None,
+) -> tuple[npt.NDArray, dict[str, npt.NDArray]]:
+    """
+    Resamples every curve on one regular grid with the given step. The grid
+    spans all the curves unless start/end are given.
+
+    @Returns the grid and the resampled values of each curve
+    """
+    extents = [(x[0], x[-1]) for x, _ in curves.values() if len(x)]
+    if start is None:
+        start = min((first for first, _ in extents), default=0.0)
+    if end is None:
+        end = max((last for _, last in extents), default=0.0)
+
+    grid = time_grid(start, end, step)
+    aligned = {
+        name: align_curve(x, y, grid, mode, max_gap)
+        for name, (x, y) in curves.items()
+    }
+    return grid, aligned
@@ -0,0 +1,240 @@
+"""
+Speed and accuracy of the F0 methods of calc.get_f0.
+
+    python benchmark_f0.py                  # synthetic signal with a known f0
+    python benchmark_f0.py file.wav         # a recording, compared to praatac
+    python benchmark_f0.py --duration 600   # longer synthetic signal
+    python benchmark_f0.py --check          # online and chunked f0 checks, exits 1 on errors
+
+pyin is skipped for signals longer than --pyin-limit secs, it would take
+minutes.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+from scipy.io import wavfile
+
+from calc import get_f0
+from chunked_f0 import get_f0_chunked, praat_frame_times
+from online_features import OnlineF0
+
+
+HOP_SIZE = 0.01
+MIN_PITCH = 75
+MAX_PITCH = 600
+
+# steady tones of the checks (Hz)
+TONES = [80, 100, 120, 150, 200, 250, 300, 400, 500, 580]
+CHECK_RATES = [16000, 22050, 44100, 48000]
+# durations of the chunked checks (s), some whole multiples of the hop
+CHUNKED_DURATIONS = [60.0, 61.2345, 73.3, 80.0, 95.3]
+CHUNK_DURATION = 20.0
+
+
+def synthetic_signal(duration: float, sr: int = 16000, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Harmonic signal with a gliding f0 (80 to 320 Hz), alternating voiced
+    segments with silences and noise bursts.
+
+    @Returns signal, f0 of each sample (nan where unvoiced, -1 close to a
+    voicing boundary, where frames are not scored)
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sr)) / sr
+
+    f0 = 160 * 2 ** (np.sin(2 * np.pi * 0.3 * t) + 0.2 * np.sin(2 * np.pi * 5 * t))
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    harmonics = sum(np.sin(k * phase) / k for k in range(1, 15))
+
+    # 1.5 s voiced, 0.5 s silence, 0.5 s noise
+    position = t % 2.5
+    voiced = position < 1.5
+    noise = position >= 2.0
+
+    signal = np.where(voiced, 0.3 * harmonics, 0.0)
+    signal = signal + np.where(noise, 0.1 * rng.standard_normal(len(t)), 0.0)
+    signal = signal + 0.001 * rng.standard_normal(len(t))
+
+    margin = int(0.03 * sr)
+    truth = np.where(voiced, f0, np.nan)
+    boundary = np.abs(np.diff(voiced.astype(int), prepend=voiced[0]))
+    truth[np.convolve(boundary, np.ones(2 * margin + 1), mode="same") > 0] = -1
+
+    return signal, truth
+
+
+def frame_times(method: str, count: int, signal: np.ndarray, sr: int) -> np.ndarray:
+    """
+    Times of the frames of get_f0: Praat centres its frames in the signal,
+    pyin steps by whole samples, yin is centred on multiples of HOP_SIZE.
+    """
+    if method in ("praatac", "praatcc"):
+        f0Args = dict(method=method, hopSize=HOP_SIZE, minPitch=MIN_PITCH, maxPitch=MAX_PITCH)
+        return praat_frame_times(len(signal), sr, f0Args)[:count]
+    if method == "pyin":
+        return np.arange(count) * int(HOP_SIZE * sr) / sr
+    return np.arange(count) * HOP_SIZE
+
+
+def reference_at(times: np.ndarray, reference_times: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """
+    Reference f0 interpolated linearly at the times, nan (or -1) as soon as
+    a frame it is interpolated from is.
+    """
+    before = np.clip(np.searchsorted(reference_times, times, side="right") - 1, 0, len(reference_times) - 2)
+    weight = np.clip((times - reference_times[before]) / np.diff(reference_times)[before], 0, 1)
+    lower, upper = reference[before], reference[before + 1]
+    values = np.where(weight == 0, lower, np.where(weight == 1, upper, (1 - weight) * lower + weight * upper))
+    # an unscored frame (-1) makes the interpolated frame unscored
+    unscored = ((lower == -1) & (weight < 1)) | ((upper == -1) & (weight > 0))
+    return np.where(unscored, -1, values)
+
+
+def score(f0: np.ndarray, reference: np.ndarray) -> dict:
+    """
+    Voicing agreement, gross pitch errors (more than 20% off) and mean error
+    in cents of the frames voiced in both, f0 and reference being values at
+    the same times. Frames of the reference set to -1 are ignored.
+    """
+    scored = reference != -1
+    f0, reference = f0[scored], reference[scored]
+
+    voiced = ~np.isnan(f0)
+    reference_voiced = ~np.isnan(reference)
+    both = voiced & reference_voiced
+
+    ratio = f0[both] / reference[both]
+    return {
+        "voicing agreement (%)": 100 * np.mean(voiced == reference_voiced),
+        "gross errors (%)": 100 * np.mean(np.abs(ratio - 1) > 0.2) if both.any() else np.nan,
+        "mean error (cents)": np.mean(np.abs(1200 * np.log2(ratio))) if both.any() else np.nan,
+    }
+
+
+def steady_tones(f0: float, sr: int, duration: float = 1.0) -> dict[str, np.ndarray]:
+    """A pure tone and a harmonic-rich tone at f0."""
+    t = np.arange(int(duration * sr)) / sr
+    harmonics = sum(np.sin(2 * np.pi * k * f0 * t) / k for k in range(1, 12) if k * f0 < sr / 2)
+    return {"sine": np.sin(2 * np.pi * f0 * t), "harmonic": 0.5 * harmonics}
+
+
+def check_online_f0() -> list[str]:
+    """
+    Errors of OnlineF0 on steady tones fed in blocks: frames more than 2%
+    off the tone, octave errors in particular, or unvoiced.
+    """
+    errors = []
+    for sr in CHECK_RATES:
+        for f0 in TONES:
+            for name, signal in steady_tones(f0, sr).items():
+                feature = OnlineF0(sr, hopSize=HOP_SIZE, minPitch=MIN_PITCH, maxPitch=MAX_PITCH)
+                values = np.concatenate([feature.process(block).values for block in np.array_split(signal, 7)])
+                wrong = np.isnan(values) | (np.abs(values / f0 - 1) > 0.02)
+                if wrong.any():
+                    errors.append(
+                        f"OnlineF0 {name} {f0} Hz at {sr} Hz: {np.count_nonzero(wrong)}/{len(values)} frames wrong,"
+                        f" median {np.nanmedian(values):.1f} Hz"
+                    )
+    return errors
+
+
+def check_chunked_f0() -> list[str]:
+    """
+    Differences between get_f0_chunked and get_f0 for Praat: same frames
+    and same values.
+    """
+    errors = []
+    sr = 16000
+    for duration in CHUNKED_DURATIONS:
+        signal, _ = synthetic_signal(duration, sr)
+        for method in ("praatac", "praatcc"):
+            f0Args = dict(method=method, hopSize=HOP_SIZE, minPitch=MIN_PITCH, maxPitch=MAX_PITCH,
+                          interpUnvoiced=None, outFilter=None)
+            f0, _ = get_f0(signal, sr, **f0Args)
+            chunked, _ = get_f0_chunked(signal, sr, chunkDuration=CHUNK_DURATION, **f0Args)
+            if len(chunked) != len(f0):
+                errors.append(f"get_f0_chunked {method} {duration} s: {len(chunked)} frames, get_f0 {len(f0)}")
+            elif not np.array_equal(chunked, f0, equal_nan=True):
+                different = ~((chunked == f0) | (np.isnan(chunked) & np.isnan(f0)))
+                errors.append(
+                    f"get_f0_chunked {method} {duration} s: {np.count_nonzero(different)} frames differ,"
+                    f" by up to {np.nanmax(np.abs(chunked - f0)):.2f} Hz"
+                )
+    return errors
+
+
+def check() -> None:
+    errors = check_online_f0() + check_chunked_f0()
+    for error in errors:
+        print(error)
+    print(f"{len(errors)} errors")
+    sys.exit(1 if errors else 0)
+
+
+def run(method: str, signal: np.ndarray, sr: int) -> tuple[float, np.ndarray]:
+    start = time.perf_counter()
+    f0, _ = get_f0(
+        signal, sr, method=method, hopSize=HOP_SIZE, minPitch=MIN_PITCH,
+        maxPitch=MAX_PITCH, interpUnvoiced=None, outFilter=None,
+    )
+    return time.perf_counter() - start, f0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio_path", nargs="?", help="wav file, a synthetic signal is used otherwise")
+    parser.add_argument("--duration", type=float, default=30, help="duration of the synthetic signal (s)")
+    parser.add_argument("--pyin-limit", type=float, default=120, help="longest signal analysed with pyin (s)")
+    parser.add_argument("--methods", default="praatac,praatcc,pyin,yin")
+    parser.add_argument("--check", action="store_true", help="only run the online and chunked f0 checks")
+    args = parser.parse_args()
+
+    if args.check:
+        check()
+
+    if args.audio_path:
+        sr, signal = wavfile.read(args.audio_path)
+        if signal.ndim > 1:
+            signal = signal[:, 0]
+        signal = signal.astype(float)
+        truth = None
+    else:
+        sr = 16000
+        signal, truth = synthetic_signal(args.duration, sr)
+
+    duration = len(signal) / sr
+    print(f"{duration:.1f} s at {sr} Hz")
+
+    results = {}
+    for method in args.methods.split(","):
+        if method == "pyin" and duration > args.pyin_limit:
+            print(f"{method:8} skipped")
+            continue
+        elapsed, f0 = run(method, signal, sr)
+        results[method] = f0
+        print(f"{method:8} {elapsed:8.2f} s  ({duration / elapsed:7.1f} x real time)")
+
+    if truth is None:
+        if "praatac" not in results:
+            return
+        reference = results["praatac"]
+        reference_times = frame_times("praatac", len(reference), signal, sr)
+        print("\ncompared to praatac")
+    else:
+        print("\ncompared to the synthetic f0")
+
+    # each method is scored at the times of its own frames
+    for method, f0 in results.items():
+        times = frame_times(method, len(f0), signal, sr)
+        if truth is None:
+            expected = reference_at(times, reference_times, reference)
+        else:
+            expected = truth[np.clip(np.round(times * sr).astype(int), 0, len(truth) - 1)]
+        scores = ", ".join(f"{name} {value:.1f}" for name, value in score(f0, expected).items())
+        print(f"{method:8} {scores}")
+
+
+if __name__ == "__main__":
+    main()
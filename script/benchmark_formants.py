@@ -0,0 +1,97 @@
+"""
+Speed and agreement of the formant methods of calc.calc_formants.
+
+    python benchmark_formants.py file.wav         # a recording
+    python benchmark_formants.py                  # synthetic vowels
+    python benchmark_formants.py --duration 600   # longer synthetic signal
+
+The lpc formants are compared to the burg formants of the nearest frame.
+"""
+import argparse
+import time
+
+import numpy as np
+import parselmouth
+import scipy.signal
+
+from calc import calc_formants
+
+
+ENERGY_THRESHOLD = 20.0
+
+# F1, F2, F3 of the synthetic vowels (Hz)
+VOWELS = [(300, 2300, 3000), (700, 1200, 2600), (350, 800, 2400), (500, 1700, 2500)]
+
+
+def synthetic_signal(duration: float, sr: int = 16000, seed: int = 0) -> np.ndarray:
+    """Pulse train at 120 Hz through the resonances of a vowel changing every 0.5 s."""
+    rng = np.random.default_rng(seed)
+    count = int(duration * sr)
+    source = np.zeros(count)
+    source[::sr // 120] = 1.0
+
+    segment = sr // 2
+    signal = np.zeros(count)
+    for first in range(0, count, segment):
+        part = source[first:first + segment]
+        for frequency in VOWELS[(first // segment) % len(VOWELS)]:
+            radius = np.exp(-np.pi * 80 / sr)
+            denominator = [1, -2 * radius * np.cos(2 * np.pi * frequency / sr), radius ** 2]
+            part = scipy.signal.lfilter([1 - radius], denominator, part)
+        signal[first:first + len(part)] = part
+    signal /= np.max(np.abs(signal))
+    return 0.5 * signal + 0.001 * rng.standard_normal(count)
+
+
+def run(method: str, sound: parselmouth.Sound) -> tuple[float, tuple]:
+    # a fresh sound, so that no analysis object is taken from the cache
+    sound = sound.copy()
+    start = time.perf_counter()
+    formants = calc_formants(sound, 0, sound.xmax, ENERGY_THRESHOLD, method=method)
+    return time.perf_counter() - start, formants
+
+
+def agreement(formants: tuple, reference: tuple) -> list[dict]:
+    """Per formant: median difference (Hz) and frames within 10% of the reference frame nearest in time."""
+    times, reference_times = np.asarray(formants[0]), np.asarray(reference[0])
+    nearest = np.clip(np.searchsorted(reference_times, times), 1, len(reference_times) - 1)
+    earlier = np.abs(reference_times[nearest - 1] - times) < np.abs(reference_times[nearest] - times)
+    nearest = np.where(earlier, nearest - 1, nearest)
+
+    scores = []
+    for values, reference_values in zip(formants[1:], reference[1:]):
+        reference_values = reference_values[nearest]
+        both = ~np.isnan(values) & ~np.isnan(reference_values)
+        difference = np.abs(values[both] - reference_values[both])
+        scores.append({
+            "median difference (Hz)": np.median(difference),
+            "within 10% (%)": 100 * np.mean(difference < 0.1 * reference_values[both]),
+        })
+    return scores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio_path", nargs="?", help="wav file, a synthetic signal is used otherwise")
+    parser.add_argument("--duration", type=float, default=60, help="duration of the synthetic signal (s)")
+    args = parser.parse_args()
+
+    if args.audio_path:
+        sound = parselmouth.Sound(args.audio_path)
+    else:
+        sound = parselmouth.Sound(synthetic_signal(args.duration), 16000)
+    print(f"{sound.duration:.1f} s at {sound.sampling_frequency:.0f} Hz")
+
+    results = {}
+    for method in ("burg", "lpc"):
+        elapsed, formants = run(method, sound)
+        results[method] = formants
+        print(f"{method:5} {elapsed:8.2f} s  ({sound.duration / elapsed:7.1f} x real time), {len(formants[0])} frames")
+
+    print("\nlpc compared to burg")
+    for number, scores in enumerate(agreement(results["lpc"], results["burg"]), start=1):
+        print(f"F{number}  " + ", ".join(f"{name} {value:.1f}" for name, value in scores.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Latency and cost of the live features of online_features.
+
+    python benchmark_online_features.py             # latency of each feature
+    python benchmark_online_features.py --check     # exits 1 on errors
+
+A tone starts at a known time in a stream fed in blocks of BLOCK_DURATION,
+as the recording does. The response of each feature (half rise of ENV_AMP,
+peak of Mod_Cepstr, first voiced F0 frame) is available once the block
+completing its frame is in, and shows at the next refresh, after the time
+spent computing the block.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from online_features import BLOCK_DURATION, REFRESH_INTERVAL, OnlineFeatureExtractor
+
+
+SAMPLE_RATE = 44100
+ONSET = 1.0
+# onset positions within a block
+PHASES = 10
+TONE_F0 = 150
+# longest delay before F0 shows on the live display (s)
+F0_DISPLAY_BUDGET = 0.05
+
+
+def onset_signal(sr: int, onset: float, duration: float = 2.0) -> np.ndarray:
+    """Faint noise, then a harmonic tone from onset."""
+    t = np.arange(int(duration * sr)) / sr
+    tone = sum(np.sin(2 * np.pi * k * TONE_F0 * t + k) / k for k in range(1, 6))
+    noise = 1e-4 * np.random.default_rng(0).standard_normal(len(t))
+    return np.where(t >= onset, 0.2 * tone, 0) + noise
+
+
+def response_delays(sr: int, onset: float) -> dict[str, float]:
+    """Time after the onset at which the response of each feature is computed."""
+    extractor = OnlineFeatureExtractor(sr)
+    signal = onset_signal(sr, onset)
+    block_length = int(BLOCK_DURATION * sr)
+
+    arrivals = {name: [] for name in extractor.tracks}
+    for start in range(0, len(signal), block_length):
+        block = signal[start:start + block_length]
+        arrival = (start + len(block)) / sr
+        for name, frames in extractor.process(block).items():
+            arrivals[name].extend([arrival] * len(frames))
+
+    delays = {}
+    for name, track in extractor.tracks.items():
+        times, values = track.get_data()
+        after = times > onset - 0.1
+        if name == "ENV_AMP":
+            index = np.argmax(after & (values >= 0.5 * np.median(values[-20:])))
+        elif name == "F0":
+            index = np.argmax(after & (np.abs(values / TONE_F0 - 1) < 0.02))
+        else:
+            index = np.argmax(np.where(after, values, -np.inf))
+        delays[name] = arrivals[name][index] - onset
+    return delays
+
+
+def processing_time(sr: int, duration: float = 60.0) -> float:
+    """95th percentile of the time spent computing one block (s)."""
+    extractor = OnlineFeatureExtractor(sr)
+    signal = np.tile(onset_signal(sr, ONSET), int(np.ceil(duration / 2)))
+    block_length = int(BLOCK_DURATION * sr)
+
+    durations = []
+    for start in range(0, len(signal), block_length):
+        begin = time.perf_counter()
+        extractor.process(signal[start:start + block_length])
+        durations.append(time.perf_counter() - begin)
+    return float(np.percentile(durations, 95))
+
+
+def measure(sr: int) -> list[tuple[str, float, float, float, float, float]]:
+    """
+    Per feature: name, latency, fastest and slowest measured response over
+    the onset phases, longest display delay and the hop of the feature.
+    """
+    phases = [response_delays(sr, ONSET + phase * BLOCK_DURATION / PHASES) for phase in range(PHASES)]
+    processing = processing_time(sr)
+
+    rows = []
+    for feature in OnlineFeatureExtractor(sr).features:
+        delays = [delays[feature.name] for delays in phases]
+        display = max(delays) + REFRESH_INTERVAL + processing
+        rows.append((feature.name, feature.latency, min(delays), max(delays), display, feature.hop_length / sr))
+
+    print(f"computing a {BLOCK_DURATION * 1000:.0f} ms block: {processing * 1000:.1f} ms (95th percentile)")
+    print(f"{'feature':<12}{'latency':>10}{'measured':>20}{'display':>10}")
+    for name, latency, fastest, slowest, display, _ in rows:
+        print(
+            f"{name:<12}{latency * 1000:>8.1f}ms{fastest * 1000:>10.1f}..{slowest * 1000:.1f}ms"
+            f"{display * 1000:>8.1f}ms"
+        )
+    return rows
+
+
+def check(rows: list[tuple[str, float, float, float, float, float]]) -> None:
+    """
+    Errors: a measured response outside latency .. latency + one block (one
+    hop of tolerance for where the response is read), or F0 over its budget.
+    """
+    errors = []
+    for name, latency, fastest, slowest, display, hop in rows:
+        if fastest < latency - hop or slowest > latency + BLOCK_DURATION + hop:
+            errors.append(
+                f"{name}: measured {fastest * 1000:.1f}..{slowest * 1000:.1f} ms,"
+                f" latency {latency * 1000:.1f} ms"
+            )
+        if name == "F0" and display > F0_DISPLAY_BUDGET:
+            errors.append(f"F0 shows after {display * 1000:.1f} ms, budget {F0_DISPLAY_BUDGET * 1000:.0f} ms")
+
+    for error in errors:
+        print(error)
+    print(f"{len(errors)} errors")
+    sys.exit(1 if errors else 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sr", type=int, default=SAMPLE_RATE, help="sample rate of the stream (Hz)")
+    parser.add_argument("--check", action="store_true", help="check the latencies, exits 1 on errors")
+    args = parser.parse_args()
+
+    rows = measure(args.sr)
+    if args.check:
+        check(rows)
+
+
+if __name__ == "__main__":
+    main()
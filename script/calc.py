@@ -1,4 +1,5 @@
 import scipy
+import scipy.fft
 from parselmouth.praat import call
 import numpy.typing as npt
 from librosa.feature import rms,mfcc as mfccSpectr
@@ -8,12 +9,17 @@ import numpy as np
 import xarray as xr
 import parselmouth
 import inspect
+from dataclasses import dataclass
 from scipy.signal import hilbert, butter, filtfilt, sosfiltfilt, savgol_filter, firwin,\
     find_peaks
 from scipy.signal import butter, filtfilt, hilbert
 from scipy.interpolate import interp1d
 from scipy import interpolate
 import copy
+from fractions import Fraction
+
+from praat_py_ui.praat_cache import analysis, samples_sound
+from region_analysis import frame_aligned_part
 
 
 from findiff import FinDiff
@@ -137,37 +143,233 @@ def calc_formants(
     max_number_of_formants: int = 5,
     maximum_formant: float = 5500.0,
     window_length: float = 0.025,
-    pre_emphasis_from: float = 50.0
+    pre_emphasis_from: float = 50.0,
+    method: str = "burg",
+    spans: list[tuple[float, float]] | None = None
 ):
-    formants = sound.to_formant_burg(
-        time_step=time_step,
-        max_number_of_formants=max_number_of_formants,
-        maximum_formant=maximum_formant,
-        window_length=window_length,
-        pre_emphasis_from=pre_emphasis_from
+    """
+    First three formants of the frames of sound between start_time and
+    end_time whose intensity is above energy_threshold (dB).
+
+    method is "burg" (Praat's To Formant (burg)) or "lpc" (lpc_formants, on
+    the same frames, all of them at once in numpy).
+
+    With spans (e.g. the active spans of activity.ActivityIndex), only the
+    parts of the sound within them are analysed. The parts are cut so that
+    their frames are frames of the whole sound (see formant_frame_times)
+    and, as without spans, the frames are kept or dropped by the intensity
+    of the whole sound. The values still differ a little from those of the
+    whole sound: Praat's formants of a frame depend slightly on the extent
+    of the analysed sound, enough to swap weak formants in a few frames.
+    """
+    if method not in ("burg", "lpc"):
+        raise ValueError(f"Unknown formant method: {method}")
+
+    grid = formant_frame_times(
+        sound.xmin, sound.xmax, sound.x1, sound.n_samples, sound.sampling_frequency,
+        time_step, maximum_formant, window_length,
     )
-    time_values = formants.ts()
+    if spans is None:
+        parts = [(sound, start_time, end_time)]
+    else:
+        parts = [
+            (frame_aligned_part(sound, first, last, time_step, 2 * window_length, grid[0]), first, last)
+            for first, last in (
+                (max(span_start, start_time), min(span_end, end_time)) for span_start, span_end in spans
+            )
+            if first < last
+        ]
 
-    formant_values = {
-        i: {time: formants.get_value_at_time(formant_number=i, time=time) for time in time_values if start_time <= time <= end_time}
-        for i in range(1, 4)
-    }
+    times, values = [np.zeros(0)], [np.zeros((0, 3))]
+    for part, first, last in parts:
+        part_times, part_values = _formant_frames(
+            part, method, time_step, max_number_of_formants, maximum_formant, window_length, pre_emphasis_from
+        )
+        # the times of the frames of the whole sound, equal and not only within rounding
+        frames = np.round((part_times - grid[0]) / time_step).astype(int)
+        on_grid = (0 <= frames) & (frames < len(grid))
+        part_times, part_values = grid[frames[on_grid]], part_values[on_grid]
+        inside = (first <= part_times) & (part_times <= last)
+        times.append(part_times[inside])
+        values.append(part_values[inside])
+    times, values = np.concatenate(times), np.concatenate(values)
 
-    intensities = sound.to_intensity()
-    frame_energies = {time: intensities.get_value(time) for time in time_values}
+    intensities = analysis(sound, "To Intensity", 100, 0.0, "yes")
+    # linear between the intensity frames, undefined beyond half a frame outside them as with get_value
+    frame_times = intensities.xs()
+    energies = np.interp(times, frame_times, intensities.values[0])
+    margin = 0.5 * intensities.dx
+    energies[(times < frame_times[0] - margin) | (times > frame_times[-1] + margin)] = np.nan
+    kept = energies > energy_threshold
+    values = values[kept]
 
-    filtered_formant_values = {
-        i: {time: value for time, value in formant_values[i].items() if frame_energies.get(time, 0) > energy_threshold}
-        for i in range(1, 4)
-    }
+    return list(times[kept]), values[:, 0], values[:, 1], values[:, 2]
 
-    time_values_filtered = sorted(filtered_formant_values[1].keys())
-    resampled_formants = {
-        i: np.array([filtered_formant_values[i][time] for time in time_values_filtered])
-        for i in range(1, 4)
-    }
 
-    return time_values_filtered, resampled_formants[1], resampled_formants[2], resampled_formants[3]
+def formant_frame_times(
+    xmin: float,
+    xmax: float,
+    x1: float,
+    sample_count: int,
+    sampling_frequency: float,
+    time_step: float,
+    maximum_formant: float,
+    window_length: float,
+):
+    """
+    Times of the frames of Praat's To Formant (burg) of a sound from xmin
+    to xmax whose first sample is at x1, placed as Praat places them: the
+    sound is resampled at twice maximum_formant over the same interval and
+    the frames, which last twice window_length, are centred in it. They are
+    Praat's times within rounding (about 1e-14 s), without analysing.
+    """
+    dx = 1 / sampling_frequency
+    sr = 2 * maximum_formant
+    if abs(sr * dx - 1) >= 1e-12:
+        sample_count = int(np.floor((xmax - xmin) * sr + 0.5))
+        dx = 1 / sr
+        x1 = 0.5 * (xmin + xmax - (sample_count - 1) * dx)
+    count = max(0, int(np.floor((sample_count * dx - 2 * window_length) / time_step)) + 1)
+    first = x1 + 0.5 * ((sample_count - 1) * dx - (count - 1) * time_step)
+    return first + np.arange(count) * time_step
+
+
+def _formant_frames(sound, method, time_step, max_number_of_formants, maximum_formant, window_length, pre_emphasis_from):
+    """Times of the frames of sound and their first three formants, one row per frame."""
+    if method == "lpc":
+        times, values = lpc_formants(
+            sound.values[0], sound.sampling_frequency,
+            time_step=time_step,
+            max_number_of_formants=max_number_of_formants,
+            maximum_formant=maximum_formant,
+            window_length=window_length,
+            pre_emphasis_from=pre_emphasis_from,
+        )
+        values = np.pad(values, ((0, 0), (0, max(0, 3 - values.shape[1]))), constant_values=np.nan)
+        return times + sound.xmin, values[:, :3]
+
+    formants = analysis(
+        sound, "To Formant (burg)",
+        time_step, max_number_of_formants, maximum_formant, window_length, pre_emphasis_from
+    )
+    times = np.array(formants.ts())
+    values = np.array([
+        [formants.get_value_at_time(formant_number=i, time=time) for i in range(1, 4)]
+        for time in times
+    ]).reshape(len(times), 3)
+    return times, values
+
+
+def lpc_formants(
+    x: npt.NDArray,
+    sr: float,
+    /,*,
+    time_step: float = 0.005,
+    max_number_of_formants: int = 5,
+    maximum_formant: float = 5500.0,
+    window_length: float = 0.025,
+    pre_emphasis_from: float = 50.0,
+    block_size: int = 4096
+):
+    """
+    Formants of x by autocorrelation LPC, computed for blocks of frames at
+    once: the frames are a strided view of the signal, their autocorrelations
+    are computed lag by lag for the whole block, the Levinson-Durbin recursion
+    runs over all the frames of a block together and the roots of the predictors are the
+    eigenvalues of a stack of companion matrices.
+
+    The analysis follows Praat's To Formant (burg): the signal is resampled
+    to twice maximum_formant and pre-emphasised, the Gaussian windows last
+    twice window_length, the predictors have 2 * max_number_of_formants
+    coefficients and the frames are Praat's (see formant_frame_times).
+    Formants below 50 Hz or
+    within 50 Hz of maximum_formant are dropped, the others are numbered
+    by increasing frequency in each frame.
+
+    Input
+    ----------
+    x : one dimensional np array
+        Input signal.
+    sr : float
+        sampling rate.
+    time_step, max_number_of_formants, maximum_formant, window_length, pre_emphasis_from : optional
+        as in Praat's To Formant (burg).
+    block_size : int, optional
+        number of frames analysed at once, it bounds the memory used. The default is 4096.
+
+    Output
+    -------
+    times : np.array
+        time of the frame centres, the first sample of x at time 0.
+    formants : np.array
+        formant frequencies, one row per frame and max_number_of_formants
+        columns, nan where a frame has fewer formants.
+    """
+    x = np.asarray(x, dtype=float)
+    duration = len(x) / sr
+    times = formant_frame_times(0.0, duration, 0.5 / sr, len(x), sr, time_step, maximum_formant, window_length)
+
+    newSr = 2 * maximum_formant
+    if abs(newSr - sr) > 1e-6 * sr:
+        ratio = Fraction(newSr / sr).limit_denominator(1000)
+        x = scipy.signal.resample_poly(x, ratio.numerator, ratio.denominator)
+        newSr = sr * ratio.numerator / ratio.denominator
+    else:
+        newSr = sr
+
+    # pre-emphasis, a first order high pass
+    alpha = np.exp(-2 * np.pi * pre_emphasis_from / newSr)
+    x = np.concatenate([x[:1], x[1:] - alpha * x[:-1]])
+
+    halfWin = int(2 * window_length * newSr) // 2 - 1
+    winLen = 2 * halfWin
+    order = 2 * max_number_of_formants
+    nFrames = len(times)
+    if nFrames < 1 or winLen <= order:
+        return np.zeros(0), np.zeros((0, max_number_of_formants))
+
+    starts = np.floor(times * newSr - 0.5).astype(int) - halfWin + 1
+    starts = np.clip(starts, 0, len(x) - winLen)
+
+    # Praat's Gaussian window
+    edge = np.exp(-12)
+    i = np.arange(1, winLen + 1)
+    window = (np.exp(-48 * (i - 0.5 * (winLen + 1)) ** 2 / (winLen + 1) ** 2) - edge) / (1 - edge)
+
+    frames = np.lib.stride_tricks.sliding_window_view(x, winLen)
+    formants = np.full((nFrames, max_number_of_formants), np.nan)
+
+    for first in range(0, nFrames, block_size):
+        block = frames[starts[first:first + block_size]] * window
+        r = np.stack([np.einsum("ij,ij->i", block[:, :winLen - k], block[:, k:]) for k in range(order + 1)], axis=1)
+
+        # Levinson-Durbin over all the frames of the block
+        silent = r[:, 0] <= 1e-20 * max(np.max(r[:, 0]), 1e-300)
+        r[silent, 0] = 1.0
+        a = np.zeros((len(block), order + 1))
+        a[:, 0] = 1
+        err = r[:, 0].copy()
+        for k in range(1, order + 1):
+            acc = np.sum(a[:, :k] * r[:, k:0:-1], axis=1)
+            refl = -acc / err
+            a[:, 1:k + 1] = a[:, 1:k + 1] + refl[:, None] * a[:, k - 1::-1][:, :k]
+            err = err * (1 - refl ** 2)
+            err[err <= 0] = 1e-300
+
+        # roots of 1 + a1 z^-1 + ... as eigenvalues of companion matrices
+        companion = np.zeros((len(block), order, order))
+        companion[:, 0, :] = -a[:, 1:]
+        companion[:, np.arange(1, order), np.arange(order - 1)] = 1
+        roots = np.linalg.eigvals(companion)
+
+        freqs = np.angle(roots) * newSr / (2 * np.pi)
+        valid = (roots.imag > 0) & (freqs >= 50) & (freqs <= maximum_formant - 50)
+        valid[silent] = False
+        freqs = np.sort(np.where(valid, freqs, np.inf), axis=1)[:, :max_number_of_formants]
+        freqs[np.isinf(freqs)] = np.nan
+        formants[first:first + len(block), :freqs.shape[1]] = freqs
+
+    return times, formants
 
 #script Philipp Buech code source : https://github.com/phbuech/adatool
 def read_AG50x(path_to_pos_file,target_sample_rate=200):
@@ -230,7 +432,8 @@ def calculate_amplitude_envelope(
                     outFiltType:str='low',
                     outFiltCutOff:list|npt.NDArray=[12], 
                     outFiltLen:int=6,  
-                    outFiltPolyOrd:int=3
+                    outFiltPolyOrd:int=3,
+                    outSr:None|float=None
                   ):
     
     """
@@ -243,7 +446,8 @@ def calculate_amplitude_envelope(
             equal to winLen secs and spaced by hopLen secs
         RMSpraat: Root mean square applied by Praat to windows sized on the basis of the 
             minimum pitch 
-        Hilb: absolute value of the signal's Hilbert transform 
+        Hilb: absolute value of the signal's Hilbert transform, computed by
+            blocks for long signals (see hilbert_envelope)
         
     Input
     -------
@@ -275,6 +479,10 @@ def calculate_amplitude_envelope(
         outFiltPolyOrd (positive integer): order of the polinomial used by sg (Savitsky Golay) filter
         
         center (Boolean, default=True): center the result on its mean or not
+        
+        outSr (positive float or None, default=None): output rate in Hertz of method 
+            'Hilb', the envelope is averaged over consecutive groups of samples. 
+            None keeps the sampling rate of the signal
          
     Ouput
     -------
@@ -283,19 +491,13 @@ def calculate_amplitude_envelope(
     
     if method=='Hilb': # amplitude via Hilbert transform
     
-        amp=np.abs(hilbert(x))
-        
-        ampT=np.arange(len(x))/sr
-        
-        ampSr=sr
+        amp, ampT, ampSr = hilbert_envelope(x, sr, outSr=outSr)
     
     elif method=='RMSpraat': # RMS informed by minimum pitch (calls praat)
         
-        xObj=parselmouth.Sound(values= x,
-                          sampling_frequency = sr, 
-                          start_time = 0.0)
+        xObj=samples_sound(x, sr)
         
-        tmpPitch = call(xObj, "To Pitch", hopLen, 50, 700)
+        tmpPitch = analysis(xObj, "To Pitch", hopLen, 50, 700)
         
         tmpPitch = tmpPitch.selected_array['frequency']
         
@@ -303,18 +505,18 @@ def calculate_amplitude_envelope(
         
         quants = np.quantile(tmpPitch, [0.25, 0.75])
         
-        tmpPitch = call(xObj, "To Pitch", hopLen,
+        tmpPitch = analysis(xObj, "To Pitch", hopLen,
                         0.75*quants[0], 2.5*quants[1])
         
         tmpPitch = tmpPitch.selected_array['frequency']
         
         if np.min(tmpPitch) > 120:
             
-            amp = call(xObj, "To Intensity", np.min(
+            amp = analysis(xObj, "To Intensity", np.min(
                 tmpPitch), hopLen, 1)
         else:
             
-            amp = call(xObj, "To Intensity", 120, 1/sr, 1)
+            amp = analysis(xObj, "To Intensity", 120, 1/sr, 1)
         
         
         ampSr=1/amp.get_time_step()
@@ -329,8 +531,6 @@ def calculate_amplitude_envelope(
         winLen=int(winLen*sr)
         
         amp=rms(y=x, frame_length=winLen, hop_length=frLen, center=center, pad_mode='constant').flatten()
-    
-    if (method!='hilb')& (method!='RMSpraat'):
         
         ampT=np.arange(len(amp))*hopLen
         
@@ -342,6 +542,73 @@ def calculate_amplitude_envelope(
     
     return amp, ampT
 
+def hilbert_envelope(
+                    x:npt.NDArray,
+                    sr:float,
+                    /,*,
+                    outSr:None|float=None,
+                    blockLen:int=2**16,
+                    overlap:int=2**13
+                  ):
+    """
+    Absolute value of the analytic signal of x, computed by blocks of
+    blockLen samples for long signals: each block is transformed with
+    overlap samples of the signal on both sides, zero padded to a fast FFT
+    length, and only its middle is kept. The memory used and the time per
+    sample do not depend on the length of the signal (a single FFT of a
+    prime-ish length is much slower), x can be a memory-mapped array.
+    Signals shorter than a padded block are transformed at once.
+    
+    Input
+    -------
+        x (numpy array): input signal
+        
+        sr (positive float): sampling freq in Hertz
+        
+        outSr (positive float or None, default=None): output rate in Hertz. The
+            envelope is averaged over groups of round(sr/outSr) samples, within
+            each block, so the full rate envelope is never stored
+        
+        blockLen, overlap (positive integers): samples kept per block and
+            samples of context on each side. The context bounds the error of the
+            blocks, the kernel of the Hilbert transform decays as 1/t
+    
+    Ouput
+    -------
+        np array: envelope
+        
+        np array: time of each value in secs (centre of its group of samples)
+        
+        float: rate of the envelope in Hertz
+    """
+    factor = 1 if outSr is None else max(1, int(round(sr / outSr)))
+    # whole groups of samples per block
+    blockLen = max(factor, blockLen // factor * factor)
+    
+    n = len(x)
+    if n <= blockLen + 2*overlap:
+        blocks = [np.abs(hilbert(np.asarray(x, dtype=float)))]
+    else:
+        blocks = []
+        for first in range(0, n, blockLen):
+            segFirst = max(0, first - overlap)
+            seg = np.asarray(x[segFirst:min(n, first + blockLen + overlap)], dtype=float)
+            analytic = hilbert(seg, N=scipy.fft.next_fast_len(len(seg)))
+            keep = first - segFirst
+            blocks.append(np.abs(analytic[keep:keep + min(blockLen, n - first)]))
+    
+    if factor > 1:
+        # the last group of the last block can be shorter
+        blocks = [np.add.reduceat(block, np.arange(0, len(block), factor)) / 
+                  np.diff(np.append(np.arange(0, len(block), factor), len(block)))
+                  for block in blocks]
+    
+    amp = np.concatenate(blocks)
+    ampSr = sr / factor
+    ampT = (np.arange(len(amp))*factor + (factor - 1)/2)/sr
+    
+    return amp, ampT, ampSr
+
 def interp_NAN(
         X:npt.NDArray, 
         method:str='linear'
@@ -383,6 +650,171 @@ def interp_NAN(
 
     newX[mynans] = justnans[mynans]
     return newX
+def yin(x:npt.NDArray,
+        sr:float,
+        /,*,
+        hopSize:float=0.01,
+        minPitch:float=75,
+        maxPitch:float=600,
+        threshold:float=0.2,
+        candNum:int=5,
+        silenceThresh:float=0.03,
+        octaveCost:float=0.01,
+        octaveJumpCost:float=0.35,
+        voicedUnvoicedCost:float=0.14,
+        blockSize:int=2048
+        ):
+    """
+    Compute the f0 of the signal x sampled at sr Hertz with the YIN difference
+    function, for frames centred every hopSize secs.
+    
+    The difference functions of a block of frames are computed at once from
+    FFT cross-correlations (spread over all cores by scipy.fft), then the 
+    candNum best local minima of each frame's cumulative mean normalised 
+    difference are kept as candidates. The path through the candidates and 
+    the unvoiced state is chosen by a Viterbi search with Praat's costs: 
+    octave cost, octave jump cost, voiced/unvoiced cost and silence threshold
+    (relative to the peak amplitude of the signal).
+    
+    Input
+    ----------
+    x : one dimensional np array
+        Input signal.
+    sr : float
+        sampling rate.
+    hopSize : float, optional
+        time between two frames in secs. The default is 0.01.
+    minPitch, maxPitch : float, optional
+        range of the f0 values searched. The defaults are 75 and 600.
+    threshold : float, optional
+        normalised difference at which a candidate is as good as the unvoiced 
+        state: lower values give fewer voiced frames. The default is 0.2.
+    candNum : int, optional
+        number of candidates per frame. The default is 5.
+    silenceThresh, octaveCost, octaveJumpCost, voicedUnvoicedCost : float, optional
+        see get_f0
+    blockSize : int, optional
+        number of frames analysed at once, it bounds the memory used. The default is 2048.
+    
+    Output
+    -------
+    f0 : np.array
+        sequence of f0 values, nan for unvoiced frames.
+    f0t : np.array
+        sequence of time stamps.
+    """
+    x = np.asarray(x, dtype=float)
+    
+    tauMin = max(2, int(np.floor(sr / maxPitch)))
+    tauMax = int(np.ceil(sr / minPitch))
+    winLen = tauMax  # length of the integration window
+    frameLen = winLen + tauMax + 2
+    nfft = scipy.fft.next_fast_len(frameLen + winLen)
+    
+    nFrames = int(np.floor(len(x) / sr / hopSize)) + 1
+    f0t = np.arange(nFrames) * hopSize
+    
+    # frames centred on the time stamps, zeros beyond the signal
+    xPad = np.pad(x - np.mean(x), (frameLen, frameLen))
+    starts = np.round(f0t * sr).astype(int) + frameLen - frameLen // 2
+    globalPeak = max(np.max(np.abs(xPad)), np.finfo(float).tiny)
+    
+    taus = np.arange(tauMin, tauMax + 1)
+    freqs = np.ones((nFrames, candNum))
+    costs = np.full((nFrames, candNum + 1), np.inf)
+    
+    for first in range(0, nFrames, blockSize):
+        blockStarts = starts[first:first + blockSize]
+        frames = xPad[blockStarts[:, None] + np.arange(frameLen)]
+        
+        # d(tau) = sum_j (x_j - x_j+tau)^2 for j < winLen, through the cross-correlation
+        spectrum = scipy.fft.rfft(frames, nfft, axis=1, workers=-1)
+        window = scipy.fft.rfft(frames[:, :winLen], nfft, axis=1, workers=-1)
+        corr = scipy.fft.irfft(np.conj(window) * spectrum, nfft, axis=1, workers=-1)[:, :tauMax + 2]
+        
+        energy = np.concatenate((np.zeros((len(frames), 1)), np.cumsum(frames**2, axis=1)), axis=1)
+        lags = np.arange(tauMax + 2)
+        diff = energy[:, [winLen]] + energy[:, lags + winLen] - energy[:, lags] - 2 * corr
+        diff[:, 0] = 0
+        diff = np.maximum(diff, 0)
+        
+        # cumulative mean normalised difference
+        cumDiff = np.cumsum(diff[:, 1:], axis=1)
+        cmnd = np.ones_like(diff)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cmnd[:, 1:] = np.where(cumDiff > 0, diff[:, 1:] * lags[1:] / cumDiff, 1)
+        
+        # local minima in [tauMin, tauMax]
+        before, here, after = cmnd[:, taus - 1], cmnd[:, taus], cmnd[:, taus + 1]
+        minima = np.where((here < before) & (here <= after), here, np.inf)
+        
+        k = min(candNum, len(taus))
+        best = np.argpartition(minima, k - 1, axis=1)[:, :k]
+        value = np.take_along_axis(minima, best, axis=1)
+        
+        # parabolic interpolation around each minimum
+        a = np.take_along_axis(before, best, axis=1)
+        c = np.take_along_axis(after, best, axis=1)
+        curvature = a - 2 * value + c
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shift = np.where(curvature > 0, (a - c) / (2 * curvature), 0)
+        shift = np.clip(np.nan_to_num(shift), -0.5, 0.5)
+        candidates = sr / (taus[best] + shift)
+        value = value - (a - c) * shift / 4
+        
+        rows = slice(first, first + len(frames))
+        freqs[rows, :k] = np.where(np.isfinite(value), candidates, 1)
+        costs[rows, :k] = value - octaveCost * np.log2(freqs[rows, :k] / minPitch)
+        
+        # unvoiced state, favoured in frames much weaker than the signal's peak
+        localPeak = np.max(np.abs(frames[:, :winLen + tauMin]), axis=1) / globalPeak
+        silence = np.maximum(0, 2 - localPeak / (silenceThresh / (1 + threshold)))
+        costs[rows, candNum] = threshold - silence
+    
+    # the costs of Praat are given for a time step of 10 ms
+    timeStepCorrection = 0.01 / hopSize
+    path = _viterbi(costs, np.log2(freqs), octaveJumpCost * timeStepCorrection,
+                    voicedUnvoicedCost * timeStepCorrection, blockSize)
+    
+    voiced = path < candNum
+    f0 = np.full(nFrames, np.nan)
+    f0[voiced] = freqs[voiced, path[voiced]]
+    return f0, f0t
+
+def _viterbi(costs, logFreqs, jumpCost, voicingCost, blockSize):
+    """
+    Cheapest path through the candidates (the last state being unvoiced) given
+    their local costs, a cost per octave jumped between two voiced frames and a 
+    cost for each voicing change.
+    """
+    nFrames, nStates = costs.shape
+    unvoiced = nStates - 1
+    states = np.arange(nStates)
+    back = np.zeros((nFrames, nStates), dtype=np.intp)
+    total = costs[0].copy()
+    
+    for first in range(1, nFrames, blockSize):
+        last = min(nFrames, first + blockSize)
+        # transition costs of the block, computed at once
+        trans = np.empty((last - first, nStates, nStates))
+        trans[:, :unvoiced, :unvoiced] = jumpCost * np.abs(
+            logFreqs[first - 1:last - 1, :, None] - logFreqs[first:last, None, :])
+        trans[:, unvoiced, :unvoiced] = voicingCost
+        trans[:, :unvoiced, unvoiced] = voicingCost
+        trans[:, unvoiced, unvoiced] = 0
+        
+        for t in range(first, last):
+            paths = total[:, None] + trans[t - first]
+            previous = paths.argmin(axis=0)
+            back[t] = previous
+            total = paths[previous, states] + costs[t]
+    
+    path = np.empty(nFrames, dtype=np.intp)
+    path[-1] = np.argmin(total)
+    for t in range(nFrames - 1, 0, -1):
+        path[t - 1] = back[t, path[t]]
+    return path
+
 def get_f0(x:npt.NDArray,
            sr:float,
            method:str='praatac', 
@@ -416,12 +848,15 @@ def get_f0(x:npt.NDArray,
            no_trough_prob:float=0.01, 
            pyinfill_na:float=np.nan, 
            pyincenter:bool=True, 
-           pyinpad_mode:str='constant'
+           pyinpad_mode:str='constant',
+           
+           yinThresh:float=0.2,
+           yinCandNum:int=5
            ):
     """
     Compute f0 of input audio signal x sampled at frequency sr with step size 
-    equal to hopSize secs according to three different methods: praat auto correlation,
-    praat cross correlation and pyin as implemented in Librosa.
+    equal to hopSize secs according to four different methods: praat auto correlation,
+    praat cross correlation, pyin as implemented in Librosa and yin (see function yin).
     
     Optionally the minimum and maximum f0 parameters can be adjusted after a first 
     estimation of the f0. This is done by setting them equal to two predetermined 
@@ -441,7 +876,7 @@ def get_f0(x:npt.NDArray,
     sr : float
         sampling rate.
     method : str, optional
-        f0 computation method. One among praatac, praatcc and pyin. The default is 'praatac'.
+        f0 computation method. One among praatac, praatcc, pyin and yin. The default is 'praatac'.
     hopSize : float, optional
         analysis hop size in seconds. The default is 0.01.
     minPitch : float, optional
@@ -477,7 +912,8 @@ def get_f0(x:npt.NDArray,
     outFiltPolyOrd (positive integer): order of the polinomial used by sg 
         (Savitsky Golay) filter. The default is 3.
         
-        ----------------------- PRAAT's specific parameters
+        ----------------------- PRAAT's specific parameters (the silence threshold 
+        and the costs are also used by yin)
     maxCandNum : int, optional
         maximum number of candidates (praat). The default is 15.
     veryAccurate : bool, optional
@@ -519,6 +955,12 @@ def get_f0(x:npt.NDArray,
     pyinpad_mode : str, optional
         see pad_mode in librosa.pyin for DESCRIPTION. The default is 'constant'.
     
+        ----------------------- YIN's specific parameters
+    yinThresh : float, optional
+        see threshold in yin for DESCRIPTION. The default is 0.2.
+    yinCandNum : int, optional
+        see candNum in yin for DESCRIPTION. The default is 5.
+    
     Output
     -------
     f0 : np.array
@@ -538,11 +980,9 @@ def get_f0(x:npt.NDArray,
         else:
             myMethStr="To Pitch (cc)"
 
-        xObj=parselmouth.Sound(values= x,
-                          sampling_frequency = sr, 
-                          start_time = 0.0)
+        xObj=samples_sound(x, sr)
         
-        f0obj= call(xObj, myMethStr, hopSize, minPitch, maxCandNum,veryAccurate,
+        f0obj= analysis(xObj, myMethStr, hopSize, minPitch, maxCandNum,veryAccurate,
              silenceThresh, voicingThresh, octaveCost,octaveJumpCost,voicedUnvoicedCost,maxPitch)
         
         if minMaxQuant is not None:
@@ -552,7 +992,7 @@ def get_f0(x:npt.NDArray,
             f0 = f0[f0 > 20]
             quants = np.quantile(f0, [minMaxQuant[0], minMaxQuant[1]])
             
-            f0obj = f0obj= call(xObj, "To Pitch (ac)", hopSize, quants[0], maxCandNum,veryAccurate,
+            f0obj = f0obj= analysis(xObj, myMethStr, hopSize, quants[0], maxCandNum,veryAccurate,
                  silenceThresh, voicingThresh, octaveCost,octaveJumpCost,voicedUnvoicedCost,quants[1])
             
         f0=f0obj.selected_array['frequency']   
@@ -582,6 +1022,45 @@ def get_f0(x:npt.NDArray,
          
         f0t=np.arange(len(f0))*hopSize
 
+    if method=='yin':
+        yinArgs=dict(hopSize=hopSize, threshold=yinThresh, candNum=yinCandNum,
+                     silenceThresh=silenceThresh, octaveCost=octaveCost,
+                     octaveJumpCost=octaveJumpCost, voicedUnvoicedCost=voicedUnvoicedCost)
+        f0,f0t=yin(x, sr, minPitch=minPitch, maxPitch=maxPitch, **yinArgs)
+        
+        if minMaxQuant is not None:
+            
+            f0 = f0[np.isnan(f0)==0]
+            quants = np.quantile(f0, [minMaxQuant[0], minMaxQuant[1]])
+            
+            f0,f0t=yin(x, sr, minPitch=quants[0], maxPitch=quants[1], **yinArgs)
+
+    f0=postprocess_f0(f0, hopSize=hopSize, interpUnvoiced=interpUnvoiced, outFilter=outFilter,
+                      outFiltType=outFiltType, outFiltCutOff=outFiltCutOff, outFiltLen=outFiltLen,
+                      outFiltPolyOrd=outFiltPolyOrd)
+    
+    return f0,f0t
+
+def postprocess_f0(f0:npt.NDArray,
+                   /,*,
+                   hopSize:float=0.01,
+                   interpUnvoiced:None|str="linear",
+                   outFilter:str='iir',
+                   outFiltType:str='low',
+                   outFiltCutOff:list|npt.NDArray=[None], 
+                   outFiltLen:int=6,  
+                   outFiltPolyOrd:int=3
+                   ):
+    """
+    Post-processing of get_f0 applied to a raw f0 sequence (nan where unvoiced) 
+    sampled every hopSize secs: interpolation of the unvoiced portions and 
+    output filter (see get_f0 for the parameters).
+    """
+    if (interpUnvoiced is None) & (outFilter is not None):
+        raise Exception(inspect.cleandoc("""Post processing filters should be applied (outFiltes is not None) \
+        but unvoiced regions are not interpolated (interpUnvoiced is None).
+        Cannot filter f0 signal with gaps due to unvoiced regions"""))
+
     if interpUnvoiced is not None:
         
        f0=interp_NAN(f0,interpUnvoiced)
@@ -589,7 +1068,7 @@ def get_f0(x:npt.NDArray,
     if outFilter is not None:
         f0=applyFilter(f0,1/hopSize,filt=outFilter,cutOff=outFiltCutOff, filtLen=outFiltLen, filtType=outFiltType,polyOrd=outFiltPolyOrd)
     
-    return f0,f0t
+    return f0
 def get_velocity(
         x: np.ndarray,
         sr: float,
@@ -648,39 +1127,220 @@ def get_velocity(
         raise ValueError("Méthode inconnue. Utilisez 'gradient', 'sg' ou 'finDiff'.")
     
     return y
+@dataclass
+class PeakAnalysis:
+    min_times: np.ndarray
+    min_values: np.ndarray
+    max_times: np.ndarray
+    max_values: np.ndarray
+
+
 class MinMaxFinder:
     def find_in_interval(self, times: list[float], values: list[float], interval: tuple[float, float]) -> tuple[np.ndarray[float], np.ndarray[float]]:
+        """Cut out the samples within interval (bounds included), times must be sorted."""
+        times = np.asarray(times)
+        values = np.asarray(values)
         start, end = interval
-        interval_times = []
-        interval_values = []
-        for time, value in zip(times, values):
-            in_interval: bool = start <= time and time <= end
-            if not in_interval:
-                continue
-            interval_times.append(time)
-            interval_values.append(value)
-        return np.array(interval_times), np.array(interval_values)
-
-    def analyse_minimum(self, x, y, interval):
+        first = np.searchsorted(times, start, side='left')
+        last = np.searchsorted(times, end, side='right')
+        return times[first:last], values[first:last]
+
+    def peak_options(self, times: np.ndarray, prominence: float | None = None, width: float | None = None, distance: float | None = None) -> dict:
+        """
+        Convert width and distance, given in seconds, to the number of samples
+        expected by scipy.signal.find_peaks.
+        """
+        options = {"prominence": prominence}
+        if width is None and distance is None:
+            return options
+
+        step = np.median(np.diff(times)) if len(times) > 1 else 0
+        if step <= 0:
+            return options
+
+        if width is not None:
+            options["width"] = width / step
+        if distance is not None:
+            options["distance"] = max(1, distance / step)
+        return options
+
+    def analyse_minimum(self, x, y, interval, prominence=None, width=None, distance=None):
         if interval is None:
             print("No interval specified.")
             return [], []
         interval_times, interval_values = self.find_in_interval(x, y, interval)
-        min_peaks, _ = scipy.signal.find_peaks(-interval_values)
+        options = self.peak_options(interval_times, prominence, width, distance)
+        min_peaks, _ = scipy.signal.find_peaks(-interval_values, **options)
         if len(min_peaks) == 0:
             return [], []
         min_times = interval_times[min_peaks]
         min_values = interval_values[min_peaks]
         return min_times, min_values
 
-    def analyse_maximum(self, x, y, interval):
+    def analyse_maximum(self, x, y, interval, prominence=None, width=None, distance=None):
         if interval is None:
             print("No interval specified.")
             return [], []
         interval_times, interval_values = self.find_in_interval(x, y, interval)
-        max_peaks, _ = scipy.signal.find_peaks(interval_values)
+        options = self.peak_options(interval_times, prominence, width, distance)
+        max_peaks, _ = scipy.signal.find_peaks(interval_values, **options)
         if len(max_peaks) == 0:
             return [], []
         max_times = interval_times[max_peaks]
         max_values = interval_values[max_peaks]
         return max_times, max_values
+
+    def analyse_batch(
+        self,
+        curves: dict,
+        interval: tuple[float, float],
+        prominence: float | None = None,
+        width: float | None = None,
+        distance: float | None = None,
+    ) -> dict:
+        """
+        Find the minima and maxima of every curve within interval in one call.
+
+        Input
+        -------
+            curves (dict): any key mapped to the (times, values) of a curve
+
+            interval (tuple): start and end of the analysed region in seconds
+
+            prominence (float or None): minimal prominence of a peak, in the unit of the values
+
+            width (float or None): minimal width of a peak in seconds
+
+            distance (float or None): minimal distance between two peaks in seconds
+
+        Ouput
+        -------
+            dict: the keys of curves mapped to a PeakAnalysis
+        """
+        results = {}
+        for key, (times, values) in curves.items():
+            interval_times, interval_values = self.find_in_interval(times, values, interval)
+            options = self.peak_options(interval_times, prominence, width, distance)
+
+            max_peaks, _ = scipy.signal.find_peaks(interval_values, **options)
+            min_peaks, _ = scipy.signal.find_peaks(-interval_values, **options)
+
+            results[key] = PeakAnalysis(
+                interval_times[min_peaks], interval_values[min_peaks],
+                interval_times[max_peaks], interval_values[max_peaks],
+            )
+        return results
+
+    def analyse_intervals(
+        self,
+        curves: dict,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        labels: np.ndarray,
+        prominence: float | None = None,
+        width: float | None = None,
+        distance: float | None = None,
+        skip_empty_labels: bool = False,
+    ) -> dict[str, np.ndarray]:
+        """
+        Build a table of the peaks and landmarks of every curve in every interval of a tier.
+
+        Peaks are searched once on each whole curve and then assigned to the
+        intervals through their index ranges, so the cost does not depend on the
+        number of intervals. As with find_in_interval followed by find_peaks, a
+        peak must lie strictly inside its interval; the prominence, width and
+        distance criteria are however evaluated on the whole curve.
+
+        Besides the local minima ('min') and maxima ('max'), the lowest
+        ('interval_min') and highest ('interval_max') sample of each interval
+        are reported.
+
+        Input
+        -------
+            curves (dict): curve names mapped to the (times, values) of the curve
+
+            starts, ends, labels (np arrays): boundaries and labels of the intervals, sorted by start
+
+            prominence, width, distance: see analyse_batch
+
+            skip_empty_labels (bool, default=False): ignore the intervals without label
+
+        Ouput
+        -------
+            dict: columns 'label', 'start', 'end', 'curve', 'peak_type', 'time' and 'value'
+        """
+        starts = np.asarray(starts, dtype=float)
+        ends = np.asarray(ends, dtype=float)
+        labels = np.asarray(labels, dtype=object)
+
+        if skip_empty_labels:
+            keep = np.array([bool(str(label).strip()) for label in labels], dtype=bool)
+            starts, ends, labels = starts[keep], ends[keep], labels[keep]
+
+        curve_names = list(curves)
+        rows = []  # (interval ids, curve ids, peak types, sample indices)
+        offset = 0
+        all_times = []
+        all_values = []
+
+        for curve_id, name in enumerate(curve_names):
+            times, values = (np.asarray(a, dtype=float) for a in curves[name])
+            first = np.searchsorted(times, starts, side='left')
+            last = np.searchsorted(times, ends, side='right')
+
+            options = self.peak_options(times, prominence, width, distance)
+            for peak_type, signed in (("max", values), ("min", -values)):
+                peaks, _ = scipy.signal.find_peaks(signed, **options)
+
+                # candidate interval: the last one starting at or before the peak
+                owner = np.searchsorted(first, peaks, side='right') - 1
+                owner_safe = np.maximum(owner, 0)
+                inside = (owner >= 0) & (peaks > first[owner_safe]) & (peaks < last[owner_safe] - 1)
+
+                rows.append((owner[inside], curve_id, peak_type, offset + peaks[inside]))
+
+            # lowest and highest sample of each non empty interval
+            non_empty = np.flatnonzero(last > first)
+            lengths = last[non_empty] - first[non_empty]
+            segment = np.repeat(np.arange(len(non_empty)), lengths)
+            positions = np.arange(lengths.sum()) + np.repeat(first[non_empty] - (np.cumsum(lengths) - lengths), lengths)
+
+            valid = ~np.isnan(values[positions])
+            segment, positions = segment[valid], positions[valid]
+
+            for peak_type, key in (("interval_min", values[positions]), ("interval_max", -values[positions])):
+                order = np.lexsort((key, segment))
+                ordered_segments = segment[order]
+                is_first = np.ones(len(order), dtype=bool)
+                is_first[1:] = ordered_segments[1:] != ordered_segments[:-1]
+
+                rows.append((non_empty[ordered_segments[is_first]], curve_id, peak_type, offset + positions[order][is_first]))
+
+            all_times.append(times)
+            all_values.append(values)
+            offset += len(times)
+
+        columns = ("label", "start", "end", "curve", "peak_type", "time", "value")
+        if not rows:
+            return {column: np.zeros(0) for column in columns}
+
+        all_times = np.concatenate(all_times)
+        all_values = np.concatenate(all_values)
+        interval_ids = np.concatenate([r[0] for r in rows]).astype(int)
+        curve_ids = np.concatenate([np.full(len(r[0]), r[1]) for r in rows])
+        peak_types = np.concatenate([np.full(len(r[0]), r[2], dtype=object) for r in rows])
+        sample_ids = np.concatenate([r[3] for r in rows]).astype(int)
+
+        order = np.lexsort((all_times[sample_ids], curve_ids, interval_ids))
+        interval_ids = interval_ids[order]
+        sample_ids = sample_ids[order]
+
+        return {
+            "label": labels[interval_ids],
+            "start": starts[interval_ids],
+            "end": ends[interval_ids],
+            "curve": np.asarray(curve_names, dtype=object)[curve_ids[order]],
+            "peak_type": peak_types[order],
+            "time": all_times[sample_ids],
+            "value": all_values[sample_ids],
+        }
@@ -0,0 +1,270 @@
+import numpy as np
+import numpy.typing as npt
+import parselmouth
+from parselmouth.praat import call
+
+from calc import get_f0, postprocess_f0
+from worker_pool import executor
+
+
+def frame_start(frame: int, hopSize: float, sr: float, method: str) -> int:
+    """First sample of a chunk whose frames are the frames of the whole signal from `frame` on."""
+    if method == 'pyin':
+        # pyin advances by a whole number of samples
+        return frame * int(hopSize * sr)
+    return int(round(frame * hopSize * sr))
+
+
+def split_frames(
+    x: npt.NDArray, sr: float, hopSize: float, chunkDuration: float, searchDuration: float
+) -> list[int]:
+    """
+    Frames at which the signal is split: about every chunkDuration secs, at
+    the quietest frame within searchDuration secs of that time, so that the
+    pitch tracks of two chunks meet where the signal is least likely voiced.
+    """
+    hop = int(round(hopSize * sr))
+    frameCount = len(x) // hop
+    # energy of consecutive hop sized frames
+    energy = np.sum(np.square(x[:frameCount * hop], dtype=float).reshape(frameCount, hop), axis=1)
+
+    chunkFrames = int(round(chunkDuration / hopSize))
+    searchFrames = int(round(searchDuration / hopSize))
+
+    splits = []
+    for nominal in range(chunkFrames, frameCount - chunkFrames // 2, chunkFrames):
+        first = max(nominal - searchFrames, splits[-1] + 1 if splits else 1)
+        last = min(nominal + searchFrames, frameCount - 1)
+        splits.append(first + int(np.argmin(energy[first:last + 1])))
+    return splits
+
+
+def chunk_f0(x: npt.NDArray, sr: float, f0Args: dict) -> npt.NDArray:
+    """Worker task: raw f0 of a chunk."""
+    f0, _ = get_f0(x, sr, interpUnvoiced=None, outFilter=None, minMaxQuant=None, **f0Args)
+    return f0
+
+
+def praat_frame_times(sampleCount: int, sr: float, f0Args: dict) -> npt.NDArray:
+    """
+    Times of the frames of a Praat pitch analysis of sampleCount samples,
+    taken from the Pitch of a silent sound of that length: they only depend
+    on its duration and on the window, and silence is analysed at once.
+    """
+    command = "To Pitch (ac)" if f0Args['method'] == 'praatac' else "To Pitch (cc)"
+    silence = parselmouth.Sound(np.zeros(sampleCount), sampling_frequency=sr)
+    pitch = call(silence, command, f0Args['hopSize'], f0Args['minPitch'], 15, f0Args.get('veryAccurate', False),
+                 0.03, 0.45, 0.01, 0.35, 0.14, f0Args['maxPitch'])
+    return pitch.xs()
+
+
+def praat_chunk(
+    start: int, end: int, sr: float, gridTimes: npt.NDArray, f0Args: dict
+) -> tuple[int, int, npt.NDArray]:
+    """
+    Bounds of the chunk about [start, end) whose Praat frames fall on the
+    frame times gridTimes of the whole signal, and the indices of its frames
+    among them.
+    """
+    hopSize = f0Args['hopSize']
+    for _ in range(2):
+        times = start / sr + praat_frame_times(end - start, sr, f0Args)
+        phase = (times[0] - gridTimes[0]) / hopSize
+        offset = (phase - round(phase)) * hopSize * sr  # samples
+        if abs(offset - round(offset)) < 0.25:
+            break
+        # half a sample off when a frame lasts an odd number of samples:
+        # a sample more moves the frames of the chunk by half a sample
+        end += 1
+
+    shift = int(round(offset))
+    indices = np.round((times - shift / sr - gridTimes[0]) / hopSize).astype(int)
+    return start - shift, end - shift, indices
+
+
+def padded_slice(x: npt.NDArray, start: int, end: int) -> npt.NDArray:
+    """x[start:end], with zeros for the samples before 0 or beyond the end of x."""
+    part = x[max(0, start):min(end, len(x))]
+    if start >= 0 and end <= len(x):
+        return part
+    return np.pad(part, (max(0, -start), max(0, end - len(x))))
+
+
+def raw_f0(
+    x: npt.NDArray, sr: float, ranges: list[tuple[int, int | None]], margin: int, edge: int, f0Args: dict
+) -> npt.NDArray:
+    """
+    Raw f0 of the frame ranges (first, past-the-end) of the signal computed
+    in the worker pool, the last range ending with the signal (None). Each
+    range is analysed with `margin` frames of context on the sides where it
+    joins the next or previous range and `edge` frames on the other sides,
+    enough for the analysis windows of its first and last frames. The
+    context frames are dropped when the frame sequences are joined, the
+    frames between ranges which do not join are nan.
+
+    Praat centres its frames in the analysed sound: each chunk is shifted
+    by less than half a frame so that the frame times of its Pitch fall on
+    those of the whole signal, with zeros beyond the signal if needed. The
+    frames of the other methods start with the chunk, which starts on the
+    hopSize grid.
+    """
+    method = f0Args['method']
+    hopSize = f0Args['hopSize']
+    praat = method in ('praatac', 'praatcc')
+    if praat:
+        gridTimes = praat_frame_times(len(x), sr, f0Args)
+
+    futures = []
+    for i, (first, last) in enumerate(ranges):
+        joinedBefore = i > 0 and ranges[i - 1][1] == first
+        joinedAfter = i + 1 < len(ranges) and ranges[i + 1][0] == last
+        analysedFirst = max(0, first - (margin if joinedBefore else edge))
+        start = frame_start(analysedFirst, hopSize, sr, method)
+        if last is None:
+            end = len(x)
+        else:
+            end = min(len(x), frame_start(last + (margin if joinedAfter else edge), hopSize, sr, method))
+
+        indices = None
+        if praat:
+            start, end, indices = praat_chunk(start, end, sr, gridTimes, f0Args)
+        future = executor().submit(chunk_f0, padded_slice(x, start, end), sr, f0Args)
+        futures.append((analysedFirst, indices, future))
+
+    results = []
+    for analysedFirst, indices, future in futures:
+        f0 = future.result()
+        if indices is None:
+            indices = analysedFirst + np.arange(len(f0))
+        results.append((indices, f0))
+
+    # the last range ends with the signal, so do its frames
+    frameCount = len(gridTimes) if praat else results[-1][0][-1] + 1
+    f0 = np.full(frameCount, np.nan)
+    for (first, last), (indices, values) in zip(ranges, results):
+        kept = (indices >= first) & (indices < (frameCount if last is None else last))
+        f0[indices[kept]] = values[kept]
+    return f0
+
+
+def active_ranges(
+    x: npt.NDArray, sr: float, hopSize: float, activeSpans: list[tuple[float, float]],
+    chunkDuration: float, searchDuration: float
+) -> list[tuple[int, int | None]]:
+    """
+    Frame ranges of the active spans, the long ones split like the whole
+    signal, and a last range up to the end of the signal which gives the
+    frame count of the whole signal.
+    """
+    frameCount = int(len(x) / (hopSize * sr))
+    ranges = []
+    for spanStart, spanEnd in activeSpans:
+        first = max(int(np.ceil(spanStart / hopSize)), ranges[-1][1] if ranges else 0)
+        last = min(int(np.floor(spanEnd / hopSize)) + 1, frameCount)
+        if last <= first:
+            continue
+        hop = int(round(hopSize * sr))
+        splits = [
+            first + split
+            for split in split_frames(x[first * hop:last * hop], sr, hopSize, chunkDuration, searchDuration)
+        ]
+        bounds = [first] + splits + [last]
+        ranges.extend(zip(bounds[:-1], bounds[1:]))
+
+    # a last range of about a second, its frames beyond the active spans are dropped
+    tailFirst = max(0, frameCount - int(round(1.0 / hopSize)))
+    if ranges and ranges[-1][1] >= tailFirst:
+        ranges[-1] = (ranges[-1][0], None)
+    else:
+        ranges.append((tailFirst, None))
+    return ranges
+
+
+def get_f0_chunked(x: npt.NDArray,
+                   sr: float,
+                   /,*,
+                   chunkDuration: float = 60.0,
+                   margin: float = 1.0,
+                   method: str = 'praatac',
+                   hopSize: float = 0.01,
+                   minPitch: float = 75,
+                   maxPitch: float = 600,
+                   minMaxQuant: None | list | npt.NDArray = None,
+                   interpUnvoiced: None | str = "linear",
+                   outFilter: str = 'iir',
+                   outFiltType: str = 'low',
+                   outFiltCutOff: list | npt.NDArray = [None],
+                   outFiltLen: int = 6,
+                   outFiltPolyOrd: int = 3,
+                   activeSpans: None | list = None,
+                   **kwargs
+                   ):
+    """
+    Same as calc.get_f0, computed by chunks of about chunkDuration secs in a
+    pool of worker processes. Signals shorter than two chunks are analysed
+    by get_f0 directly.
+
+    The chunks are split at low energy frames and analysed with margin secs
+    of context on both sides. They start on the hopSize grid of the whole
+    signal or, for Praat which centres its frames, are placed so that the
+    frame times of their Pitch are those of the whole signal: the joined
+    frames are the frames of the whole signal. With minMaxQuant, the
+    quantiles are computed over the first pass of all chunks, from the same
+    frames as get_f0. Unvoiced interpolation and output filter are applied
+    to the joined sequence.
+
+    With activeSpans, a list of (start, end) times in secs such as the
+    spans of activity.ActivityIndex, only the frames within them are
+    analysed (each span with 0.1 secs of context at most) and the frames
+    outside them are nan.
+
+    Praat and yin judge silence relative to the peak of the analysed signal,
+    that is of each chunk here: frames of a chunk much quieter than the rest
+    of the recording can be found voiced where get_f0 finds them unvoiced.
+
+    Other keyword arguments are passed to get_f0.
+    """
+    f0Args = dict(method=method, hopSize=hopSize, minPitch=minPitch, maxPitch=maxPitch, **kwargs)
+    postprocessing = dict(interpUnvoiced=interpUnvoiced, outFilter=outFilter,
+                          outFiltType=outFiltType, outFiltCutOff=outFiltCutOff, outFiltLen=outFiltLen,
+                          outFiltPolyOrd=outFiltPolyOrd)
+
+    if (activeSpans is None) & (len(x) < 2 * chunkDuration * sr):
+        return get_f0(x, sr, minMaxQuant=minMaxQuant, **f0Args, **postprocessing)
+
+    if (interpUnvoiced is None) & (outFilter is not None):
+        # same error as get_f0, before the analysis
+        postprocess_f0(np.zeros(0), hopSize=hopSize, **postprocessing)
+
+    searchDuration = min(5.0, chunkDuration / 4)
+    if activeSpans is None:
+        bounds = [0] + split_frames(x, sr, hopSize, chunkDuration, searchDuration) + [None]
+        ranges = list(zip(bounds[:-1], bounds[1:]))
+    else:
+        ranges = active_ranges(x, sr, hopSize, activeSpans, chunkDuration, searchDuration)
+    marginFrames = int(np.ceil(margin / hopSize))
+    edgeFrames = int(np.ceil(min(margin, 0.1) / hopSize))
+    f0 = raw_f0(x, sr, ranges, marginFrames, edgeFrames, f0Args)
+
+    if minMaxQuant is not None:
+        if method in ('praatac', 'praatcc'):
+            voiced = f0[f0 > 20]
+        else:
+            voiced = f0[np.isnan(f0) == 0]
+        quants = np.quantile(voiced, [minMaxQuant[0], minMaxQuant[1]])
+        f0Args.update(minPitch=quants[0], maxPitch=quants[1])
+        f0 = raw_f0(x, sr, ranges, marginFrames, edgeFrames, f0Args)
+
+    f0t = np.arange(len(f0)) * hopSize
+    f0 = postprocess_f0(f0, hopSize=hopSize, **postprocessing)
+    if activeSpans is not None:
+        f0[~in_spans(f0t, activeSpans)] = np.nan
+    return f0, f0t
+
+
+def in_spans(times: npt.NDArray, spans: list[tuple[float, float]]) -> npt.NDArray:
+    """Whether each of the sorted times is within one of the spans."""
+    inside = np.zeros(len(times), dtype=bool)
+    for start, end in spans:
+        inside[np.searchsorted(times, start):np.searchsorted(times, end, side="right")] = True
+    return inside
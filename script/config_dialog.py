@@ -1,11 +1,32 @@
 from PyQt5 import QtWidgets, QtCore, QtGui
 import json
 
+import numpy as np
+import pyqtgraph as pg
+
+from preview import PreviewCalculator, PreviewWorker
+from sweep import SWEEP_PARAMETERS, combinations, parse_values, submit_sweep
+
+
+# key of get_parameters for each entry of the configuration combo box
+CONFIG_KEYS = ["mfcc", "amplitude", "formant1", "formant2", "formant3", "f0", "ema"]
+
+
+SWEEP_SUMMARY = {
+    "mean": np.nanmean,
+    "sd": np.nanstd,
+    "min": np.nanmin,
+    "max": np.nanmax,
+}
+
 
 class UnifiedConfigDialog(QtWidgets.QDialog):
-    def __init__(self, parent=None):
+    preview_requested = QtCore.pyqtSignal(int, str, object)
+
+    def __init__(self, parent=None, audio_path=None, preview_region=None):
         super().__init__(parent)
         self.setWindowTitle("Configure Parameters")
+        self.audio_path = audio_path
 
 
         self.layout = QtWidgets.QVBoxLayout(self)
@@ -62,6 +83,9 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         self.save_button.clicked.connect(self.save_config)
         self.load_button = QtWidgets.QPushButton("Load Config")
         self.load_button.clicked.connect(self.load_config)
+        self.sweep_button = QtWidgets.QPushButton("Parameter Sweep")
+        self.sweep_button.clicked.connect(self.open_sweep)
+        self.sweep_button.setEnabled(audio_path is not None)
 
 
         scrollable_layout.addWidget(self.config_type_combo)
@@ -69,6 +93,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         scrollable_layout.addWidget(self.apply_button)
         scrollable_layout.addWidget(self.save_button)
         scrollable_layout.addWidget(self.load_button)
+        scrollable_layout.addWidget(self.sweep_button)
 
 
         scroll_area.setWidget(scrollable_widget)
@@ -77,6 +102,93 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         self.layout.addWidget(scroll_area)
         self.setLayout(self.layout)
 
+        self.preview_thread = None
+        if audio_path is not None and preview_region is not None:
+            self.create_preview(audio_path, *preview_region)
+
+    def create_preview(self, audio_path, start, end):
+        """
+        Plot of the curve of the displayed configuration over [start, end],
+        computed again shortly after each edit.
+        """
+        self.preview_plot = pg.PlotWidget()
+        self.preview_plot.setMinimumHeight(150)
+        self.preview_plot.setXRange(start, end, padding=0)
+        self.preview_curve = self.preview_plot.plot(pen=pg.mkPen("b", width=2))
+        self.preview_status = QtWidgets.QLabel()
+
+        preview_box = QtWidgets.QGroupBox("Preview")
+        preview_layout = QtWidgets.QVBoxLayout(preview_box)
+        preview_layout.addWidget(self.preview_plot)
+        preview_layout.addWidget(self.preview_status)
+        self.layout.addWidget(preview_box)
+
+        self.preview_generation = 0
+        self.preview_timer = QtCore.QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(80)
+        self.preview_timer.timeout.connect(self.request_preview)
+
+        self.preview_worker = PreviewWorker(PreviewCalculator(audio_path, start, end))
+        self.preview_thread = QtCore.QThread(self)
+        self.preview_worker.moveToThread(self.preview_thread)
+        self.preview_requested.connect(self.preview_worker.calculate)
+        self.preview_worker.finished.connect(self.show_preview)
+        self.preview_worker.failed.connect(self.show_preview_error)
+        self.preview_thread.start()
+
+        for line_edit in self.config_stack.findChildren(QtWidgets.QLineEdit):
+            line_edit.textChanged.connect(self.schedule_preview)
+        for radio in self.config_stack.findChildren(QtWidgets.QRadioButton):
+            radio.toggled.connect(self.schedule_preview)
+        self.config_type_combo.currentIndexChanged.connect(self.schedule_preview)
+
+        self.schedule_preview()
+
+    def schedule_preview(self, *_):
+        self.preview_timer.start()
+
+    def request_preview(self):
+        analysis = CONFIG_KEYS[self.config_type_combo.currentIndex()]
+        self.preview_generation += 1
+        # the worker drops the requests older than this one
+        self.preview_worker.latest = self.preview_generation
+
+        if analysis == "ema":
+            self.preview_curve.setData([], [])
+            self.preview_status.setText("No preview for EMA channels")
+            return
+
+        try:
+            params = self.get_parameters()[analysis]
+        except ValueError:
+            self.preview_status.setText("Invalid value")
+            return
+
+        self.preview_status.setText("Computing...")
+        self.preview_requested.emit(self.preview_generation, analysis, params)
+
+    def show_preview(self, generation, x, y):
+        if generation != self.preview_generation:
+            return
+        self.preview_curve.setData(x, y)
+        self.preview_status.setText("")
+
+    def show_preview_error(self, generation, message):
+        if generation != self.preview_generation:
+            return
+        self.preview_curve.setData([], [])
+        self.preview_status.setText(f"Error: {message}")
+
+    def done(self, result):
+        if self.preview_thread is not None:
+            self.preview_timer.stop()
+            self.preview_worker.latest = -1
+            self.preview_thread.quit()
+            self.preview_thread.wait()
+            self.preview_thread = None
+        super().done(result)
+
 
     def display_selected_config(self, index):
         """Displays the selected configuration panel and ensures that all fields are enabled/disabled appropriately."""
@@ -223,6 +335,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         self.amp_outfilt_cutoff_input = self.create_input_field("Filter Cutoff Frequency (Hz):", "12")
         self.amp_outfilt_len_input = self.create_input_field("Filter Length:", "6")
         self.amp_outfilt_polyord_input = self.create_input_field("Filter Polynomial Order:", "3")
+        self.amp_out_sr_input = self.create_input_field("Hilb Output Rate (Hz, None for full):", "None")
         self.amp_name_input = self.create_input_field("Curve Name:", "Custom Amplitude")
         self.amp_panel_choice = QtWidgets.QComboBox()
         self.amp_panel_choice.addItems(["1", "2", "3", "4"])
@@ -263,6 +376,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
             self.amp_outfilt_cutoff_input,
             self.amp_outfilt_len_input,
             self.amp_outfilt_polyord_input,
+            self.amp_out_sr_input,
             self.amp_name_input,
             (QtWidgets.QLabel("Amplitude Panel:"), self.amp_panel_choice),
             self.amp_derivative_widget,
@@ -284,6 +398,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         self.formant1_enable_checkbox.setChecked(False)
         self.formant1_enable_checkbox.stateChanged.connect(self.toggle_formant1_fields)
 
+        self.formant1_method_input = self.create_input_field("Method (burg/lpc):", "burg")
         self.formant1_energy_threshold_input = self.create_input_field("Energy Threshold:", "20.0")
         self.formant1_tstep_input = self.create_input_field("Time Step (s):", "0.005")
         self.formant1_max_num_formants_input = self.create_input_field("Max Number of Formants:", "5")
@@ -321,6 +436,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         # Add all Formant1 widgets to layout
         self.add_groupbox_to_layout("Formant1 Configuration", [
             self.formant1_enable_checkbox,
+            self.formant1_method_input,
             self.formant1_energy_threshold_input,
             self.formant1_tstep_input,
             self.formant1_max_num_formants_input,
@@ -348,6 +464,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         self.formant2_enable_checkbox.setChecked(False)
         self.formant2_enable_checkbox.stateChanged.connect(self.toggle_formant2_fields)
 
+        self.formant2_method_input = self.create_input_field("Method (burg/lpc):", "burg")
         self.formant2_energy_threshold_input = self.create_input_field("Energy Threshold:", "20.0")
         self.formant2_tstep_input = self.create_input_field("Time Step (s):", "0.005")
         self.formant2_max_num_formants_input = self.create_input_field("Max Number of Formants:", "5")
@@ -385,6 +502,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         # Add all Formant2 widgets to layout
         self.add_groupbox_to_layout("Formant2 Configuration", [
             self.formant2_enable_checkbox,
+            self.formant2_method_input,
             self.formant2_energy_threshold_input,
             self.formant2_tstep_input,
             self.formant2_max_num_formants_input,
@@ -412,6 +530,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         self.formant3_enable_checkbox.setChecked(False)
         self.formant3_enable_checkbox.stateChanged.connect(self.toggle_formant3_fields)
 
+        self.formant3_method_input = self.create_input_field("Method (burg/lpc):", "burg")
         self.formant3_energy_threshold_input = self.create_input_field("Energy Threshold:", "20.0")
         self.formant3_tstep_input = self.create_input_field("Time Step (s):", "0.005")
         self.formant3_max_num_formants_input = self.create_input_field("Max Number of Formants:", "5")
@@ -449,6 +568,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         # Add all Formant3 widgets to layout
         self.add_groupbox_to_layout("Formant3 Configuration", [
             self.formant3_enable_checkbox,
+            self.formant3_method_input,
             self.formant3_energy_threshold_input,
             self.formant3_tstep_input,
             self.formant3_max_num_formants_input,
@@ -476,7 +596,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         self.f0_enable_checkbox.setChecked(False)
         self.f0_enable_checkbox.stateChanged.connect(self.toggle_f0_fields)
 
-        self.f0_method_input = self.create_input_field("Method (praatac/pyin):", "praatac")
+        self.f0_method_input = self.create_input_field("Method (praatac/praatcc/pyin/yin):", "praatac")
         self.f0_hop_size_input = self.create_input_field("Hop Size (s):", "0.01")
         self.f0_min_pitch_input = self.create_input_field("Min Pitch (Hz):", "75")
         self.f0_max_pitch_input = self.create_input_field("Max Pitch (Hz):", "600")
@@ -589,6 +709,38 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
                 params = json.load(file)
                 self.set_parameters(params)
 
+    def open_sweep(self):
+        dialog = ParameterSweepDialog(self.audio_path, self.get_parameters(), self)
+        if dialog.exec_() == QtWidgets.QDialog.Accepted:
+            self.apply_sweep_values(*dialog.selected_parameters())
+
+    def apply_sweep_values(self, analysis, values):
+        """Writes the values chosen in a parameter sweep into the fields of the analysis."""
+        fields = {
+            "mfcc": {
+                "tStep": self.mfcc_tstep_input,
+                "winLen": self.mfcc_winlen_input,
+                "n_fft": self.mfcc_nfft_input,
+                "n_mfcc": self.mfcc_nmfcc_input,
+                "filtCutoff": self.mfcc_filt_cutoff_input,
+                "filtOrd": self.mfcc_filt_ord_input,
+                "outFiltCutOff": self.mfcc_out_filt_cutoff_input,
+            },
+            "f0": {
+                "hopSize": self.f0_hop_size_input,
+                "minPitch": self.f0_min_pitch_input,
+                "maxPitch": self.f0_max_pitch_input,
+                "outFiltCutOff": self.f0_out_filt_cutoff_input,
+            },
+        }
+        enable_checkbox = {"mfcc": self.mfcc_enable_checkbox, "f0": self.f0_enable_checkbox}
+        enable_checkbox[analysis].setChecked(True)
+
+        for name, value in values.items():
+            if isinstance(value, list):
+                value = " ".join(map(str, value))
+            fields[analysis][name][1].setText(str(value))
+
     def get_parameters(self):
         """Returns the parameters from all configurations."""
         mfcc_enabled = self.mfcc_enable_checkbox.isChecked()
@@ -637,6 +789,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
                 "outFiltCutOff": [float(c) for c in self.amp_outfilt_cutoff_input[1].text().split()],
                 "outFiltLen": int(self.amp_outfilt_len_input[1].text()),
                 "outFiltPolyOrd": int(self.amp_outfilt_polyord_input[1].text()),
+                "outSr": None if self.amp_out_sr_input[1].text().lower() == 'none' else float(self.amp_out_sr_input[1].text()),
                 "name": self.amp_name_input[1].text(),
                 "panel": int(self.amp_panel_choice.currentIndex()),
                 "derivation_type": 0 if self.amp_traj_radio.isChecked() else 1 if self.amp_vel_radio.isChecked() else 2,
@@ -647,6 +800,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
             },
             "formant1": {
                 "enabled": formant1_enabled,
+                "method": self.formant1_method_input[1].text(),
                 "energy_threshold": float(self.formant1_energy_threshold_input[1].text()),
                 "time_step": float(self.formant1_tstep_input[1].text()),
                 "max_num_formants": int(self.formant1_max_num_formants_input[1].text()),
@@ -663,6 +817,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
             },
             "formant2": {
                 "enabled": formant2_enabled,
+                "method": self.formant2_method_input[1].text(),
                 "energy_threshold": float(self.formant2_energy_threshold_input[1].text()),
                 "time_step": float(self.formant2_tstep_input[1].text()),
                 "max_num_formants": int(self.formant2_max_num_formants_input[1].text()),
@@ -679,6 +834,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
             },
             "formant3": {
                 "enabled": formant3_enabled,
+                "method": self.formant3_method_input[1].text(),
                 "energy_threshold": float(self.formant3_energy_threshold_input[1].text()),
                 "time_step": float(self.formant3_tstep_input[1].text()),
                 "max_num_formants": int(self.formant3_max_num_formants_input[1].text()),
@@ -766,6 +922,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
             self.amp_outfilt_cutoff_input[1].setText(" ".join(map(str, amp_params.get("outFiltCutOff", []))))
             self.amp_outfilt_len_input[1].setText(str(amp_params.get("outFiltLen", "")))
             self.amp_outfilt_polyord_input[1].setText(str(amp_params.get("outFiltPolyOrd", "")))
+            self.amp_out_sr_input[1].setText(str(amp_params.get("outSr")))
             self.amp_name_input[1].setText(amp_params.get("name", ""))
             self.amp_panel_choice.setCurrentIndex(amp_params.get("panel", 0))
             self.amp_traj_radio.setChecked(amp_params.get("derivation_type") == 0)
@@ -780,6 +937,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         formant1_params = params.get("formant1", {})
         if formant1_params.get("enabled"):
             self.formant1_enable_checkbox.setChecked(True)
+            self.formant1_method_input[1].setText(formant1_params.get("method", "burg"))
             self.formant1_energy_threshold_input[1].setText(str(formant1_params.get("energy_threshold", "")))
             self.formant1_tstep_input[1].setText(str(formant1_params.get("time_step", "")))
             self.formant1_max_num_formants_input[1].setText(str(formant1_params.get("max_num_formants", "")))
@@ -800,6 +958,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         formant2_params = params.get("formant2", {})
         if formant2_params.get("enabled"):
             self.formant2_enable_checkbox.setChecked(True)
+            self.formant2_method_input[1].setText(formant2_params.get("method", "burg"))
             self.formant2_energy_threshold_input[1].setText(str(formant2_params.get("energy_threshold", "")))
             self.formant2_tstep_input[1].setText(str(formant2_params.get("time_step", "")))
             self.formant2_max_num_formants_input[1].setText(str(formant2_params.get("max_num_formants", "")))
@@ -820,6 +979,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         formant3_params = params.get("formant3", {})
         if formant3_params.get("enabled"):
             self.formant3_enable_checkbox.setChecked(True)
+            self.formant3_method_input[1].setText(formant3_params.get("method", "burg"))
             self.formant3_energy_threshold_input[1].setText(str(formant3_params.get("energy_threshold", "")))
             self.formant3_tstep_input[1].setText(str(formant3_params.get("time_step", "")))
             self.formant3_max_num_formants_input[1].setText(str(formant3_params.get("max_num_formants", "")))
@@ -909,6 +1069,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
             self.amp_outfilt_cutoff_input[1],
             self.amp_outfilt_len_input[1],
             self.amp_outfilt_polyord_input[1],
+            self.amp_out_sr_input[1],
             self.amp_name_input[1],
             self.amp_panel_choice
         ]:
@@ -922,6 +1083,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
     def toggle_formant1_fields(self, state):
         enabled = state == QtCore.Qt.Checked
         for widget in [
+            self.formant1_method_input[1],
             self.formant1_energy_threshold_input[1],
             self.formant1_tstep_input[1],
             self.formant1_max_num_formants_input[1],
@@ -941,6 +1103,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
     def toggle_formant2_fields(self, state):
         enabled = state == QtCore.Qt.Checked
         for widget in [
+            self.formant2_method_input[1],
             self.formant2_energy_threshold_input[1],
             self.formant2_tstep_input[1],
             self.formant2_max_num_formants_input[1],
@@ -960,6 +1123,7 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
     def toggle_formant3_fields(self, state):
         enabled = state == QtCore.Qt.Checked
         for widget in [
+            self.formant3_method_input[1],
             self.formant3_energy_threshold_input[1],
             self.formant3_tstep_input[1],
             self.formant3_max_num_formants_input[1],
@@ -1040,3 +1204,190 @@ class UnifiedConfigDialog(QtWidgets.QDialog):
         self.f0_width_input[1].setEnabled(enabled)
         self.f0_acc_order_input[1].setEnabled(enabled)
         self.f0_poly_order_input[1].setEnabled(enabled)
+
+
+class ParameterSweepDialog(QtWidgets.QDialog):
+    """
+    Computes the curve of every combination of the given parameter values in
+    a pool of worker processes. The curves are overlaid as they arrive and
+    listed with a summary of their values; the selected combination can be
+    copied back into the configuration.
+    """
+
+    def __init__(self, audio_path, parameters, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Parameter Sweep")
+        self.resize(900, 700)
+
+        self.audio_path = audio_path
+        self.parameters = parameters
+        self.futures = []
+        self.results = []
+        self.swept = []
+
+        self.analysis_combo = QtWidgets.QComboBox()
+        self.analysis_combo.addItem("MFCC", "mfcc")
+        self.analysis_combo.addItem("F0", "f0")
+        self.analysis_combo.currentIndexChanged.connect(self.display_selected_analysis)
+
+        # one field per sweepable parameter, showing its configured value
+        self.value_inputs = {}
+        self.value_stack = QtWidgets.QStackedWidget()
+        for analysis, names in SWEEP_PARAMETERS.items():
+            widget = QtWidgets.QWidget()
+            form = QtWidgets.QFormLayout(widget)
+            self.value_inputs[analysis] = {}
+            for name in names:
+                input_field = QtWidgets.QLineEdit()
+                input_field.setPlaceholderText(f"{parameters[analysis][name]}  (e.g. 8 12 16 or 8:20:4)")
+                input_field.textChanged.connect(self.update_count)
+                form.addRow(name, input_field)
+                self.value_inputs[analysis][name] = input_field
+            self.value_stack.addWidget(widget)
+
+        self.count_label = QtWidgets.QLabel()
+        self.run_button = QtWidgets.QPushButton("Run")
+        self.run_button.clicked.connect(self.run)
+
+        self.plot_widget = pg.PlotWidget()
+        self.plot_widget.setLabel("bottom", "Time (s)")
+
+        self.table = QtWidgets.QTableWidget()
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.itemSelectionChanged.connect(self.highlight_selected)
+
+        self.use_button = QtWidgets.QPushButton("Use Selected Parameters")
+        self.use_button.setEnabled(False)
+        self.use_button.clicked.connect(self.accept)
+
+        run_layout = QtWidgets.QHBoxLayout()
+        run_layout.addWidget(self.count_label)
+        run_layout.addWidget(self.run_button)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.analysis_combo)
+        layout.addWidget(self.value_stack)
+        layout.addLayout(run_layout)
+        layout.addWidget(self.plot_widget, stretch=2)
+        layout.addWidget(self.table, stretch=1)
+        layout.addWidget(self.use_button)
+
+        self.poll_timer = QtCore.QTimer(self)
+        self.poll_timer.setInterval(100)
+        self.poll_timer.timeout.connect(self.collect_results)
+
+        self.update_count()
+
+    @property
+    def analysis(self):
+        return self.analysis_combo.currentData()
+
+    def display_selected_analysis(self, index):
+        self.value_stack.setCurrentIndex(index)
+        self.update_count()
+
+    def swept_values(self):
+        """Values entered for each swept parameter of the current analysis."""
+        values = {}
+        for name, input_field in self.value_inputs[self.analysis].items():
+            parsed = parse_values(input_field.text(), SWEEP_PARAMETERS[self.analysis][name])
+            if parsed:
+                values[name] = parsed
+        return values
+
+    def update_count(self):
+        try:
+            values = self.swept_values()
+        except ValueError:
+            self.count_label.setText("Invalid values")
+            self.run_button.setEnabled(False)
+            return
+
+        count = int(np.prod([len(parsed) for parsed in values.values()]))
+        self.count_label.setText(f"{count} combinations" if values else "No swept parameter")
+        self.run_button.setEnabled(bool(values) and self.audio_path is not None)
+
+    def run(self):
+        self.cancel()
+        self.results.clear()
+        self.plot_widget.clear()
+
+        values = self.swept_values()
+        self.swept = list(values)
+        variants = combinations(self.parameters[self.analysis], values)
+        self.total = len(variants)
+
+        self.table.clear()
+        self.table.setRowCount(0)
+        self.table.setColumnCount(len(self.swept) + len(SWEEP_SUMMARY))
+        self.table.setHorizontalHeaderLabels(self.swept + list(SWEEP_SUMMARY))
+
+        self.futures = submit_sweep(self.analysis, self.audio_path, variants)
+        self.count_label.setText(f"0/{self.total} curves")
+        self.poll_timer.start()
+
+    def collect_results(self):
+        pending = []
+        for future in self.futures:
+            if not future.done():
+                pending.append(future)
+            elif future.cancelled():
+                continue
+            elif future.exception() is not None:
+                self.count_label.setText(f"Failed: {future.exception()}")
+            else:
+                for result in future.result():
+                    self.add_result(*result)
+
+        self.futures = pending
+        if not pending:
+            self.poll_timer.stop()
+
+    def add_result(self, variant, times, values):
+        index = len(self.results)
+        curve = self.plot_widget.plot(times, values, pen=pg.mkPen(pg.intColor(index, hues=self.total)))
+        self.results.append((variant, curve))
+
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        for column, name in enumerate(self.swept):
+            value = variant[name]
+            if isinstance(value, list):
+                value = " ".join(map(str, value))
+            self.table.setItem(row, column, QtWidgets.QTableWidgetItem(str(value)))
+
+        for column, summary in enumerate(SWEEP_SUMMARY.values(), len(self.swept)):
+            self.table.setItem(row, column, QtWidgets.QTableWidgetItem(f"{summary(values):.4g}"))
+
+        self.count_label.setText(f"{len(self.results)}/{self.total} curves")
+
+    def highlight_selected(self):
+        selected = self.selected_row()
+        for row, (_variant, curve) in enumerate(self.results):
+            pen = curve.opts["pen"]
+            color = pg.mkPen(pen).color()
+            width = 3 if row == selected else 1
+            color.setAlpha(255 if selected is None or row == selected else 60)
+            curve.setPen(pg.mkPen(color, width=width))
+        self.use_button.setEnabled(selected is not None)
+
+    def selected_row(self):
+        rows = self.table.selectionModel().selectedRows()
+        return rows[0].row() if rows else None
+
+    def selected_parameters(self):
+        """Analysis and values of the swept parameters of the selected curve."""
+        variant, _curve = self.results[self.selected_row()]
+        return self.analysis, {name: variant[name] for name in self.swept}
+
+    def cancel(self):
+        self.poll_timer.stop()
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
+
+    def done(self, result):
+        self.cancel()
+        super().done(result)
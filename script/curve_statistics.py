@@ -0,0 +1,167 @@
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+
+@dataclass
+class RangeStatistics:
+    """
+    Statistics of the samples of a curve within time ranges, one value per
+    range. NaN samples are ignored; ranges without samples give NaN.
+    """
+    duration: npt.NDArray
+    count: npt.NDArray
+    mean: npt.NDArray
+    sd: npt.NDArray
+    min: npt.NDArray
+    max: npt.NDArray
+    area: npt.NDArray
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+
+class StatisticsIndex:
+    """
+    Answers statistics queries on any time range of a curve in O(log n).
+
+    Cumulative sums of y, y² and of the trapezoid areas give the count, mean,
+    SD and area of a range from the two sample indices found by `searchsorted`.
+    Min and max of the whole blocks of BLOCK_SIZE samples within a range come
+    from a sparse table over the blocks (minimum of every power-of-two run of
+    blocks), built on the first query that needs them; the samples before and
+    after those blocks are scanned. The tables take O(n / BLOCK_SIZE * log n)
+    memory instead of O(n log n) for a table over the samples.
+    """
+
+    BLOCK_SIZE = 256
+    # samples scanned at once for the ends of the ranges
+    SCAN_SIZE = 1 << 20
+
+    def __init__(self, x: npt.ArrayLike, y: npt.ArrayLike) -> None:
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+
+        valid = ~np.isnan(self.y)
+        values = np.where(valid, self.y, 0.0)
+
+        self.cumulative_count = np.concatenate(([0], np.cumsum(valid)))
+        self.cumulative_sum = np.concatenate(([0.0], np.cumsum(values)))
+        self.cumulative_square = np.concatenate(([0.0], np.cumsum(values ** 2)))
+
+        # area of the segment between sample i and i + 1, 0 next to a NaN
+        segments = np.diff(self.x) * (values[1:] + values[:-1]) / 2
+        segments[~(valid[1:] & valid[:-1])] = 0
+        self.cumulative_area = np.concatenate(([0.0], np.cumsum(segments)))
+
+        self._min_table = None
+        self._max_table = None
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def indices(self, starts: npt.ArrayLike, ends: npt.ArrayLike) -> tuple[npt.NDArray, npt.NDArray]:
+        """Sample index ranges [lower, upper) of the samples with start <= x <= end."""
+        lower = np.searchsorted(self.x, starts, side='left')
+        upper = np.searchsorted(self.x, ends, side='right')
+        return lower, np.maximum(lower, upper)
+
+    @staticmethod
+    def _sparse_table(values: npt.NDArray, reduce: np.ufunc) -> list[npt.NDArray]:
+        table = [values]
+        width = 1
+        while 2 * width <= len(values):
+            previous = table[-1]
+            table.append(reduce(previous[:-width], previous[width:]))
+            width *= 2
+        return table
+
+    def _block_table(self, reduce: np.ufunc) -> list[npt.NDArray]:
+        """Sparse table of the reductions of the whole blocks of y."""
+        block_count = len(self.y) // self.BLOCK_SIZE
+        blocks = reduce.reduce(self.y[:block_count * self.BLOCK_SIZE].reshape(block_count, self.BLOCK_SIZE), axis=1)
+        return self._sparse_table(blocks, reduce)
+
+    def _scan(self, reduce: np.ufunc, lower, upper) -> npt.NDArray:
+        """Reductions of the y ranges [lower, upper), all shorter than a block."""
+        result = np.full(len(lower), np.nan)
+        if len(self.y) == 0:
+            return result
+        offsets = np.arange(self.BLOCK_SIZE)
+        rows = max(1, self.SCAN_SIZE // self.BLOCK_SIZE)
+        for first in range(0, len(lower), rows):
+            positions = lower[first:first + rows, None] + offsets
+            inside = positions < upper[first:first + rows, None]
+            window = np.where(inside, self.y[np.minimum(positions, len(self.y) - 1)], np.nan)
+            result[first:first + rows] = reduce.reduce(window, axis=1)
+        return result
+
+    def _range_reduce(self, table: list[npt.NDArray], reduce: np.ufunc, lower, upper) -> npt.NDArray:
+        # whole blocks [first_block, last_block) from the table, the parts before and after them scanned
+        first_block = -(-lower // self.BLOCK_SIZE)
+        last_block = upper // self.BLOCK_SIZE
+        head_end = np.minimum(upper, first_block * self.BLOCK_SIZE)
+        tail_start = np.maximum(lower, np.maximum(first_block, last_block) * self.BLOCK_SIZE)
+        result = reduce(
+            self._scan(reduce, lower, head_end),
+            self._scan(reduce, tail_start, upper),
+        )
+
+        block_counts = last_block - first_block
+        filled = block_counts > 0
+        if not filled.any():
+            return result
+
+        first_block, last_block, block_counts = first_block[filled], last_block[filled], block_counts[filled]
+        levels = np.floor(np.log2(block_counts)).astype(int)
+        widths = 1 << levels
+
+        blocks = np.empty(len(block_counts))
+        for level in np.unique(levels):
+            rows = levels == level
+            blocks[rows] = reduce(
+                table[level][first_block[rows]],
+                table[level][last_block[rows] - widths[rows]],
+            )
+
+        result[filled] = reduce(result[filled], blocks)
+        return result
+
+    def minimum(self, lower: npt.NDArray, upper: npt.NDArray) -> npt.NDArray:
+        if self._min_table is None:
+            self._min_table = self._block_table(np.fmin)
+        return self._range_reduce(self._min_table, np.fmin, lower, upper)
+
+    def maximum(self, lower: npt.NDArray, upper: npt.NDArray) -> npt.NDArray:
+        if self._max_table is None:
+            self._max_table = self._block_table(np.fmax)
+        return self._range_reduce(self._max_table, np.fmax, lower, upper)
+
+    def query(self, starts: npt.ArrayLike, ends: npt.ArrayLike) -> RangeStatistics:
+        starts = np.atleast_1d(np.asarray(starts, dtype=float))
+        ends = np.atleast_1d(np.asarray(ends, dtype=float))
+        lower, upper = self.indices(starts, ends)
+
+        count = self.cumulative_count[upper] - self.cumulative_count[lower]
+        total = self.cumulative_sum[upper] - self.cumulative_sum[lower]
+        square = self.cumulative_square[upper] - self.cumulative_square[lower]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, total / count, np.nan)
+            variance = np.where(count > 0, square / count - mean ** 2, np.nan)
+        sd = np.sqrt(np.maximum(variance, 0), where=~np.isnan(variance), out=np.full(len(count), np.nan))
+
+        # area between the first and last sample of each range
+        last = np.minimum(np.maximum(lower, upper - 1), len(self.cumulative_area) - 1)
+        area = self.cumulative_area[last] - self.cumulative_area[np.minimum(lower, last)]
+
+        return RangeStatistics(
+            duration=ends - starts,
+            count=count,
+            mean=mean,
+            sd=sd,
+            min=self.minimum(lower, upper),
+            max=self.maximum(lower, upper),
+            area=area,
+        )
@@ -0,0 +1,186 @@
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import override
+
+import numpy as np
+import numpy.typing as npt
+
+from praat_py_ui.textgrid_io import ColumnarIntervalTier
+
+
+def tier_label_column(tier: ColumnarIntervalTier, times: npt.ArrayLike) -> npt.NDArray:
+    """Labels of an interval tier sampled at the given times, "" outside of its intervals."""
+    return tier.label_at(times)
+
+
+class TableWriter(ABC):
+    """
+    Defines the interface for writing a table of named columns to a file.
+
+    Columns may have different lengths, shorter columns are padded with
+    missing values. Rows are written `chunk_size` at a time so that only one
+    chunk is ever converted to the output representation.
+    """
+    extension: str
+
+    def __init__(self, chunk_size: int = 100_000) -> None:
+        self.chunk_size = chunk_size
+
+    def write(self, columns: dict[str, npt.ArrayLike], path: str) -> int:
+        """
+        @Returns the number of rows written
+        """
+        columns = {name: np.asarray(values) for name, values in columns.items()}
+        row_count = max((len(values) for values in columns.values()), default=0)
+
+        self.open(path, columns)
+        try:
+            for start in range(0, row_count, self.chunk_size):
+                end = min(start + self.chunk_size, row_count)
+                self.write_chunk({
+                    name: (values[start:end], end - start)
+                    for name, values in columns.items()
+                })
+        finally:
+            self.close()
+
+        return row_count
+
+    @abstractmethod
+    def open(self, path: str, columns: dict[str, npt.NDArray]) -> None:
+        pass
+
+    @abstractmethod
+    def write_chunk(self, chunk: dict[str, tuple[npt.NDArray, int]]) -> None:
+        """
+        @Param chunk: for each column, its values in the chunk and the chunk length
+        (the values are shorter than the chunk where the column has ended)
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class CsvWriter(TableWriter):
+    extension = ".csv"
+
+    @override
+    def open(self, path: str, columns: dict[str, npt.NDArray]) -> None:
+        self.file = open(path, mode="w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns.keys())
+
+    @override
+    def write_chunk(self, chunk: dict[str, tuple[npt.NDArray, int]]) -> None:
+        rows = []
+        for values, length in chunk.values():
+            values = values.tolist()
+            if len(values) < length:
+                values.extend([""] * (length - len(values)))
+            rows.append(values)
+
+        self.writer.writerows(zip(*rows))
+
+    @override
+    def close(self) -> None:
+        self.file.close()
+
+
+class ArrowWriter(TableWriter):
+    """
+    Writes an Arrow IPC file, one record batch per chunk. Requires pyarrow.
+    """
+    extension = ".arrow"
+
+    def __init__(self, chunk_size: int = 100_000) -> None:
+        super().__init__(chunk_size)
+        try:
+            import pyarrow
+        except ImportError as error:
+            raise ImportError(
+                f"pyarrow is required to write {self.extension} files"
+            ) from error
+        self.pa = pyarrow
+
+    def schema(self, columns: dict[str, npt.NDArray]):
+        fields = []
+        for name, values in columns.items():
+            if values.dtype == object or values.dtype.kind in "US":
+                data_type = self.pa.string()
+            else:
+                data_type = self.pa.from_numpy_dtype(values.dtype)
+            fields.append(self.pa.field(name, data_type))
+        return self.pa.schema(fields)
+
+    def record_batch(self, chunk: dict[str, tuple[npt.NDArray, int]]):
+        arrays = []
+        for field, (values, length) in zip(self.table_schema, chunk.values()):
+            array = self.pa.array(values, type=field.type)
+            if len(values) < length:
+                missing = self.pa.nulls(length - len(values), type=field.type)
+                array = self.pa.concat_arrays([array, missing])
+            arrays.append(array)
+        return self.pa.record_batch(arrays, schema=self.table_schema)
+
+    @override
+    def open(self, path: str, columns: dict[str, npt.NDArray]) -> None:
+        self.table_schema = self.schema(columns)
+        self.sink = self.pa.OSFile(path, "wb")
+        self.writer = self.pa.ipc.new_file(self.sink, self.table_schema)
+
+    @override
+    def write_chunk(self, chunk: dict[str, tuple[npt.NDArray, int]]) -> None:
+        self.writer.write_batch(self.record_batch(chunk))
+
+    @override
+    def close(self) -> None:
+        self.writer.close()
+        self.sink.close()
+
+
+class ParquetWriter(ArrowWriter):
+    """
+    Writes a Parquet file, one row group per chunk. Requires pyarrow.
+    """
+    extension = ".parquet"
+
+    @override
+    def open(self, path: str, columns: dict[str, npt.NDArray]) -> None:
+        import pyarrow.parquet
+
+        self.table_schema = self.schema(columns)
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.table_schema)
+
+    @override
+    def write_chunk(self, chunk: dict[str, tuple[npt.NDArray, int]]) -> None:
+        self.writer.write_batch(self.record_batch(chunk))
+
+    @override
+    def close(self) -> None:
+        self.writer.close()
+
+
+WRITERS: dict[str, type[TableWriter]] = {
+    writer.extension: writer for writer in (CsvWriter, ParquetWriter, ArrowWriter)
+}
+
+FILE_FILTERS = "CSV Files (*.csv);;Parquet Files (*.parquet);;Arrow IPC Files (*.arrow)"
+
+
+def write_table(columns: dict[str, npt.ArrayLike], path: str, chunk_size: int = 100_000) -> int:
+    """
+    Writes the columns to `path` in the format given by its extension.
+
+    @Returns the number of rows written
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".feather":
+        extension = ".arrow"
+    if extension not in WRITERS:
+        raise ValueError(f"Unsupported export format '{extension}'")
+
+    return WRITERS[extension](chunk_size).write(columns, path)
+
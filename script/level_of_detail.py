@@ -0,0 +1,145 @@
+import numpy as np
+import numpy.typing as npt
+
+
+class MinMaxPyramid:
+    """
+    Min/max decimation levels of a curve sorted by x.
+
+    Level k groups the samples in buckets of factor**k and keeps, for each
+    bucket, its lowest and highest sample (at their own x). Drawing these two
+    points per bucket keeps every peak of the curve while the number of
+    points depends on the screen width instead of the data length.
+    Level 0 is the curve itself.
+
+    A growing curve is decimated by `extend`, which only reduces the buckets
+    from the last one of each level: the levels are kept in buffers grown
+    by doubling, like online_features.FeatureTrack.
+    """
+
+    def __init__(self, x: npt.ArrayLike, y: npt.ArrayLike, factor: int = 4, min_buckets: int = 256) -> None:
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.factor = factor
+        self.min_buckets = min_buckets
+
+        # per level: buffers of the x and y of the minimum, then of the maximum
+        # of each bucket, and the number of buckets
+        self._levels = []
+        self.extend(x, y)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @property
+    def levels(self) -> list[tuple[npt.NDArray, npt.NDArray, npt.NDArray, npt.NDArray]]:
+        return [self._level(index) for index in range(len(self._levels))]
+
+    def _level(self, index: int) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray, npt.NDArray]:
+        buffers, size = self._levels[index]
+        return tuple(buffer[:size] for buffer in buffers)
+
+    def extend(self, x: npt.ArrayLike, y: npt.ArrayLike) -> None:
+        """
+        Decimates the curve x, y whose first len(self) samples are the ones
+        already decimated, in a time proportional to the new samples.
+        """
+        changed = len(self.x)
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+
+        # first value of the level below in a bucket holding a changed value
+        start = changed // self.factor * self.factor
+        index = 0
+        while True:
+            lower_size = len(self.x) if index == 0 else self._levels[index - 1][1]
+            if index == len(self._levels):
+                if lower_size // self.factor < self.min_buckets:
+                    break
+                self._levels.append(([np.zeros(0)] * 4, 0))
+                start = 0
+
+            x_lower_min, y_lower_min, x_lower_max, y_lower_max = self._lower(index, start)
+            first_bucket = start // self.factor
+            x_min, y_min = self._reduce(x_lower_min, y_lower_min, np.argmin)
+            x_max, y_max = self._reduce(x_lower_max, y_lower_max, np.argmax)
+            self._store(index, first_bucket, (x_min, y_min, x_max, y_max))
+
+            start = first_bucket // self.factor * self.factor
+            index += 1
+
+    def _lower(self, index: int, start: int) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray, npt.NDArray]:
+        """Values of the level below level index + 1, from start."""
+        if index > 0:
+            return tuple(values[start:] for values in self._level(index - 1))
+
+        x, y = self.x[start:], self.y[start:]
+        return x, np.where(np.isnan(y), np.inf, y), x, np.where(np.isnan(y), -np.inf, y)
+
+    def _store(self, index: int, first_bucket: int, values: tuple) -> None:
+        buffers, _ = self._levels[index]
+        size = first_bucket + len(values[0])
+
+        if size > len(buffers[0]):
+            capacity = max(size, 2 * len(buffers[0]))
+            buffers = [np.resize(buffer, capacity) for buffer in buffers]
+
+        for buffer, new_values in zip(buffers, values):
+            buffer[first_bucket:size] = new_values
+        self._levels[index] = (buffers, size)
+
+    def _reduce(self, x: npt.NDArray, y: npt.NDArray, select) -> tuple[npt.NDArray, npt.NDArray]:
+        count = len(y) // self.factor * self.factor
+        remainder = len(y) - count
+
+        buckets = y[:count].reshape(-1, self.factor)
+        chosen = select(buckets, axis=1) + np.arange(0, count, self.factor)
+
+        if remainder:
+            last = count + select(y[count:])
+            chosen = np.append(chosen, last)
+
+        return x[chosen], y[chosen]
+
+    def bucket_size(self, level: int) -> int:
+        return self.factor ** level
+
+    def level_for(self, sample_count: int, pixels: int) -> int:
+        """Coarsest level still giving at least one bucket per pixel."""
+        level = 0
+        while level < len(self._levels) and sample_count / self.bucket_size(level + 1) >= pixels:
+            level += 1
+        return level
+
+    def select(self, start: float, end: float, pixels: int) -> tuple[npt.NDArray, npt.NDArray]:
+        """
+        Points to draw for the x range [start, end] on `pixels` pixels, with
+        one point beyond each side of the range so lines reach the edges.
+        """
+        first = max(0, np.searchsorted(self.x, start, side='left') - 1)
+        last = min(len(self.x), np.searchsorted(self.x, end, side='right') + 1)
+
+        level = self.level_for(last - first, max(1, pixels))
+        if level == 0:
+            return self.x[first:last], self.y[first:last]
+
+        size = self.bucket_size(level)
+        x_min, y_min, x_max, y_max = self._level(level - 1)
+        first_bucket = max(0, first // size - 1)
+        last_bucket = min(len(x_min), last // size + 2)
+
+        x_min, y_min = x_min[first_bucket:last_bucket], y_min[first_bucket:last_bucket]
+        x_max, y_max = x_max[first_bucket:last_bucket], y_max[first_bucket:last_bucket]
+
+        # both points of each bucket, in x order
+        min_first = x_min <= x_max
+        x = np.empty(2 * len(x_min))
+        y = np.empty(2 * len(x_min))
+        x[0::2] = np.where(min_first, x_min, x_max)
+        x[1::2] = np.where(min_first, x_max, x_min)
+        y[0::2] = np.where(min_first, y_min, y_max)
+        y[1::2] = np.where(min_first, y_max, y_min)
+
+        # buckets without any value
+        y[np.isinf(y)] = np.nan
+        return x, y
@@ -3,18 +3,17 @@ if __name__ == "__main__":
     freeze_support()
 
 from abc import ABC, abstractmethod
-from typing import override
+import copy
+from typing import Callable, override
 import os
 import sys
-import threading
+import queue
 import wave
-import time
 import csv
 import sys
 import numpy as np
 import sounddevice as sd
 from scipy.io import wavfile
-from scipy.signal import find_peaks
 from pydub.playback import play
 from pydub import AudioSegment
 
@@ -25,17 +24,33 @@ import pyqtgraph as pg
 import parselmouth
 import tgt
 
+from activity import file_activity
+from alignment import ALIGNMENT_MODES, align_curves
+from chunked_f0 import get_f0_chunked
 from config_dialog import UnifiedConfigDialog
+from curve_statistics import RangeStatistics, StatisticsIndex
+from exporter import FILE_FILTERS, tier_label_column, write_table
 from mfcc import load_channel, get_MFCCS_change
 from calc import (
+    MinMaxFinder,
     calc_formants,
     calculate_amplitude_envelope,
-    get_f0,
     get_velocity,
     read_AG50x,
 )
+from online_features import BLOCK_DURATION, REFRESH_INTERVAL, OnlineFeatureExtractor
+from playback import PlaybackEngine
+from session import file_digest, read_session, write_session
+from region_analysis import (
+    IntervalCache,
+    crop,
+    load_region,
+    read_region,
+)
 from ui import Crosshair, create_plot_widget, ZoomToolbar
-from praat_py_ui.parselmouth_calc import Parselmouth
+from praat_py_ui.parselmouth_calc import Parselmouth, Spectrogram
+from praat_py_ui.praat_cache import file_sound
+from praat_py_ui.textgrid_io import ColumnarTextGrid, read_textgrid
 from quadruple_axis_plot_item import (
     QuadrupleAxisPlotItem,
     Panel,
@@ -119,6 +134,26 @@ class ExportCSVDialog(QtWidgets.QDialog):
             "region_or_tier": region_or_tier_combo,
         }
 
+        # Common time grid
+        self.alignment_group_box = QtWidgets.QGroupBox("Resample to a common time grid")
+        self.alignment_group_box.setCheckable(True)
+        self.alignment_group_box.setChecked(False)
+        alignment_layout = QtWidgets.QFormLayout()
+
+        self.alignment_step = QtWidgets.QDoubleSpinBox()
+        self.alignment_step.setDecimals(3)
+        self.alignment_step.setRange(0.01, 1000)
+        self.alignment_step.setValue(5)
+        self.alignment_step.setSuffix(" ms")
+
+        self.alignment_mode = QtWidgets.QComboBox()
+        self.alignment_mode.addItems(ALIGNMENT_MODES)
+
+        alignment_layout.addRow("Time step:", self.alignment_step)
+        alignment_layout.addRow("Interpolation:", self.alignment_mode)
+        self.alignment_group_box.setLayout(alignment_layout)
+        layout.addWidget(self.alignment_group_box)
+
         self.ok_button = QtWidgets.QPushButton("Export")
         self.ok_button.clicked.connect(self.accept)
         layout.addWidget(self.ok_button)
@@ -150,6 +185,14 @@ class ExportCSVDialog(QtWidgets.QDialog):
             "region_or_tier": self.calculation_choices["region_or_tier"].currentText(),
         }
 
+    def get_alignment(self):
+        if not self.alignment_group_box.isChecked():
+            return None
+        return {
+            "step": self.alignment_step.value() / 1000,
+            "mode": self.alignment_mode.currentText(),
+        }
+
 
 class POSChannelSelectionDialog(QtWidgets.QDialog):
     def __init__(self, pos_channels, parent=None):
@@ -219,15 +262,15 @@ class ColorSelection(QtWidgets.QWidget):
 
         self.colors = colors
 
-        color_combo = self.create_color_combo()
+        self.color_combo = self.create_color_combo()
         self.color_indicator = QtWidgets.QLabel()
         self.color_indicator.setFixedSize(20, 20)
         self.choose_color(0)
 
-        color_combo.currentIndexChanged.connect(self.choose_color)
+        self.color_combo.currentIndexChanged.connect(self.choose_color)
 
         layout = QtWidgets.QHBoxLayout()
-        layout.addWidget(color_combo)
+        layout.addWidget(self.color_combo)
         layout.addWidget(self.color_indicator)
 
         self.setLayout(layout)
@@ -258,10 +301,21 @@ class ColorSelection(QtWidgets.QWidget):
 
     def choose_color(self, color_idx: int) -> None:
         color = self.colors[color_idx]
+        self.show_color(color)
+        self.color_chosen.emit(color)
+
+    def show_color(self, color: str) -> None:
+        self.color = color
         self.color_indicator.setStyleSheet(
             f"background-color: {color}; border: 1px solid black;"
         )
-        self.color_chosen.emit(color)
+
+    def set_color(self, color: str) -> None:
+        """Selects the color without emitting color_chosen."""
+        self.color_combo.blockSignals(True)
+        self.color_combo.setCurrentIndex(self.colors.index(color))
+        self.color_combo.blockSignals(False)
+        self.show_color(color)
 
 
 class TreeWidgetItem(QtWidgets.QTreeWidgetItem):
@@ -317,6 +371,23 @@ class TreeWidgetItem(QtWidgets.QTreeWidgetItem):
         self.visibility_changed = self.visibility_checkbox.stateChanged
         self.derivation_type_changed = self._derivation_type.currentIndexChanged
 
+    def restore(self, curve_name: str, panel_id: int, derivation_id: int, color: str, visible: bool) -> None:
+        """Sets the widgets of the row without emitting their signals."""
+        widgets = (self._curve_type, self.panel_choice, self._derivation_type, self.visibility_checkbox)
+        for widget in widgets:
+            widget.blockSignals(True)
+
+        if self._curve_type.findText(curve_name) == -1:
+            self._curve_type.addItem(curve_name)
+        self._curve_type.setCurrentIndex(self._curve_type.findText(curve_name))
+        self.panel_choice.setCurrentIndex(panel_id)
+        self._derivation_type.setCurrentIndex(derivation_id)
+        self.visibility_checkbox.setChecked(visible)
+        self.color_selection.set_color(color)
+
+        for widget in widgets:
+            widget.blockSignals(False)
+
     @property
     def curve_type(self) -> int:
         return self._curve_type.currentIndex()
@@ -494,6 +565,73 @@ class StyledButton(QtWidgets.QPushButton):
         )
 
 
+SESSION_FILTER = "Session Files (*.session)"
+
+REGION_STATISTICS = ("duration", "count", "mean", "sd", "min", "max", "area")
+
+
+class RegionStatisticsWidget(QtWidgets.QGroupBox):
+    """Statistics of every displayed curve within the selection region."""
+
+    def __init__(self, *args, **kargs) -> None:
+        super().__init__("Region Statistics", *args, **kargs)
+
+        layout = QtWidgets.QVBoxLayout()
+
+        self.table = QtWidgets.QTableWidget(0, len(REGION_STATISTICS))
+        self.table.setHorizontalHeaderLabels([name.capitalize() for name in REGION_STATISTICS])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def display(self, statistics: dict[str, RangeStatistics]) -> None:
+        self.table.setRowCount(len(statistics))
+        self.table.setVerticalHeaderLabels(list(statistics.keys()))
+
+        for row, values in enumerate(statistics.values()):
+            for column, name in enumerate(REGION_STATISTICS):
+                value = getattr(values, name)[0]
+                text = f"{value:d}" if name == "count" else f"{value:.4g}"
+                self.table.setItem(row, column, QtWidgets.QTableWidgetItem(text))
+
+
+class CursorReadout(QtWidgets.QGroupBox):
+    """Value of every visible curve at the cursor time."""
+
+    def __init__(self, *args, **kargs) -> None:
+        super().__init__("Cursor", *args, **kargs)
+
+        layout = QtWidgets.QVBoxLayout()
+
+        self.time_label = QtWidgets.QLabel("Time: -")
+        self.table = QtWidgets.QTableWidget(0, 1)
+        self.table.setHorizontalHeaderLabels(["Value"])
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
+        self.names = []
+
+        layout.addWidget(self.time_label)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+    def display(self, time: float, values: dict[str, float]) -> None:
+        self.time_label.setText(f"Time: {time:.4f} s")
+
+        # rows are only rebuilt when the curves change, not on every move
+        names = list(values.keys())
+        if names != self.names:
+            self.names = names
+            self.table.setRowCount(len(names))
+            self.table.setVerticalHeaderLabels(names)
+            for row in range(len(names)):
+                self.table.setItem(row, 0, QtWidgets.QTableWidgetItem())
+
+        for row, value in enumerate(values.values()):
+            self.table.item(row, 0).setText("" if np.isnan(value) else f"{value:.4g}")
+
+
 class TierSelection(QtWidgets.QGroupBox):
     button_group: QtWidgets.QButtonGroup
     tier_checked = QtCore.pyqtSignal(str)
@@ -515,7 +653,7 @@ class TierSelection(QtWidgets.QGroupBox):
 
         self.layout().addWidget(self.no_tier_btn)
 
-    def set_data(self, data: tgt.io.TextGrid) -> None:
+    def set_data(self, data: ColumnarTextGrid) -> None:
         self.reset()
 
         self.populate_textgrid_selection(data.get_tier_names())
@@ -559,6 +697,9 @@ class ManualPointManagement(QtWidgets.QToolBar):
     operation_changed: QtCore.pyqtSignal = QtCore.pyqtSignal(int)
     min_analysis_clicked: QtCore.pyqtSignal = QtCore.pyqtSignal()
     max_analysis_clicked: QtCore.pyqtSignal = QtCore.pyqtSignal()
+    all_panels_analysis_clicked: QtCore.pyqtSignal = QtCore.pyqtSignal()
+    tier_table_clicked: QtCore.pyqtSignal = QtCore.pyqtSignal()
+    tier_statistics_clicked: QtCore.pyqtSignal = QtCore.pyqtSignal()
     export_to_csv_clicked: QtCore.pyqtSignal = QtCore.pyqtSignal()
 
     def __init__(
@@ -571,15 +712,29 @@ class ManualPointManagement(QtWidgets.QToolBar):
         self.panel_selector: QtWidgets.QComboBox = QtWidgets.QComboBox(self)
         self.add_min_action: QtWidgets.QAction = QtWidgets.QAction("Analyze Min", self)
         self.add_max_action: QtWidgets.QAction = QtWidgets.QAction("Analyze Max", self)
+        self.all_panels_action: QtWidgets.QAction = QtWidgets.QAction(
+            "Analyze All Panels", self
+        )
         self.export_to_csv_action: QtWidgets.QAction = QtWidgets.QAction(
             "Export to CSV", self
         )
+        self.tier_table_action: QtWidgets.QAction = QtWidgets.QAction(
+            "Tier Peak Table", self
+        )
+        self.tier_statistics_action: QtWidgets.QAction = QtWidgets.QAction(
+            "Tier Statistics", self
+        )
 
         self.enable_checkbox: QtWidgets.QCheckBox = QtWidgets.QCheckBox(
             "Manual management", self
         )
         self.operation_selector: QtWidgets.QComboBox = QtWidgets.QComboBox(self)
 
+        # 0 disables the corresponding find_peaks option
+        self.prominence_input = self.create_option_input("Prominence: ", 3)
+        self.width_input = self.create_option_input("Width: ", 3, " s")
+        self.distance_input = self.create_option_input("Distance: ", 3, " s")
+
         self.panel_selector.addItems([f"Panel {i+1}" for i in range(self.panel_nb)])
         self.operation_selector.addItem("Add min", PointOperation.ADD_MIN)
         self.operation_selector.addItem("Add max", PointOperation.ADD_MAX)
@@ -588,6 +743,9 @@ class ManualPointManagement(QtWidgets.QToolBar):
         self.panel_selector.currentIndexChanged.connect(self.on_panel_changed)
         self.add_min_action.triggered.connect(self.on_add_min_clicked)
         self.add_max_action.triggered.connect(self.on_add_max_clicked)
+        self.all_panels_action.triggered.connect(self.all_panels_analysis_clicked)
+        self.tier_table_action.triggered.connect(self.tier_table_clicked)
+        self.tier_statistics_action.triggered.connect(self.tier_statistics_clicked)
         self.export_to_csv_action.triggered.connect(self.on_export_to_csv_clicked)
 
         self.addWidget(self.enable_checkbox)
@@ -596,7 +754,25 @@ class ManualPointManagement(QtWidgets.QToolBar):
         self.addWidget(self.panel_selector)
         self.addAction(self.add_min_action)
         self.addAction(self.add_max_action)
+        self.addAction(self.all_panels_action)
+        self.addWidget(self.prominence_input)
+        self.addWidget(self.width_input)
+        self.addWidget(self.distance_input)
         self.addAction(self.export_to_csv_action)
+        self.addAction(self.tier_table_action)
+        self.addAction(self.tier_statistics_action)
+
+    def create_option_input(
+        self, prefix: str, decimals: int, suffix: str = ""
+    ) -> QtWidgets.QDoubleSpinBox:
+        option_input = QtWidgets.QDoubleSpinBox(self)
+        option_input.setPrefix(prefix)
+        option_input.setSuffix(suffix)
+        option_input.setDecimals(decimals)
+        option_input.setRange(0, 1e6)
+        option_input.setSingleStep(10 ** -(decimals - 1))
+        option_input.setSpecialValueText(f"{prefix}off")
+        return option_input
 
     def on_panel_changed(self, index: int) -> None:
         self.panel_changed.emit(index)
@@ -622,10 +798,27 @@ class ManualPointManagement(QtWidgets.QToolBar):
     def panel(self) -> int:
         return self.panel_selector.currentIndex()
 
+    @property
+    def peak_options(self) -> dict[str, float | None]:
+        return {
+            "prominence": self.prominence_input.value() or None,
+            "width": self.width_input.value() or None,
+            "distance": self.distance_input.value() or None,
+        }
+
 class DataSource(ABC):
     """
     Defines the interface for the curve data calculation.
+
+    `padding` is the signal (in seconds) needed on each side of a region for
+    the analysis windows and output filters to give the same values at its
+    edges as the analysis of the whole file.
+
+    With `skip_silence`, the sources which support it analyse only the active
+    spans of the file (see activity.file_activity), the curve has gaps elsewhere.
     """
+    padding: float = 0.0
+    skip_silence: bool = False
 
     @abstractmethod
     def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
@@ -634,6 +827,24 @@ class DataSource(ABC):
         """
         pass
 
+    def calculate_region(
+        self, audio_path: str, start: float, end: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Values of the curve between start and end. Sources able to analyse
+        part of a file override this, by default the whole file is analysed.
+
+        @Returns x_values, y_values
+        """
+        return crop(*self.calculate(audio_path), start, end)
+
+    def coarse(self, factor: int) -> "DataSource | None":
+        """
+        Same analysis with a time step `factor` times larger, giving a quick
+        approximation of the curve. None when the source has no coarse version.
+        """
+        return None
+
 
 class Transformation(ABC):
 
@@ -724,14 +935,12 @@ class Soundwave(DataSource):
 
 
 class Mfcc(DataSource):
+    padding = 0.5
+    sig_sr = 10000
+    t_step = 0.005
 
-    @override
-    def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
-        data = load_channel(audio_path)
-        print(audio_path)
-        sig_sr = 10000
+    def analyse(self, audio: str | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         channel_n = 0
-        t_step = 0.005
         win_len = 0.025
         n_mfcc = 13
         n_fft = 512
@@ -748,10 +957,10 @@ class Mfcc(DataSource):
         out_filt_poly_ord = 3
 
         y, x = get_MFCCS_change(
-            audio_path,
-            sig_sr,
+            audio,
+            self.sig_sr,
             channelN=channel_n,
-            tStep=t_step,
+            tStep=self.t_step,
             winLen=win_len,
             n_mfcc=n_mfcc,
             n_fft=n_fft,
@@ -770,47 +979,102 @@ class Mfcc(DataSource):
 
         return x, y
 
-
-class Formant1(DataSource):
+    def gate(self, audio_path: str, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # MFCCs are cheap, the silences are analysed and masked afterwards
+        if self.skip_silence:
+            y = np.where(file_activity(audio_path).active_at(x), y, np.nan)
+        return x, y
 
     @override
     def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
-        f_times, f1_values, _, _ = calc_formants(
-            parselmouth.Sound(audio_path), 0, 99999, 40
-        )
-        return f_times, f1_values
-
+        print(audio_path)
+        return self.gate(audio_path, *self.analyse(audio_path))
 
-class Formant2(DataSource):
+    @override
+    def coarse(self, factor: int) -> "Mfcc":
+        source = copy.copy(self)
+        source.t_step = self.t_step * factor
+        return source
 
     @override
-    def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
-        f_times, _, f2_values, _ = calc_formants(
-            parselmouth.Sound(audio_path), 0, 99999, 40
+    def calculate_region(
+        self, audio_path: str, start: float, end: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        signal, offset = load_region(
+            audio_path, start - self.padding, end + self.padding,
+            self.sig_sr, self.t_step,
         )
-        return f_times, f2_values
+        x, y = self.analyse(signal)
+        return crop(*self.gate(audio_path, x + offset, y), start, end)
 
 
-class Formant3(DataSource):
+class Formant(DataSource):
+    """Formant `number` (1 to 3) of the frames above the energy threshold."""
+    padding = 0.1
+    time_step = 0.005
+    window_length = 0.025
+    number: int
 
-    @override
-    def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
-        f_times, _, _, f3_values = calc_formants(
-            parselmouth.Sound(audio_path), 0, 99999, 40
+    def analyse(
+        self, sound: parselmouth.Sound, start: float, end: float,
+        spans: list[tuple[float, float]] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        f_times, *formant_values = calc_formants(
+            sound, start, end, 40,
+            time_step=self.time_step, window_length=self.window_length,
+            spans=spans,
         )
-        return f_times, f3_values
+        return np.asarray(f_times), formant_values[self.number - 1]
 
+    @override
+    def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
+        spans = file_activity(audio_path).spans if self.skip_silence else None
+        return self.analyse(file_sound(audio_path), 0, 99999, spans)
 
-class F0(DataSource):
+    @override
+    def coarse(self, factor: int) -> "Formant":
+        source = copy.copy(self)
+        source.time_step = self.time_step * factor
+        return source
 
     @override
-    def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
-        sig_sr, audio_data = wavfile.read(audio_path)
+    def calculate_region(
+        self, audio_path: str, start: float, end: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # the region is cut from the whole sound on the frames of the whole
+        # sound and gated by its intensity, like the active spans
+        spans = [(start - self.padding, end + self.padding)]
+        if self.skip_silence:
+            spans = file_activity(audio_path).spans_between(*spans[0])
+        x, y = self.analyse(file_sound(audio_path), start - self.padding, end + self.padding, spans)
+        return crop(x, y, start, end)
+
+
+class Formant1(Formant):
+    number = 1
+
+
+class Formant2(Formant):
+    number = 2
+
+
+class Formant3(Formant):
+    number = 3
+
+
+class F0(DataSource):
+    padding = 0.5
+    hop_size = 0.005
+    methods = ("praatac", "praatcc", "pyin", "yin")
+    method = "praatac"
+
+    def analyse(
+        self, audio_data: np.ndarray, sig_sr: int,
+        active_spans: list[tuple[float, float]] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
         if audio_data.ndim > 1:
             audio_data = audio_data[:, 0]
 
-        method = "praatac"
-        hop_size = 0.005
         min_pitch = 75
         max_pitch = 600
         interp_unvoiced = "linear"
@@ -820,11 +1084,11 @@ class F0(DataSource):
         out_filt_len = 6
         out_filt_poly_ord = 3
 
-        f0, f0_times = get_f0(
+        f0, f0_times = get_f0_chunked(
             audio_data,
             sig_sr,
-            method=method,
-            hopSize=hop_size,
+            method=self.method,
+            hopSize=self.hop_size,
             minPitch=min_pitch,
             maxPitch=max_pitch,
             interpUnvoiced=interp_unvoiced,
@@ -833,23 +1097,72 @@ class F0(DataSource):
             outFiltCutOff=out_filt_cutoff,
             outFiltLen=out_filt_len,
             outFiltPolyOrd=out_filt_poly_ord,
+            activeSpans=active_spans,
         )
         return f0_times, f0
 
+    @override
+    def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
+        sig_sr, audio_data = wavfile.read(audio_path)
+        spans = file_activity(audio_path).spans if self.skip_silence else None
+        return self.analyse(audio_data, sig_sr, spans)
+
+    @override
+    def coarse(self, factor: int) -> "F0":
+        source = copy.copy(self)
+        source.hop_size = self.hop_size * factor
+        return source
+
+    @override
+    def calculate_region(
+        self, audio_path: str, start: float, end: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        audio_data, sig_sr, offset = read_region(
+            audio_path, start - self.padding, end + self.padding, self.hop_size
+        )
+        spans = None
+        if self.skip_silence:
+            region_end = offset + len(audio_data) / sig_sr
+            spans = [
+                (span_start - offset, span_end - offset)
+                for span_start, span_end in file_activity(audio_path).spans_between(offset, region_end)
+            ]
+        x, y = self.analyse(audio_data, sig_sr, spans)
+        return crop(x + offset, y, start, end)
+
 
 class AmplitudeEnvelope(DataSource):
+    padding = 0.5
+    hop_length = 0.01
 
     @override
     def calculate(self, audio_path: str) -> tuple[np.ndarray, np.ndarray]:
         sample_rate, audio_signal = wavfile.read(audio_path)
 
-        # audio_signal = audio_signal[int(start * sample_rate):int(end * sample_rate)]
         amplitude_envelope, time_axis = calculate_amplitude_envelope(
-            audio_signal, sample_rate
+            audio_signal, sample_rate, hopLen=self.hop_length
         )
 
         return time_axis, amplitude_envelope
 
+    @override
+    def coarse(self, factor: int) -> "AmplitudeEnvelope":
+        source = copy.copy(self)
+        source.hop_length = self.hop_length * factor
+        return source
+
+    @override
+    def calculate_region(
+        self, audio_path: str, start: float, end: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        audio_signal, sample_rate, offset = read_region(
+            audio_path, start - self.padding, end + self.padding, self.hop_length
+        )
+        amplitude_envelope, time_axis = calculate_amplitude_envelope(
+            audio_signal, sample_rate, hopLen=self.hop_length
+        )
+        return crop(time_axis + offset, amplitude_envelope, start, end)
+
 
 class Plotter(ABC):
 
@@ -860,6 +1173,11 @@ class Plotter(ABC):
     def plot(self, x: np.ndarray, y: np.ndarray) -> CalculationValues:
         pass
 
+    @abstractmethod
+    def accepts(self, values: CalculationValues) -> bool:
+        """Whether the items of `values` can show this plotter's data in place."""
+        pass
+
 class CurvePlotter(Plotter):
 
     @override
@@ -870,6 +1188,10 @@ class CurvePlotter(Plotter):
 
         return CalculationValues(curve, min, max, self.toolbar)
 
+    @override
+    def accepts(self, values: CalculationValues) -> bool:
+        return isinstance(values.curve, pg.PlotDataItem) and values.default_range is None
+
 
 class ScatterPlotPlotter(Plotter):
 
@@ -881,8 +1203,13 @@ class ScatterPlotPlotter(Plotter):
 
         return CalculationValues(curve, min, max, self.toolbar)
 
+    @override
+    def accepts(self, values: CalculationValues) -> bool:
+        return isinstance(values.curve, pg.ScatterPlotItem) and values.default_range is None
+
 
 class FormantPlotter(Plotter):
+    default_range = (0, 5500)
 
     @override
     def plot(self, x: np.ndarray, y: np.ndarray) -> CalculationValues:
@@ -891,14 +1218,72 @@ class FormantPlotter(Plotter):
         max = pg.ScatterPlotItem()
 
         return CalculationValues(
-            curve, min, max, self.toolbar, default_range=(0, 5500)
+            curve, min, max, self.toolbar, default_range=self.default_range
+        )
+
+    @override
+    def accepts(self, values: CalculationValues) -> bool:
+        return (
+            isinstance(values.curve, pg.ScatterPlotItem)
+            and values.default_range == self.default_range
         )
 
 
+class CalculationWorker(QtCore.QObject):
+    """Runs the calculation of a data source, meant to be moved to a QThread."""
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, source: DataSource, audio_path: str) -> None:
+        super().__init__()
+        self.source = source
+        self.audio_path = audio_path
+
+    def run(self) -> None:
+        try:
+            data = self.source.calculate(self.audio_path)
+        except Exception as error:
+            self.failed.emit(str(error))
+            return
+        self.finished.emit(data)
+
+
+class Refinement(QtCore.QObject):
+    """
+    Replaces the data of a coarse curve by the full resolution result of a
+    CalculationWorker. Lives in the GUI thread so the update is queued there.
+    """
+    done = QtCore.pyqtSignal()
+
+    def __init__(
+        self,
+        generator: "CurveGenerator",
+        curve: CalculationValues,
+        curve_derivation: int,
+    ) -> None:
+        super().__init__()
+        self.generator = generator
+        self.curve = curve
+        self.curve_derivation = curve_derivation
+        self.cancelled = False
+
+    def apply(self, data: tuple[np.ndarray, np.ndarray]) -> None:
+        # the curve may have been given other data since the refinement started
+        if not self.cancelled:
+            self.curve.set_data(*self.generator.transform(data, self.curve_derivation))
+        self.done.emit()
+
+    def fail(self, message: str) -> None:
+        print(f"Curve refinement failed: {message}")
+        self.done.emit()
+
+
 class CurveGenerator:
     datasources: list[DataSource]
     derivations: list[Transformation]
     plotters: list[Plotter]
+    region_caches: dict[tuple[str, int], IntervalCache]
+    refinements: list[tuple[QtCore.QThread, CalculationWorker, Refinement]]
 
     def __init__(self, toolbar : "ManualPointManagement") -> None:
         self.toolbar = toolbar
@@ -912,6 +1297,8 @@ class CurveGenerator:
             AmplitudeEnvelope(),
         ]
         self.derivations = [Trajectory(), Velocity(), Acceleration()]
+        self.region_caches = {}
+        self.refinements = []
         self.plotters = [
             None,
             CurvePlotter(self.toolbar),
@@ -926,9 +1313,7 @@ class CurveGenerator:
             
         ]
 
-    def generate(
-        self, audio_path: str, curve_type_id: int, curve_derivation: int
-    ) -> CalculationValues:
+    def get_source(self, curve_type_id: int) -> DataSource:
         if curve_type_id < 0 or curve_type_id >= len(self.datasources):
             raise IndexError("Curve type ID is out of range")
 
@@ -937,16 +1322,125 @@ class CurveGenerator:
         if source is None:
             raise ValueError("Invalid data source for the given curve type ID")
 
+        return source
+
+    def generate(
+        self,
+        audio_path: str,
+        curve_type_id: int,
+        curve_derivation: int,
+        curve: CalculationValues | None = None,
+    ) -> CalculationValues:
+        """
+        @Param curve: curve currently displayed, its items are reused when
+        they can show the new data
+        """
+        source = self.get_source(curve_type_id)
+        return self.plot(
+            source.calculate(audio_path), curve_type_id, curve_derivation, curve
+        )
+
+    def generate_region(
+        self,
+        audio_path: str,
+        curve_type_id: int,
+        curve_derivation: int,
+        start: float,
+        end: float,
+        curve: CalculationValues | None = None,
+    ) -> CalculationValues:
+        """
+        Curve restricted to [start, end]. Analysed spans are kept in a cache
+        per file and curve type, only the parts not analysed yet are computed.
+        """
+        source = self.get_source(curve_type_id)
+        cache = self.region_caches.setdefault(
+            (audio_path, curve_type_id), IntervalCache()
+        )
+
+        for span_start, span_end in cache.missing(start, end):
+            cache.add(
+                span_start, span_end,
+                *source.calculate_region(audio_path, span_start, span_end),
+            )
+
+        return self.plot(cache.get(start, end), curve_type_id, curve_derivation, curve)
+
+    def set_f0_method(self, method: str) -> None:
+        for source in self.datasources:
+            if isinstance(source, F0):
+                source.method = method
+        self.clear_region_caches()
+
+    def set_skip_silence(self, enabled: bool) -> None:
+        for source in self.datasources:
+            if source is not None:
+                source.skip_silence = enabled
+        self.clear_region_caches()
+
+    def clear_region_caches(self) -> None:
+        self.region_caches.clear()
+
+    def generate_progressive(
+        self,
+        audio_path: str,
+        curve_type_id: int,
+        curve_derivation: int,
+        curve: CalculationValues | None = None,
+        factor: int = 4,
+    ) -> CalculationValues:
+        """
+        Curve computed with a time step `factor` times larger, returned at
+        once. The full resolution analysis runs in a background thread and
+        replaces the data of the returned curve when it is done.
+        """
+        source = self.get_source(curve_type_id)
+        coarse_source = source.coarse(factor)
+
+        if coarse_source is None:
+            return self.generate(audio_path, curve_type_id, curve_derivation, curve)
+
+        x, y = self.transform(coarse_source.calculate(audio_path), curve_derivation)
+        # derivatives are per sample, bring them to the scale of the full resolution
+        curve = self.place(x, y / factor ** curve_derivation, curve_type_id, curve)
+
+        self.refine(source, audio_path, curve, curve_derivation)
+        return curve
+
+    def refine(
+        self,
+        source: DataSource,
+        audio_path: str,
+        curve: CalculationValues,
+        curve_derivation: int,
+    ) -> None:
+        thread = QtCore.QThread()
+        worker = CalculationWorker(source, audio_path)
+        refinement = Refinement(self, curve, curve_derivation)
+        worker.moveToThread(thread)
+
+        thread.started.connect(worker.run)
+        worker.finished.connect(refinement.apply)
+        worker.failed.connect(refinement.fail)
+        refinement.done.connect(thread.quit)
+
+        entry = (thread, worker, refinement)
+        # keeps the thread alive until it has finished
+        thread.finished.connect(lambda: self.refinements.remove(entry))
+        self.refinements.append(entry)
+        thread.start()
+
+    def transform(
+        self, data: tuple[np.ndarray, np.ndarray], curve_derivation: int
+    ) -> tuple[np.ndarray, np.ndarray]:
         operation = self.derivations[curve_derivation]
-        plotter = self.plotters[curve_type_id]
 
-        data = source.calculate(audio_path)
         derivative_method = "gradient"
         sg_width = 3
         fin_diff_acc_order = 2
         sg_poly_order = 2
 
-        x, y = operation.transform(
+        return operation.transform(
             *data,
             method=derivative_method,
             width=sg_width,
@@ -954,12 +1448,51 @@ class CurveGenerator:
             polyOrder=sg_poly_order,
         )
 
-        return plotter.plot(x, y)
+    def plot(
+        self,
+        data: tuple[np.ndarray, np.ndarray],
+        curve_type_id: int,
+        curve_derivation: int,
+        curve: CalculationValues | None = None,
+    ) -> CalculationValues:
+        return self.place(*self.transform(data, curve_derivation), curve_type_id, curve)
+
+    def place(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        curve_type_id: int,
+        curve: CalculationValues | None = None,
+    ) -> CalculationValues:
+        """
+        Gives the data to the items of `curve` when they can show it, otherwise
+        plots it in new items.
+        """
+        return self.place_with(self.plotters[curve_type_id], x, y, curve)
+
+    def place_with(
+        self,
+        plotter: Plotter,
+        x: np.ndarray,
+        y: np.ndarray,
+        curve: CalculationValues | None = None,
+    ) -> CalculationValues:
+        """Same as `place`, with the plotter of a custom curve."""
+        if curve is None or not plotter.accepts(curve):
+            return plotter.plot(x, y)
+
+        for _, _, refinement in self.refinements:
+            if refinement.curve is curve:
+                refinement.cancelled = True
+
+        curve.set_data(x, y)
+        return curve
 
     def generate_custom_formant2(
-        self, audio_path: str, params: dict, derivation_id: int
+        self, audio_path: str, params: dict, derivation_id: int,
+        curve: CalculationValues | None = None,
     ) -> CalculationValues:
-        sound = parselmouth.Sound(audio_path)
+        sound = file_sound(audio_path)
         f_times, _, f2_values, _ = calc_formants(
             sound,
             0,
@@ -970,6 +1503,7 @@ class CurveGenerator:
             maximum_formant=params["max_formant"],
             window_length=params["window_length"],
             pre_emphasis_from=params["pre_emphasis_from"],
+            method=params["method"],
         )
 
         operation = self.derivations[derivation_id]
@@ -982,13 +1516,13 @@ class CurveGenerator:
             params["sg_poly_order"],
         )
 
-        plotter = FormantPlotter(self.toolbar)
-        return plotter.plot(x, y)
+        return self.place_with(FormantPlotter(self.toolbar), x, y, curve)
 
     def generate_custom_formant3(
-        self, audio_path: str, params: dict, derivation_id: int
+        self, audio_path: str, params: dict, derivation_id: int,
+        curve: CalculationValues | None = None,
     ) -> CalculationValues:
-        sound = parselmouth.Sound(audio_path)
+        sound = file_sound(audio_path)
         f_times, _, _, f3_values = calc_formants(
             sound,
             0,
@@ -999,6 +1533,7 @@ class CurveGenerator:
             maximum_formant=params["max_formant"],
             window_length=params["window_length"],
             pre_emphasis_from=params["pre_emphasis_from"],
+            method=params["method"],
         )
 
         operation = self.derivations[derivation_id]
@@ -1011,13 +1546,13 @@ class CurveGenerator:
             params["sg_poly_order"],
         )
 
-        plotter = FormantPlotter(self.toolbar)
-        return plotter.plot(x, y)
+        return self.place_with(FormantPlotter(self.toolbar), x, y, curve)
 
     def generate_custom_formant1(
-        self, audio_path: str, params: dict, derivation_id: int
+        self, audio_path: str, params: dict, derivation_id: int,
+        curve: CalculationValues | None = None,
     ) -> CalculationValues:
-        sound = parselmouth.Sound(audio_path)
+        sound = file_sound(audio_path)
         f_times, f1_values, _, _ = calc_formants(
             sound,
             0,
@@ -1028,6 +1563,7 @@ class CurveGenerator:
             maximum_formant=params["max_formant"],
             window_length=params["window_length"],
             pre_emphasis_from=params["pre_emphasis_from"],
+            method=params["method"],
         )
 
         operation = self.derivations[derivation_id]
@@ -1040,11 +1576,11 @@ class CurveGenerator:
             params["sg_poly_order"],
         )
 
-        plotter = FormantPlotter(self.toolbar)
-        return plotter.plot(x, y)
+        return self.place_with(FormantPlotter(self.toolbar), x, y, curve)
 
     def generate_custom_mfcc(
-        self, audio_path: str, params: dict, derivation_id: int
+        self, audio_path: str, params: dict, derivation_id: int,
+        curve: CalculationValues | None = None,
     ) -> CalculationValues:
         y, x = get_MFCCS_change(
             audio_path,
@@ -1074,11 +1610,11 @@ class CurveGenerator:
             params["sg_poly_order"],
         )
 
-        plotter = CurvePlotter(self.toolbar)
-        return plotter.plot(x, y)
+        return self.place_with(CurvePlotter(self.toolbar), x, y, curve)
 
     def generate_custom_amplitude(
-        self, audio_path: str, params: dict, derivation_id: int
+        self, audio_path: str, params: dict, derivation_id: int,
+        curve: CalculationValues | None = None,
     ) -> CalculationValues:
         sample_rate, audio_signal = wavfile.read(audio_path)
         amplitude, time_axis = calculate_amplitude_envelope(
@@ -1093,6 +1629,7 @@ class CurveGenerator:
             outFiltCutOff=params["outFiltCutOff"],
             outFiltLen=params["outFiltLen"],
             outFiltPolyOrd=params["outFiltPolyOrd"],
+            outSr=params["outSr"],
         )
 
         operation = self.derivations[derivation_id]
@@ -1105,17 +1642,17 @@ class CurveGenerator:
             params["sg_poly_order"],
         )
 
-        plotter = CurvePlotter(self.toolbar)
-        return plotter.plot(time_axis, amplitude)
+        return self.place_with(CurvePlotter(self.toolbar), time_axis, amplitude, curve)
 
     def generate_custom_f0(
-        self, audio_path: str, params: dict, derivation_id: int
+        self, audio_path: str, params: dict, derivation_id: int,
+        curve: CalculationValues | None = None,
     ) -> CalculationValues:
         sig_sr, audio_data = wavfile.read(audio_path)
         if audio_data.ndim > 1:
             audio_data = audio_data[:, 0]
 
-        f0, f0_times = get_f0(
+        f0, f0_times = get_f0_chunked(
             audio_data,
             sig_sr,
             method=params["method"],
@@ -1140,8 +1677,7 @@ class CurveGenerator:
             params["sg_poly_order"],
         )
 
-        plotter = CurvePlotter(self.toolbar)
-        return plotter.plot(x, y)
+        return self.place_with(CurvePlotter(self.toolbar), x, y, curve)
 
 
 class MainWindow(QtWidgets.QMainWindow):
@@ -1149,7 +1685,7 @@ class MainWindow(QtWidgets.QMainWindow):
     audio_widget: SoundInformation
 
     annotation_path: str | None
-    annotation_data: tgt.core.TextGrid | None
+    annotation_data: ColumnarTextGrid | None
     annotation_widget: DisplayInterval
 
     panels: list[PanelWidget]
@@ -1160,10 +1696,12 @@ class MainWindow(QtWidgets.QMainWindow):
         nb_panels = 4
         self.selected_max_peaks = {}  # Dictionnaire pour stocker les pics max sélectionnés par panel et axis_id
         self.selected_min_peaks = {}  # Dictionnaire pour stocker les pics min sélectionnés par panel et axis_id
+        self.min_max_finder = MinMaxFinder()
 
         self.init_main_layout()
         self.custom_curves = {}
         self.audio_path = None
+        self.pos_path = None
         self.audio_widget = SoundInformation()
 
         self.annotation_path = None
@@ -1206,6 +1744,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.add_control_widget(self.create_load_buttons())
         self.add_control_widget(self.create_audio_control_buttons())
         self.add_control_widget(self.create_spectrogram_checkbox())
+        self.add_control_widget(self.create_region_analysis_checkbox())
         self.add_control_widget(self.tier_selection)
         self.add_control_widget(self.dashboard_widget)
         self.add_control_widget(self.config_mfcc_button)
@@ -1213,6 +1752,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.add_curve_widget(self.audio_widget)
 
         self.curves = {}
+        self.curve_contents = {}
         self.panels = []
         self.custom_mfcc_params = {}
         self.custom_amplitude_params = {}
@@ -1232,15 +1772,45 @@ class MainWindow(QtWidgets.QMainWindow):
         self.add_curve_widget(self.zoom)
 
         # Add SyncCursor
-        self.sync_cursor = SyncCursor(self.panels, self.audio_widget)        # self.add_control_widget(self.create_analysis_controls())
+        self.cursor_readout = CursorReadout()
+        self.sync_cursor = SyncCursor(
+            self.panels, self.audio_widget, self.cursor_readout, self.visible_curves
+        )        # self.add_control_widget(self.create_analysis_controls())
         self.add_control_widget(self.point_management_toolbar)
+
+        self.region_statistics = RegionStatisticsWidget()
+        self.add_control_widget(self.region_statistics)
+        self.add_control_widget(self.cursor_readout)
+        self.audio_widget.selection_region.sigRegionChanged.connect(
+            self.update_region_statistics
+        )
+
+        # In region mode the curves follow the view once it stops moving
+        self.region_analysis = False
+        self.progressive_rendering = False
+        self.region_timer = QtCore.QTimer()
+        self.region_timer.setSingleShot(True)
+        self.region_timer.setInterval(250)
+        self.region_timer.timeout.connect(self.refresh_region_curves)
+        self.audio_widget.reference_viewbox.sigXRangeChanged.connect(
+            self.schedule_region_refresh
+        )
         self.point_management_toolbar.min_analysis_clicked.connect(
             self.analyze_min_peaks
         )
         self.point_management_toolbar.max_analysis_clicked.connect(
             self.analyze_max_peaks
         )
+        self.point_management_toolbar.all_panels_analysis_clicked.connect(
+            self.analyze_all_panels
+        )
         self.point_management_toolbar.export_to_csv_clicked.connect(self.export_to_csv)
+        self.point_management_toolbar.tier_table_clicked.connect(
+            self.export_tier_peak_table
+        )
+        self.point_management_toolbar.tier_statistics_clicked.connect(
+            self.export_tier_statistics
+        )
 
         self.recording = False
         self.frames = []
@@ -1249,7 +1819,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self.update_plot)
         self.timer.start(100)
-        self.playing = False
+
+        # Blocks are handed over by the audio thread, features are computed
+        # and drawn on the GUI thread at a rate bounding the display latency
+        # (see OnlineFeature.display_latency and benchmark_online_features.py).
+        self.record_sample_rate = 44100
+        self.live_blocks = queue.SimpleQueue()
+        self.online_features = OnlineFeatureExtractor(self.record_sample_rate)
+        self.live_curves = {}
+        self.live_timer = QtCore.QTimer()
+        self.live_timer.setInterval(int(REFRESH_INTERVAL * 1000))
+        self.live_timer.timeout.connect(self.update_live_features)
+        self.playback = PlaybackEngine(parent=self)
+        self.playback.position_changed.connect(self.move_audio_cursor)
+        self.playback.finished.connect(self.stop_audio)
         self.audio_cursor = pg.LinearRegionItem()
         self.audio_cursor.setBrush(pg.mkBrush(0, 0, 255, 150))
         self.audio_widget.sound_plot.addItem(self.audio_cursor)
@@ -1281,17 +1864,26 @@ class MainWindow(QtWidgets.QMainWindow):
         load_textgrid_button = StyledButton("Load TextGrid")
         load_pos_button = StyledButton("Load POS File")
         self.record_button = StyledButton("Record Audio", "lightgreen")
+        open_session_button = StyledButton("Open Session")
+        save_session_button = StyledButton("Save Session")
 
         load_audio_button.clicked.connect(self.load_audio)
         load_textgrid_button.clicked.connect(self.load_annotations)
         load_pos_button.clicked.connect(self.load_pos_file)
         self.record_button.clicked.connect(self.toggle_recording)
+        open_session_button.clicked.connect(self.open_session)
+        save_session_button.clicked.connect(self.save_session)
 
         load_layout.addWidget(load_audio_button)
         load_layout.addWidget(load_textgrid_button)
         load_layout.addWidget(load_pos_button)
         load_layout.addWidget(self.record_button)
 
+        session_layout = QtWidgets.QHBoxLayout()
+        session_layout.addWidget(open_session_button)
+        session_layout.addWidget(save_session_button)
+        load_layout.addLayout(session_layout)
+
         load_group_box.setLayout(load_layout)
         return load_group_box
 
@@ -1308,6 +1900,7 @@ class MainWindow(QtWidgets.QMainWindow):
         print(target_sample_rate)
         # Load the POS file with the specified target sample rate
         self.pos_data = read_AG50x(pos_path, target_sample_rate=target_sample_rate)
+        self.pos_path = pos_path
         self.pos_channels = self.pos_data.channels.values
         dialog = POSChannelSelectionDialog(self.pos_channels, self)
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
@@ -1334,7 +1927,10 @@ class MainWindow(QtWidgets.QMainWindow):
                         item._curve_type.addItem(channel_name)
 
 
-    def generate_pos_curve(self, audio_path: str, params: dict, derivation_id: int) -> CalculationValues:
+    def generate_pos_curve(
+        self, audio_path: str, params: dict, derivation_id: int,
+        curve: CalculationValues | None = None,
+    ) -> CalculationValues:
         channel_id = params["channel_id"]
         pos_data = self.pos_data.ema.sel(channels=channel_id)
         time_axis = pos_data.time.values
@@ -1351,7 +1947,7 @@ class MainWindow(QtWidgets.QMainWindow):
         x, y = operation.transform(time_axis, y_values, derivative_method, sg_width, fin_diff_acc_order, sg_poly_order)
 
         plotter = CurvePlotter(self.point_management_toolbar)
-        return plotter.plot(x, y)
+        return self.curve_generator.place_with(plotter, x, y, curve)
 
 
     def add_curve_widget(self, widget: QtWidgets.QWidget) -> None:
@@ -1418,7 +2014,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 curve_names.append(curve_name)
 
         if self.annotation_data:
-            tier_names = self.annotation_data.get_tier_names()
+            tier_names = [tier.name for tier in self.annotation_data.interval_tiers()]
             export_dialog = ExportCSVDialog(axis_ids, curve_names, tier_names, self)
         else:
             export_dialog = ExportCSVDialog(axis_ids, curve_names, parent=self)
@@ -1427,190 +2023,259 @@ class MainWindow(QtWidgets.QMainWindow):
             selected_data = export_dialog.get_selections()
             selected_tiers = export_dialog.get_selected_tiers()
             calculation_choices = export_dialog.get_calculation_choices()
+            alignment = export_dialog.get_alignment()
 
-            csv_path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save CSV", "", "CSV Files (*.csv)")
-            if not csv_path:
+            path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(self, "Export Data", "", FILE_FILTERS)
+            if not path:
                 return
 
-            self.save_curves_to_csv(panel, selected_data, csv_path, axis_ids, curve_names, selected_tiers, calculation_choices)
-    def save_curves_to_csv(self, panel, selected_data, csv_path, axis_ids, curve_names, selected_tiers=None, calculation_choices=None):
-        with open(csv_path, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            headers = []
-            csv_data = {}
-
-            # Add curve data
-            for idx, axis_id in enumerate(axis_ids):
-                curve_name = curve_names[idx]
-                if curve_name not in selected_data:
-                    continue
+            if not os.path.splitext(path)[1]:
+                # extension of the selected filter, e.g. "CSV Files (*.csv)"
+                path += selected_filter[selected_filter.rfind("*") + 1:-1] or ".csv"
 
-                options = selected_data[curve_name]
-                axis = panel.rotation[axis_id]
-                x_data, y_data = axis.curve.getData() if axis.curve is not None else ([], [])
+            self.save_curves(panel, selected_data, path, axis_ids, curve_names, selected_tiers, calculation_choices, alignment=alignment)
 
+    def export_columns(self, panel, selected_data, axis_ids, curve_names, selected_tiers=None, calculation_choices=None, alignment=None) -> dict[str, np.ndarray]:
+        """
+        Columns of the export table, each column may have its own length.
+        With an alignment, the X/Y columns are replaced by one "Time" column
+        and the curves resampled on it.
+        """
+        columns = {}
+        aligned_curves = {}
+        x_data, y_data = np.zeros(0), np.zeros(0)
+
+        for idx, axis_id in enumerate(axis_ids):
+            curve_name = curve_names[idx]
+            if curve_name not in selected_data:
+                continue
+
+            options = selected_data[curve_name]
+            axis = panel.rotation[axis_id]
+            if axis.curve is not None:
+                x_data, y_data = axis.data()
+            else:
+                x_data, y_data = np.zeros(0), np.zeros(0)
+
+            if alignment is not None:
+                if options["x"] or options["y"]:
+                    aligned_curves[curve_name] = (x_data, y_data)
+            else:
                 if options["x"]:
-                    headers.append(f"{curve_name} X")
+                    columns[f"{curve_name} X"] = x_data
                 if options["y"]:
-                    headers.append(f"{curve_name} Y")
-
-                for i, x in enumerate(x_data):
-                    if i not in csv_data:
-                        csv_data[i] = {}
-
-                    if options["x"]:
-                        csv_data[i][f"{curve_name} X"] = x
-                    if options["y"]:
-                        csv_data[i][f"{curve_name} Y"] = y_data[i]
-
-                if options["min"]:
-                    min_peaks = [(p.pos().x(), p.pos().y()) for p in axis.min.points()]
-                    headers.extend([f"Min Peak {curve_name} X", f"Min Peak {curve_name} Y"])
-                    for i, (x, y) in enumerate(min_peaks):
-                        csv_data[i][f"Min Peak {curve_name} X"] = x
-                        csv_data[i][f"Min Peak {curve_name} Y"] = y
-
-                if options["max"]:
-                    max_peaks = [(p.pos().x(), p.pos().y()) for p in axis.max.points()]
-                    headers.extend([f"Max Peak {curve_name} X", f"Max Peak {curve_name} Y"])
-                    for i, (x, y) in enumerate(max_peaks):
-                        csv_data[i][f"Max Peak {curve_name} X"] = x
-                        csv_data[i][f"Max Peak {curve_name} Y"] = y
-
-                # Add TextGrid tier data if available
-                if selected_tiers and self.annotation_data:
-                    for tier_name in selected_tiers:
-                        headers.append(f"TextGrid Tier '{tier_name},{curve_name}'")
-                        tier = self.annotation_data.get_tier_by_name(tier_name)
-
-                        # Process each interval in the selected tier
-                        for i, x in enumerate(x_data):
-                            word = ""
-                            for interval in tier.intervals:
-                                if interval.start_time <= x <= interval.end_time:
-                                    word = interval.text
-                                    break
-                            csv_data[i][f"TextGrid Tier '{tier_name},{curve_name}'"] = word
-
-            # Calculate and add duration/mean based on the selected region or TextGrid tier
-            if calculation_choices:
-                if calculation_choices["calculate_duration"] or calculation_choices["calculate_mean"]:
-                    headers.append("Duration")
-                    headers.append("Mean")
-
-                    # If the user selected a specific region or a tier, calculate based on that
-                    if calculation_choices["region_or_tier"] == "Region Selection":
-                        region = self.audio_widget.selection_region.getRegion()
-                        region_start, region_end = region
-                        duration = region_end - region_start
-
-                        region_y_values = [
-                            y for x, y in zip(x_data, y_data) if region_start <= x <= region_end
-                        ]
-                        mean_value = np.mean(region_y_values) if region_y_values else 0
-
-                        csv_data[0]["Duration"] = duration
-                        csv_data[0]["Mean"] = mean_value
-                    else:
-                        # Calculate for the selected TextGrid tier
-                        tier_name = calculation_choices["region_or_tier"]
-                        tier = self.annotation_data.get_tier_by_name(tier_name)
-                        interval_durations = []
-                        interval_means = []
-
-                        for interval in tier.intervals:
-                            interval_start, interval_end = interval.start_time, interval.end_time
-                            interval_duration = interval_end - interval_start
-                            interval_y_values = [
-                                y for x, y in zip(x_data, y_data) if interval_start <= x <= interval_end
-                            ]
-                            interval_mean = np.mean(interval_y_values) if interval_y_values else 0
-
-                            interval_durations.append(interval_duration)
-                            interval_means.append(interval_mean)
-
-                        total_duration = sum(interval_durations)
-                        average_mean = np.mean(interval_means) if interval_means else 0
-
-                        csv_data[0]["Duration"] = total_duration
-                        csv_data[0]["Mean"] = average_mean
-
-            # Write headers and data to the CSV file
-            writer.writerow(headers)
-            for i in sorted(csv_data.keys()):
-                row = [csv_data[i].get(header, "") for header in headers]
-                writer.writerow(row)
-
-        QtWidgets.QMessageBox.information(self, "Export Successful", f"Data has been successfully exported to {csv_path}")
+                    columns[f"{curve_name} Y"] = y_data
+
+            if options["min"]:
+                min_x, min_y = axis.min.getData()
+                columns[f"Min Peak {curve_name} X"] = min_x
+                columns[f"Min Peak {curve_name} Y"] = min_y
+
+            if options["max"]:
+                max_x, max_y = axis.max.getData()
+                columns[f"Max Peak {curve_name} X"] = max_x
+                columns[f"Max Peak {curve_name} Y"] = max_y
+
+            # TextGrid labels of the curve samples
+            if selected_tiers and self.annotation_data and alignment is None:
+                for tier_name in selected_tiers:
+                    tier = self.annotation_data.get_tier_by_name(tier_name)
+                    columns[f"TextGrid Tier '{tier_name},{curve_name}'"] = tier_label_column(tier, x_data)
+
+        if alignment is not None and aligned_curves:
+            grid, aligned = align_curves(aligned_curves, alignment["step"], alignment["mode"])
+            aligned_columns = {"Time": grid}
+            aligned_columns.update(
+                (f"{curve_name} Y", values) for curve_name, values in aligned.items()
+            )
+            if selected_tiers and self.annotation_data:
+                for tier_name in selected_tiers:
+                    tier = self.annotation_data.get_tier_by_name(tier_name)
+                    aligned_columns[f"TextGrid Tier '{tier_name}'"] = tier_label_column(tier, grid)
+            columns = aligned_columns | columns
+
+        # Duration/mean of the last exported curve on the selected region or TextGrid tier
+        if calculation_choices and (calculation_choices["calculate_duration"] or calculation_choices["calculate_mean"]):
+            if calculation_choices["region_or_tier"] == "Region Selection":
+                starts, ends = np.array([self.audio_widget.selection_region.getRegion()]).T
+            else:
+                tier = self.annotation_data.get_tier_by_name(calculation_choices["region_or_tier"])
+                starts, ends = tier.starts, tier.ends
+
+            statistics = StatisticsIndex(x_data, y_data).query(starts, ends)
+            means = np.nan_to_num(statistics.mean)
+            columns["Duration"] = np.array([np.sum(statistics.duration)])
+            columns["Mean"] = np.array([np.mean(means) if len(means) else 0])
+
+        return columns
+
+    def save_curves(self, panel, selected_data, path, axis_ids, curve_names, selected_tiers=None, calculation_choices=None, alignment=None):
+        columns = self.export_columns(panel, selected_data, axis_ids, curve_names, selected_tiers, calculation_choices, alignment)
+
+        try:
+            write_table(columns, path)
+        except (ImportError, ValueError, OSError) as error:
+            QtWidgets.QMessageBox.warning(self, "Export Failed", str(error))
+            return
+
+        QtWidgets.QMessageBox.information(self, "Export Successful", f"Data has been successfully exported to {path}")
+
+    def analyze_peaks(
+        self, panel_ids: list[int], minimum: bool = True, maximum: bool = True
+    ) -> None:
+        """Find the peaks of every curve of the given panels within the selection region."""
+        curves = {}
+        for panel_id in panel_ids:
+            for calculated_curve in self.panels[panel_id].panel.rotation.values():
+                curves[calculated_curve] = calculated_curve.data()
+
+        if not curves:
+            return
+
+        region = self.audio_widget.selection_region.getRegion()
+        peaks = self.min_max_finder.analyse_batch(
+            curves, region, **self.point_management_toolbar.peak_options
+        )
+
+        for calculated_curve, peak_analysis in peaks.items():
+            if minimum:
+                calculated_curve.min.setData(
+                    peak_analysis.min_times, peak_analysis.min_values
+                )
+            if maximum:
+                calculated_curve.max.setData(
+                    peak_analysis.max_times, peak_analysis.max_values
+                )
 
     def analyze_max_peaks(self) -> None:
         panel_id = self.point_management_toolbar.panel
         if panel_id < 0:
             return
 
-        panel = self.panels[panel_id].panel
+        self.analyze_peaks([panel_id], minimum=False)
 
-        region = self.audio_widget.selection_region.getRegion()
-        region_start, region_end = region
+    def analyze_min_peaks(self) -> None:
+        panel_id = self.point_management_toolbar.panel
+        if panel_id < 0:
+            return
 
-        for axis_id, item in panel.rotation.items():
-            calculated_curve: CalculationValues = item
+        self.analyze_peaks([panel_id], maximum=False)
 
-            x_data, y_data = calculated_curve.curve.getData()
+    def analyze_all_panels(self) -> None:
+        self.analyze_peaks(list(range(len(self.panels))))
 
-            region_mask = (x_data >= region_start) & (x_data <= region_end)
+    def displayed_curves(self) -> dict[str, CalculationValues]:
+        """Curves currently shown in a panel, by their dashboard name."""
+        curves = {}
+        for row_id, (curve, panel) in self.curves.items():
+            if curve is None or panel is None:
+                continue
+            if panel.panel.get_item_axis(curve) is None:
+                continue
 
-            x_data_region = x_data[region_mask]
-            y_data_region = y_data[region_mask]
+            item = self.dashboard_widget.dashboard.topLevelItem(row_id)
+            name = item._curve_type.currentText() if item is not None else ""
+            derivation = item._derivation_type.currentIndex() if item is not None else 0
+            if derivation > 0:
+                name = f"{name} {item._derivation_type.currentText()}"
 
-            peaks, _ = find_peaks(y_data_region)
+            unique_name, count = name, 1
+            while unique_name in curves:
+                count += 1
+                unique_name = f"{name} ({count})"
+            curves[unique_name] = curve
+        return curves
 
-            peak_x = x_data_region[peaks]
-            peak_y = y_data_region[peaks]
+    def visible_curves(self) -> dict[str, CalculationValues]:
+        return {
+            name: curve
+            for name, curve in self.displayed_curves().items()
+            if curve.curve.isVisible()
+        }
 
-            calculated_curve.max.setData(peak_x, peak_y)
+    def choose_interval_tier(self, title: str):
+        """Asks for one of the interval tiers of the loaded TextGrid."""
+        if self.annotation_data is None:
+            QtWidgets.QMessageBox.warning(self, "No TextGrid", "Load a TextGrid first.")
+            return None
 
-            peak_info = "\n".join(
-                [
-                    f"Peak {i + 1}: X = {px}, Y = {py}"
-                    for i, (px, py) in enumerate(zip(peak_x, peak_y))
-                ]
-            )
+        tier_names = [tier.name for tier in self.annotation_data.interval_tiers()]
+        tier_name, accepted = QtWidgets.QInputDialog.getItem(
+            self, title, "Interval tier:", tier_names, 0, False
+        )
+        if not accepted or not tier_name:
+            return None
 
+        return self.annotation_data.get_tier_by_name(tier_name)
 
-    def analyze_min_peaks(self) -> None:
-        panel_id = self.point_management_toolbar.panel
-        if panel_id < 0:
+    def save_table(self, title: str, table: dict[str, np.ndarray], description: str) -> None:
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, title, "", FILE_FILTERS)
+        if not path:
             return
 
-        panel = self.panels[panel_id].panel
+        try:
+            row_count = write_table(table, path)
+        except (ImportError, ValueError, OSError) as error:
+            QtWidgets.QMessageBox.warning(self, "Export Failed", str(error))
+            return
 
-        region = self.audio_widget.selection_region.getRegion()
-        region_start, region_end = region
+        QtWidgets.QMessageBox.information(
+            self,
+            "Export Successful",
+            f"{row_count} {description} have been exported to {path}",
+        )
 
-        for axis_id, item in panel.rotation.items():
-            calculated_curve: CalculationValues = item
+    def export_tier_peak_table(self) -> None:
+        curves = self.displayed_curves()
+        if not curves:
+            QtWidgets.QMessageBox.warning(self, "No curves", "Display at least one curve.")
+            return
 
-            x_data, y_data = calculated_curve.curve.getData()
+        tier = self.choose_interval_tier("Tier Peak Table")
+        if tier is None:
+            return
 
-            region_mask = (x_data >= region_start) & (x_data <= region_end)
+        table = self.min_max_finder.analyse_intervals(
+            {name: curve.data() for name, curve in curves.items()},
+            tier.starts,
+            tier.ends,
+            tier.texts,
+            **self.point_management_toolbar.peak_options,
+        )
+        self.save_table("Save Peak Table", table, "peaks")
 
-            x_data_region = x_data[region_mask]
-            y_data_region = y_data[region_mask]
+    def export_tier_statistics(self) -> None:
+        """Exports the statistics of every displayed curve within each interval of a tier."""
+        curves = self.displayed_curves()
+        if not curves:
+            QtWidgets.QMessageBox.warning(self, "No curves", "Display at least one curve.")
+            return
 
-            peaks, _ = find_peaks(-y_data_region)
+        tier = self.choose_interval_tier("Tier Statistics")
+        if tier is None:
+            return
 
-            peak_x = x_data_region[peaks]
-            peak_y = y_data_region[peaks]
+        starts, ends, labels = tier.starts, tier.ends, tier.texts
 
-            calculated_curve.min.setData(peak_x, peak_y)
+        columns = {name: [] for name in ("label", "start", "end", "curve", *REGION_STATISTICS)}
+        for name, curve in curves.items():
+            statistics = curve.statistics().query(starts, ends)
+            columns["label"].append(labels)
+            columns["start"].append(starts)
+            columns["end"].append(ends)
+            columns["curve"].append(np.full(len(starts), name, dtype=object))
+            for statistic in REGION_STATISTICS:
+                columns[statistic].append(getattr(statistics, statistic))
 
-            min_info = "\n".join(
-                [
-                    f"Minimum {i + 1}: X = {px}, Y = {py}"
-                    for i, (px, py) in enumerate(zip(peak_x, peak_y))
-                ]
-            )
+        table = {name: np.concatenate(values) for name, values in columns.items()}
+        self.save_table("Save Tier Statistics", table, "rows")
+
+    def update_region_statistics(self) -> None:
+        start, end = self.audio_widget.selection_region.getRegion()
+        self.region_statistics.display({
+            name: curve.statistics().query(start, end)
+            for name, curve in self.displayed_curves().items()
+        })
 
     def create_spectrogram_checkbox(self) -> QtWidgets.QGroupBox:
         spectrogram_group_box = QtWidgets.QGroupBox("Select Spectrogram")
@@ -1625,6 +2290,102 @@ class MainWindow(QtWidgets.QMainWindow):
 
         return spectrogram_group_box
 
+    def create_region_analysis_checkbox(self) -> QtWidgets.QGroupBox:
+        region_group_box = QtWidgets.QGroupBox("Analysis")
+        region_layout = QtWidgets.QVBoxLayout()
+
+        region_checkbox = QtWidgets.QCheckBox("Analyze visible region only")
+        region_checkbox.setToolTip(
+            "Compute the curves only around the displayed time span, "
+            "the rest is computed when scrolling to it"
+        )
+        region_layout.addWidget(region_checkbox)
+
+        progressive_checkbox = QtWidgets.QCheckBox("Show a coarse curve first")
+        progressive_checkbox.setToolTip(
+            "Plot an approximate curve at once and refine it in the background"
+        )
+        region_layout.addWidget(progressive_checkbox)
+
+        f0_method_combo = QtWidgets.QComboBox()
+        f0_method_combo.addItems(F0.methods)
+        f0_method_combo.setCurrentText(F0.method)
+        f0_method_combo.currentTextChanged.connect(self.change_f0_method)
+        f0_method_layout = QtWidgets.QHBoxLayout()
+        f0_method_layout.addWidget(QtWidgets.QLabel("F0 method:"))
+        f0_method_layout.addWidget(f0_method_combo)
+        region_layout.addLayout(f0_method_layout)
+
+        silence_checkbox = QtWidgets.QCheckBox("Skip silences")
+        silence_checkbox.setToolTip(
+            "Analyse only the parts of the file above the energy threshold, "
+            "the curves have gaps in the silences"
+        )
+        silence_checkbox.toggled.connect(self.toggle_skip_silence)
+        region_layout.addWidget(silence_checkbox)
+
+        region_group_box.setLayout(region_layout)
+        region_checkbox.setChecked(False)
+        region_checkbox.toggled.connect(self.toggle_region_analysis)
+        progressive_checkbox.setChecked(False)
+        progressive_checkbox.toggled.connect(self.toggle_progressive_rendering)
+
+        return region_group_box
+
+    def change_f0_method(self, method: str) -> None:
+        self.curve_generator.set_f0_method(method)
+
+        dashboard = self.dashboard_widget.dashboard
+        for row_id, (name, derivation_id) in list(self.curve_contents.items()):
+            item = dashboard.topLevelItem(row_id)
+            if name != "F0" or item is None:
+                continue
+            # another curve: its markers do not apply anymore
+            del self.curve_contents[row_id]
+            self.update_curve(row_id, item.curve_type, derivation_id)
+
+    def toggle_skip_silence(self, enabled: bool) -> None:
+        self.curve_generator.set_skip_silence(enabled)
+
+        dashboard = self.dashboard_widget.dashboard
+        for row_id, (name, derivation_id) in list(self.curve_contents.items()):
+            item = dashboard.topLevelItem(row_id)
+            if name not in ("Mod_Cepstr", "F1", "F2", "F3", "F0") or item is None:
+                continue
+            del self.curve_contents[row_id]
+            self.update_curve(row_id, item.curve_type, derivation_id)
+
+    def toggle_progressive_rendering(self, enabled: bool) -> None:
+        self.progressive_rendering = enabled
+
+    def toggle_region_analysis(self, enabled: bool) -> None:
+        self.region_analysis = enabled
+        self.refresh_region_curves()
+
+    def analysis_span(self) -> tuple[float, float]:
+        """
+        Visible time span extended by half its width on each side, so that
+        small moves of the view do not need a new analysis.
+        """
+        start, end = self.audio_widget.reference_viewbox.viewRange()[0]
+        margin = (end - start) / 2
+        return max(0.0, start - margin), end + margin
+
+    def schedule_region_refresh(self) -> None:
+        if self.region_analysis and self.audio_path:
+            self.region_timer.start()
+
+    def refresh_region_curves(self) -> None:
+        """Recomputes the standard curves for the current analysis range."""
+        dashboard = self.dashboard_widget.dashboard
+        for row_id, (curve, _) in list(self.curves.items()):
+            item = dashboard.topLevelItem(row_id)
+            if curve is None or item is None:
+                continue
+            if item._curve_type.currentText() in self.custom_curves:
+                continue
+            self.update_curve(row_id, item.curve_type, item.derivation_type)
+
     def load_audio(self) -> None:
         audio_path, _ = QtWidgets.QFileDialog.getOpenFileName(
             self, "Open Audio File", "", "Audio Files (*.wav)"
@@ -1636,8 +2397,10 @@ class MainWindow(QtWidgets.QMainWindow):
         self.audio_indicator.file_loaded(audio_path)
 
         self.audio_path = audio_path
+        self.curve_generator.clear_region_caches()
 
         self.audio_widget.set_data(Parselmouth(audio_path))
+        self.playback.load(audio_path)
 
         self.audio_duration = self.get_audio_duration(audio_path)
 
@@ -1672,13 +2435,231 @@ class MainWindow(QtWidgets.QMainWindow):
         if not annotation_path:
             return
 
+        self.open_annotations(annotation_path)
+
+    def open_annotations(self, annotation_path: str) -> None:
         self.annotation_indicator.file_loaded(annotation_path)
 
         self.annotation_path = annotation_path
-        self.annotation_data = tgt.io.read_textgrid(annotation_path)
+        try:
+            self.annotation_data = read_textgrid(annotation_path)
+        except ValueError:
+            # binary or chronological TextGrids are only understood by tgt
+            self.annotation_data = ColumnarTextGrid.from_tgt(tgt.io.read_textgrid(annotation_path))
 
         self.tier_selection.set_data(self.annotation_data)
 
+    def save_session(self) -> None:
+        if not self.audio_path:
+            QtWidgets.QMessageBox.warning(self, "Save Session", "Load an audio file first.")
+            return
+
+        session_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Session", "", SESSION_FILTER
+        )
+        if not session_path:
+            return
+        if not session_path.lower().endswith(".session"):
+            session_path += ".session"
+
+        try:
+            write_session(session_path, *self.session_content())
+        except (OSError, TypeError, ValueError) as error:
+            QtWidgets.QMessageBox.warning(self, "Save Session", str(error))
+
+    def session_content(self) -> tuple[dict, dict[str, np.ndarray]]:
+        """
+        Header and arrays describing the loaded files (with their hashes), the
+        configuration, the dashboard rows and the curves they display.
+        """
+        files = {"audio": {"path": self.audio_path, "sha256": file_digest(self.audio_path)}}
+        if self.annotation_path:
+            files["textgrid"] = {
+                "path": self.annotation_path,
+                "sha256": file_digest(self.annotation_path),
+            }
+        if self.pos_path:
+            files["pos"] = {
+                "path": self.pos_path,
+                "sha256": file_digest(self.pos_path),
+                "target_sample_rate": self.custom_curves.get("pos_target_sample_rate", 200),
+            }
+
+        custom_curves, settings = {}, {}
+        for name, value in self.custom_curves.items():
+            if isinstance(value, dict) and "generator_function" in value:
+                custom_curves[name] = {
+                    "generator": value["generator_function"].__name__,
+                    "params": value["params"],
+                    "panel_id": value.get("panel_id"),
+                }
+            else:
+                settings[name] = value
+
+        arrays = {}
+        rows = []
+        dashboard = self.dashboard_widget.dashboard
+        for row_id in range(dashboard.topLevelItemCount()):
+            item = dashboard.topLevelItem(row_id)
+            curve, panel = self.curves.get(row_id, [None, None])
+
+            row = {
+                "curve": item._curve_type.currentText(),
+                "derivation": item.derivation_type,
+                "panel": self.panels.index(panel) if panel is not None else item.selected_panel,
+                "color": item.color_selection.color,
+                "visible": item.visibility_checkbox.isChecked(),
+                "plot": None,
+            }
+
+            if curve is not None and panel is not None and panel.panel.get_item_axis(curve):
+                row["plot"] = {
+                    "scatter": isinstance(curve.curve, pg.ScatterPlotItem),
+                    "default_range": curve.default_range,
+                }
+                arrays[f"row{row_id}/x"], arrays[f"row{row_id}/y"] = curve.data()
+                for marker_name in ("min", "max"):
+                    marker_x, marker_y = getattr(curve, marker_name).getData()
+                    arrays[f"row{row_id}/{marker_name}_x"] = marker_x
+                    arrays[f"row{row_id}/{marker_name}_y"] = marker_y
+
+            rows.append(row)
+
+        spectrogram = self.audio_widget.spectrogram_data
+        if spectrogram is not None:
+            arrays["spectrogram/times"] = spectrogram.timestamps
+            arrays["spectrogram/frequencies"] = spectrogram.frequencies
+            arrays["spectrogram/values"] = spectrogram.data_matrix
+
+        header = {
+            "files": files,
+            "custom_curves": custom_curves,
+            "settings": settings,
+            "rows": rows,
+        }
+        return header, arrays
+
+    def open_session(self) -> None:
+        session_path, _ = QFileDialog.getOpenFileName(
+            self, "Open Session", "", SESSION_FILTER
+        )
+        if not session_path:
+            return
+
+        try:
+            header, arrays = read_session(session_path)
+            self.restore_session(header, arrays)
+        except (OSError, KeyError, ValueError) as error:
+            QtWidgets.QMessageBox.warning(self, "Open Session", str(error))
+
+    def restore_session(self, header: dict, arrays: dict[str, np.ndarray]) -> None:
+        """
+        Rebuilds the window from a session. The stored curves are displayed
+        as they are when the files they come from still have the same
+        content, they are computed again otherwise.
+        """
+        files = header["files"]
+
+        def unchanged(kind: str) -> bool:
+            return kind in files and file_digest(files[kind]["path"]) == files[kind]["sha256"]
+
+        audio_path = files["audio"]["path"]
+        if not os.path.exists(audio_path):
+            raise ValueError(f"The audio file {audio_path} does not exist anymore")
+        audio_unchanged = unchanged("audio")
+
+        self.dashboard_widget.reset()
+        self.reset_curves()
+        self.custom_curves.clear()
+        self.custom_curves.update(header["settings"])
+        self.dashboard_widget.dashboard.pos_channels.clear()
+
+        self.audio_path = audio_path
+        self.curve_generator.clear_region_caches()
+        self.audio_indicator.file_loaded(audio_path)
+
+        spectrogram = None
+        if audio_unchanged and "spectrogram/values" in arrays:
+            spectrogram = Spectrogram(
+                arrays["spectrogram/times"],
+                arrays["spectrogram/frequencies"],
+                arrays["spectrogram/values"],
+            )
+        self.audio_widget.set_data(Parselmouth(audio_path), spectrogram)
+        self.playback.load(audio_path)
+        self.audio_duration = self.get_audio_duration(audio_path)
+        self.set_panel_x_limits(self.audio_duration)
+
+        if "textgrid" in files and os.path.exists(files["textgrid"]["path"]):
+            self.open_annotations(files["textgrid"]["path"])
+
+        pos_unchanged = False
+        if "pos" in files and os.path.exists(files["pos"]["path"]):
+            self.pos_path = files["pos"]["path"]
+            self.pos_data = read_AG50x(
+                self.pos_path, target_sample_rate=files["pos"]["target_sample_rate"]
+            )
+            self.pos_channels = self.pos_data.channels.values
+            pos_unchanged = unchanged("pos")
+
+        for name, entry in header["custom_curves"].items():
+            generator_function = getattr(
+                self.curve_generator, entry["generator"], getattr(self, entry["generator"], None)
+            )
+            if generator_function is None:
+                continue
+            self.custom_curves[name] = {
+                "params": entry["params"],
+                "generator_function": generator_function,
+            }
+            if entry["panel_id"] is not None:
+                self.custom_curves[name]["panel_id"] = entry["panel_id"]
+            if entry["generator"] == "generate_pos_curve":
+                self.dashboard_widget.dashboard.pos_channels.append(name)
+
+        dashboard = self.dashboard_widget.dashboard
+        for row_id, row in enumerate(header["rows"]):
+            dashboard.append_row()
+            item = dashboard.topLevelItem(row_id)
+            item.restore(row["curve"], row["panel"], row["derivation"], row["color"], row["visible"])
+
+            panel = self.panels[row["panel"]]
+            self.curves[row_id] = [None, panel]
+            if row["plot"] is None:
+                continue
+
+            from_pos = row["curve"] in dashboard.pos_channels
+            if audio_unchanged and (pos_unchanged or not from_pos):
+                curve = self.session_curve(row_id, row["plot"], arrays)
+                try:
+                    panel.panel.add_curve(curve)
+                except ValueError:
+                    continue
+                self.curves[row_id][0] = curve
+                self.curve_contents[row_id] = (row["curve"], row["derivation"])
+            else:
+                self.update_curve(row_id, item.curve_type, item.derivation_type)
+                curve = self.curves[row_id][0]
+
+            if curve is None:
+                continue
+            self.change_curve_color(row_id, row["color"])
+            if not row["visible"]:
+                curve.hide()
+
+    def session_curve(self, row_id: int, plot: dict, arrays: dict[str, np.ndarray]) -> CalculationValues:
+        item = pg.ScatterPlotItem() if plot["scatter"] else pg.PlotDataItem()
+        default_range = plot["default_range"]
+
+        curve = CalculationValues(
+            item, pg.ScatterPlotItem(), pg.ScatterPlotItem(), self.point_management_toolbar,
+            default_range=tuple(default_range) if default_range is not None else None,
+        )
+        curve.set_data(arrays[f"row{row_id}/x"], arrays[f"row{row_id}/y"])
+        curve.min.setData(arrays[f"row{row_id}/min_x"], arrays[f"row{row_id}/min_y"])
+        curve.max.setData(arrays[f"row{row_id}/max_x"], arrays[f"row{row_id}/max_y"])
+        return curve
+
     def change_curve_panel(self, row_id: int, new_panel_id: int) -> None:
         if row_id not in self.curves:
             return
@@ -1746,24 +2727,52 @@ class MainWindow(QtWidgets.QMainWindow):
         curve_name = item._curve_type.currentText()
         derivation_id = item._derivation_type.currentIndex()
 
+        # the displayed items are only reused when they stay in their panel
+        reusable_curve = old_curve if panel is not None else None
+
         if curve_name in self.custom_curves:
             custom_curve_config = self.custom_curves[curve_name]
             generator_function = custom_curve_config["generator_function"]
             params = custom_curve_config["params"]
-            new_curve = generator_function(self.audio_path, params, derivation_id)
+            new_curve = generator_function(
+                self.audio_path, params, derivation_id, curve=reusable_curve
+            )
         else:
             if curve_type_id >= 0 and curve_type_id < len(
                 self.curve_generator.datasources
             ):
-                new_curve = self.curve_generator.generate(
-                    self.audio_path, curve_type_id, derivation_id
-                )
+                if self.region_analysis:
+                    new_curve = self.curve_generator.generate_region(
+                        self.audio_path, curve_type_id, derivation_id,
+                        *self.analysis_span(), curve=reusable_curve,
+                    )
+                elif self.progressive_rendering:
+                    new_curve = self.curve_generator.generate_progressive(
+                        self.audio_path, curve_type_id, derivation_id,
+                        curve=reusable_curve,
+                    )
+                else:
+                    new_curve = self.curve_generator.generate(
+                        self.audio_path, curve_type_id, derivation_id,
+                        curve=reusable_curve,
+                    )
             else:
                 return
 
         if panel is None:
             return
 
+        content = (curve_name, derivation_id)
+        if new_curve is old_curve:
+            # updated in place: the axis, colour and signals are kept, the
+            # min/max markers too unless the row now shows another curve
+            if self.curve_contents.get(row_id) != content:
+                new_curve.clear_markers()
+                panel.panel.reset_range(new_curve)
+            self.curve_contents[row_id] = content
+            return
+        self.curve_contents[row_id] = content
+
         if old_curve is not None:
             try:
                 panel.panel.remove_curve(old_curve)
@@ -1786,15 +2795,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self.dashboard_widget.dashboard.reset()
         # Also clear any internal tracking of curves
         self.curves.clear()
+        self.curve_contents.clear()
 
 
 
     def reset_curves(self) -> None:
         self.curves.clear()
+        self.curve_contents.clear()
         for panel in self.panels:
             panel.panel.reset()
     def open_config(self):
-        dialog = UnifiedConfigDialog(self)
+        dialog = UnifiedConfigDialog(
+            self,
+            audio_path=self.audio_path,
+            preview_region=self.audio_widget.reference_viewbox.viewRange()[0],
+        )
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
             params = dialog.get_parameters()
             if params["mfcc"]["enabled"]:
@@ -2014,10 +3029,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self.recording = True
         self.frames = []
         self.record_button.setText("Stop Recording")
+
+        self.online_features.reset()
+        self.add_live_curves()
+
         self.stream = sd.InputStream(
-            callback=self.audio_callback, channels=1, samplerate=44100, dtype="int16"
+            callback=self.audio_callback,
+            channels=1,
+            samplerate=self.record_sample_rate,
+            dtype="int16",
+            blocksize=int(BLOCK_DURATION * self.record_sample_rate),
+            latency="low",
         )
         self.stream.start()
+        self.timer.start(100)
+        self.live_timer.start()
 
     def stop_recording(self):
         self.recording = False
@@ -2025,6 +3051,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.stream.stop()
         self.stream.close()
         self.timer.stop()
+        self.live_timer.stop()
+        self.update_live_features()
+        self.remove_live_curves()
 
         recorded_audio = np.concatenate(self.frames, axis=0)
         non_zero_audio_data = recorded_audio[recorded_audio != 0]
@@ -2033,17 +3062,55 @@ class MainWindow(QtWidgets.QMainWindow):
             self, "Save Recorded Audio", "", "Audio Files (*.wav)"
         )
         if audio_path:
-            wavfile.write(audio_path, 44100, non_zero_audio_data)
+            wavfile.write(audio_path, self.record_sample_rate, non_zero_audio_data)
 
             self.audio_path = audio_path
+            self.curve_generator.clear_region_caches()
             self.audio_indicator.file_loaded(audio_path)
             self.audio_widget.set_data(Parselmouth(audio_path))
+            self.playback.load(audio_path)
             self.reset_curves()
 
     def audio_callback(self, indata, frames, time, status):
+        # Runs on the audio thread: no Qt calls here.
         if self.recording:
-            self.frames.append(indata.copy())
-            self.update_plot()
+            block = indata.copy()
+            self.frames.append(block)
+            self.live_blocks.put(block)
+
+    def add_live_curves(self) -> None:
+        """Show one live curve per online feature, one feature per panel."""
+        for panel_widget, name in zip(self.panels, self.online_features.tracks):
+            live_curve = CurvePlotter(self.point_management_toolbar).plot(
+                np.zeros(0), np.zeros(0)
+            )
+            try:
+                panel_widget.panel.add_curve(live_curve)
+            except ValueError:
+                continue
+
+            self.live_curves[name] = (live_curve, panel_widget)
+
+    def remove_live_curves(self) -> None:
+        for live_curve, panel_widget in self.live_curves.values():
+            panel_widget.panel.remove_curve(live_curve)
+        self.live_curves.clear()
+
+    def update_live_features(self) -> None:
+        blocks = []
+        while not self.live_blocks.empty():
+            blocks.append(self.live_blocks.get_nowait())
+
+        if not blocks:
+            return
+
+        audio_block = np.concatenate(blocks, axis=0)[:, 0] / 32768.0
+        emitted = self.online_features.process(audio_block)
+
+        # only the new frames: the work per tick does not grow with the recording
+        for name, (live_curve, _) in self.live_curves.items():
+            frames = emitted[name]
+            live_curve.append(frames.times, frames.values)
 
     def update_plot(self):
         if self.frames:
@@ -2054,104 +3121,99 @@ class MainWindow(QtWidgets.QMainWindow):
         if not self.audio_path:
             return
 
-        region = self.audio_widget.selection_region.getRegion()
-        start, end = region
-        duration = end - start
-
-        fs, audio_data = wavfile.read(self.audio_path)
-        if audio_data.ndim > 1:
-            audio_data = audio_data[:, 0]
-
-        selected_audio = audio_data[int(start * fs): int(end * fs)]
-
-        def play_audio():
-            self.playing = True
-            sd.play(selected_audio, fs)
-            sd.wait()
-            self.playing = False
-
-        threading.Thread(target=play_audio).start()
+        start, end = self.audio_widget.selection_region.getRegion()
 
+        self.playback.play(start, end)
         self.audio_cursor.setRegion([start, start])
         self.audio_cursor.show()
-        threading.Thread(
-            target=self.animate_cursor, args=(start, end, duration)
-        ).start()
-
-    def animate_cursor(self, start, end, duration):
-        start_time = time.time()
-        end_time = start_time + duration
-
-        while time.time() < end_time:
-            elapsed_time = time.time() - start_time
-            current_pos = start + elapsed_time
-            
-            # Ensure that we do not exceed the end position
-            if current_pos > end:
-                current_pos = end
-            
-            self.audio_cursor.setRegion([start, current_pos])
-            
-            # Calculate the remaining time to avoid excessive CPU usage
-            remaining_time = max(0, (1/60.0) - (time.time() - start_time))  # Assuming 60 FPS
-            time.sleep(remaining_time)
-        
-        self.stop_audio()
 
+    def move_audio_cursor(self, position: float) -> None:
+        start, _ = self.audio_cursor.getRegion()
+        self.audio_cursor.setRegion([start, position])
 
     def stop_audio(self):
         self.audio_cursor.hide()
-        self.playing = False
+
+
 class SyncCursor:
-    def __init__(self, panels, audio_widget):
+    """
+    Vertical cursor line shared by the audio widget and the panels, with the
+    values of the visible curves at its time shown in a CursorReadout.
+
+    Mouse moves only record the latest position, the lines and the readout
+    are updated from it at most once per display frame.
+    """
+    frame_interval = 16  # ms, about 60 updates per second
+
+    def __init__(
+        self,
+        panels: list[PanelWidget],
+        audio_widget: SoundInformation,
+        readout: CursorReadout | None = None,
+        curves: Callable[[], dict[str, CalculationValues]] | None = None,
+    ):
         self.panels = panels
         self.audio_widget = audio_widget
+        self.readout = readout
+        self.curves = curves
         self.sync_cursor_lines = []
+        self.pending = None
+        self.x_pos = None
 
         # Create a sync line for each panel and the audio widget
         for panel in self.panels:
             sync_line = pg.InfiniteLine(angle=90, pen=pg.mkPen('r', style=QtCore.Qt.DashLine))
-            panel.panel.addItem(sync_line)
+            panel.panel.addItem(sync_line, ignoreBounds=True)
             self.sync_cursor_lines.append(sync_line)
 
         # Create a sync line for the audio widget
         self.audio_sync_line = pg.InfiniteLine(angle=90, pen=pg.mkPen('r', style=QtCore.Qt.DashLine))
-        self.audio_widget.sound_plot.addItem(self.audio_sync_line)
+        self.audio_widget.sound_plot.addItem(self.audio_sync_line, ignoreBounds=True)
+        self.sync_cursor_lines.append(self.audio_sync_line)
 
-        # Connect all panels to the same mouse event handler
-        for panel in self.panels:
-            panel.panel.scene().sigMouseMoved.connect(self.update_cursor_position)
-        self.audio_widget.sound_plot.scene().sigMouseMoved.connect(self.update_cursor_position)
+        self.timer = QtCore.QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.frame_interval)
+        self.timer.timeout.connect(self.update_cursor_position)
 
-    def update_cursor_position(self, pos):
-        # Handle the audio widget first
+        # Each scene only hit-tests its own viewbox
+        for panel in self.panels:
+            vb_panel = panel.panel.getViewBox()
+            panel.panel.scene().sigMouseMoved.connect(
+                lambda pos, vb=vb_panel: self.mouse_moved(vb, pos)
+            )
         vb_audio = self.audio_widget.sound_plot.getViewBox()
-        if vb_audio.sceneBoundingRect().contains(pos):
-            mouse_point = vb_audio.mapSceneToView(pos)
-            x_pos = mouse_point.x()
+        self.audio_widget.sound_plot.scene().sigMouseMoved.connect(
+            lambda pos: self.mouse_moved(vb_audio, pos)
+        )
 
-            # Update the audio sync line
-            self.audio_sync_line.setPos(x_pos)
+    def mouse_moved(self, viewbox: pg.ViewBox, pos: QtCore.QPointF) -> None:
+        self.pending = (viewbox, pos)
+        if not self.timer.isActive():
+            self.timer.start()
 
-            # Update the sync lines in all panels
-            for sync_line in self.sync_cursor_lines:
-                sync_line.setPos(x_pos)
+    def update_cursor_position(self) -> None:
+        if self.pending is None:
             return
+        viewbox, pos = self.pending
+        self.pending = None
 
-        # If not in audio, check in the panels
-        for panel in self.panels:
-            vb_panel = panel.panel.getViewBox()
-            if vb_panel.sceneBoundingRect().contains(pos):
-                mouse_point = vb_panel.mapSceneToView(pos)
-                x_pos = mouse_point.x()
+        if not viewbox.sceneBoundingRect().contains(pos):
+            return
+
+        x_pos = viewbox.mapSceneToView(pos).x()
+        if x_pos == self.x_pos:
+            return
+        self.x_pos = x_pos
 
-                # Update all sync cursors
-                for sync_line in self.sync_cursor_lines:
-                    sync_line.setPos(x_pos)
+        for sync_line in self.sync_cursor_lines:
+            sync_line.setPos(x_pos)
 
-                # Update the audio sync line as well
-                self.audio_sync_line.setPos(x_pos)
-                break
+        if self.readout is not None and self.curves is not None:
+            self.readout.display(x_pos, {
+                name: curve.value_at(x_pos)
+                for name, curve in self.curves().items()
+            })
 
 
 if __name__ == "__main__":
@@ -25,6 +25,9 @@ import copy
 
 import inspect
 import pyqtgraph as pg
+
+from praat_py_ui.praat_cache import analysis, samples_sound
+
 #scripts par Leonardo Lancia
 def applyFilter(
                 x,
@@ -207,11 +210,9 @@ def get_amplitude(
     
     elif method=='RMSpraat': # RMS informed by minimum pitch (calls praat)
         
-        xObj=parselmouth.Sound(values= x,
-                          sampling_frequency = sr, 
-                          start_time = 0.0)
+        xObj=samples_sound(x, sr)
         
-        tmpPitch = call(xObj, "To Pitch", hopLen, 50, 700)
+        tmpPitch = analysis(xObj, "To Pitch", hopLen, 50, 700)
         
         tmpPitch = tmpPitch.selected_array['frequency']
         
@@ -219,18 +220,18 @@ def get_amplitude(
         
         quants = np.quantile(tmpPitch, [0.25, 0.75])
         
-        tmpPitch = call(xObj, "To Pitch", hopLen,
+        tmpPitch = analysis(xObj, "To Pitch", hopLen,
                         0.75*quants[0], 2.5*quants[1])
         
         tmpPitch = tmpPitch.selected_array['frequency']
         
         if np.min(tmpPitch) > 120:
             
-            amp = call(xObj, "To Intensity", np.min(
+            amp = analysis(xObj, "To Intensity", np.min(
                 tmpPitch), hopLen, 1)
         else:
             
-            amp = call(xObj, "To Intensity", 120, 1/sr, 1)
+            amp = analysis(xObj, "To Intensity", 120, 1/sr, 1)
         
         
         ampSr=1/amp.get_time_step()
@@ -245,8 +246,6 @@ def get_amplitude(
         winLen=int(winLen*sr)
         
         amp=rms(y=x, frame_length=winLen, hop_length=frLen, center=center, pad_mode='constant').flatten()
-    
-    if (method!='hilb')& (method!='RMSpraat'):
         
         ampT=np.arange(len(amp))*hopLen
         
@@ -379,6 +378,41 @@ def get_MFCCS_change(
     else:
         y=myAudio
     
+    myMfccs, T = get_MFCCs(y, sigSr, tStep=tStep, winLen=winLen, n_mfcc=n_mfcc,
+                           n_fft=n_fft, minFreq=minFreq, maxFreq=maxFreq)
+    
+    totChange = get_MFCCs_change_from(myMfccs, tStep, removeFirst=removeFirst,
+                                      filtCutoff=filtCutoff, filtOrd=filtOrd, diffMethod=diffMethod,
+                                      outFilter=outFilter, outFiltType=outFiltType, outFiltCutOff=outFiltCutOff,
+                                      outFiltLen=outFiltLen, outFiltPolyOrd=outFiltPolyOrd)
+    
+    return totChange, T
+
+def get_MFCCs(
+              y:npt.NDArray,
+              sigSr:float,
+              /,*,
+              tStep:float=0.001, 
+              winLen:float=0.025, 
+              n_mfcc:int=13, 
+              n_fft:int=512, 
+              minFreq:int=100, 
+              maxFreq:int= 10000
+              ):
+    """
+    First stage of get_MFCCS_change: MFCCs of the one dimensional signal y 
+    (see get_MFCCS_change for the parameters).
+    
+    The coefficients do not depend on the parameters of the following stage,
+    so one matrix can serve every filter setting. The first n rows of a matrix 
+    computed with n_mfcc > n are the matrix computed with n_mfcc = n.
+    
+    Ouput
+    -------    
+        myMfccs: MFCCs (coefficients x frames)
+        
+        T: time stamps for each frame   
+    """
     win_length=int(winLen*sigSr)# get window length in frame numbers
     
     hop_length=int(tStep*sigSr)# get hop length in frame numbers
@@ -389,6 +423,30 @@ def get_MFCCS_change(
     # obtain time anchors
     T=np.round(np.multiply(np.arange(1,np.shape(myMfccs)[1]+1),tStep)+winLen/2,4)
     
+    return myMfccs, T
+
+def get_MFCCs_change_from(
+                          myMfccs:npt.NDArray,
+                          tStep:float,
+                          /,*,
+                          removeFirst:int=1, 
+                          filtCutoff:int=12, 
+                          filtOrd:int=6, 
+                          diffMethod:str='grad', 
+                          outFilter:str='iir',
+                          outFiltType:str='low',
+                          outFiltCutOff:list|npt.NDArray=[None], 
+                          outFiltLen:int=6,  
+                          outFiltPolyOrd:int=3
+                          ):
+    """
+    Second stage of get_MFCCS_change: amount of change over time of the MFCCs
+    computed by get_MFCCs every tStep secs (see get_MFCCS_change for the parameters).
+    
+    Ouput
+    -------    
+        totChange: Amount of change over time
+    """
     # remove first component (it's amplitude)
     if removeFirst:
        
@@ -424,4 +482,4 @@ def get_MFCCS_change(
         
         totChange=applyFilter(totChange,1/tStep,filt=outFilter,filtType=outFiltType,cutOff=outFiltCutOff, filtLen=outFiltLen, polyOrd=outFiltPolyOrd)
     
-    return totChange, T
+    return totChange
@@ -0,0 +1,430 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import override
+
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import butter, group_delay, sos2tf, sosfilt, sosfilt_zi
+from librosa import power_to_db
+from librosa.feature import melspectrogram, mfcc as mfccSpectr
+
+
+# live display: the audio stream hands over blocks of BLOCK_DURATION and the
+# emitted frames are drawn every REFRESH_INTERVAL (s)
+BLOCK_DURATION = 0.01
+REFRESH_INTERVAL = 0.01
+
+
+@dataclass
+class FeatureFrames:
+    """
+    Feature values emitted by an online feature for one block of audio.
+    Times are absolute, in seconds from the start of the stream.
+    """
+    name: str
+    times: npt.NDArray
+    values: npt.NDArray
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+
+class CausalFilter:
+    """
+    Low-pass Butterworth filter applied block by block with `sosfilt`.
+    The filter state is carried from one call to the next so that filtering
+    consecutive blocks gives the same result as filtering their concatenation.
+    """
+
+    def __init__(self, sr: float, cutOff: float, order: int = 6) -> None:
+        self.sr = sr
+        self.sos = butter(order, cutOff / (sr / 2), btype='low', output='sos')
+        self.zi = None
+
+    @property
+    def delay(self) -> float:
+        """Group delay in seconds of the slow variations: the delay of a step."""
+        _, delay = group_delay(sos2tf(self.sos), w=[0])
+        return float(delay[0]) / self.sr
+
+    def reset(self) -> None:
+        self.zi = None
+
+    def __call__(self, x: npt.NDArray) -> npt.NDArray:
+        if x.shape[-1] == 0:
+            return x
+
+        if self.zi is None:
+            # start from the steady state of the first value to avoid a transient
+            zi = sosfilt_zi(self.sos)
+            if x.ndim > 1:
+                self.zi = zi[:, None, :] * x[:, 0][None, :, None]
+            else:
+                self.zi = zi * x[0]
+
+        y, self.zi = sosfilt(self.sos, x, axis=-1, zi=self.zi)
+        return y
+
+
+class OnlineFeature(ABC):
+    """
+    Defines the interface for features computed incrementally from an audio stream.
+
+    Blocks of any length can be fed to `process`; samples that do not complete
+    an analysis frame are kept until the next call.
+    """
+    name: str
+
+    def __init__(self, sr: float, winLen: float, hopLen: float) -> None:
+        self.sr = sr
+        self.win_length = max(1, int(winLen * sr))
+        self.hop_length = max(1, int(hopLen * sr))
+        self.reset()
+
+    def reset(self) -> None:
+        self._buffer = np.zeros(0)
+        # absolute index of the first sample kept in the buffer
+        self._buffer_start = 0
+
+    def process(self, block: npt.NDArray) -> FeatureFrames:
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim > 1:
+            block = block[:, 0]
+
+        buffer = np.concatenate((self._buffer, block))
+        frame_length = self.frame_length
+
+        if len(buffer) < frame_length:
+            self._buffer = buffer
+            return FeatureFrames(self.name, np.zeros(0), np.zeros(0))
+
+        frame_count = (len(buffer) - frame_length) // self.hop_length + 1
+        frames = sliding_window_view(buffer, frame_length)[::self.hop_length][:frame_count]
+
+        starts = self._buffer_start + np.arange(frame_count) * self.hop_length
+        times = (starts + frame_length / 2) / self.sr
+
+        values = self.compute(frames)
+
+        consumed = frame_count * self.hop_length
+        self._buffer = buffer[consumed:]
+        self._buffer_start += consumed
+
+        return FeatureFrames(self.name, times, values)
+
+    @property
+    def frame_length(self) -> int:
+        return self.win_length
+
+    @property
+    def latency(self) -> float:
+        """
+        Delay in seconds between a sample entering the stream and the frame
+        reflecting it: half a frame, plus the delay of the causal filters.
+        """
+        return self.frame_length / 2 / self.sr
+
+    def display_latency(
+        self, block_duration: float = BLOCK_DURATION, refresh_interval: float = REFRESH_INTERVAL
+    ) -> float:
+        """
+        Longest delay in seconds before a sample shows on a live display: the
+        frame reflecting it waits for the end of its block, then for the next
+        refresh. The time spent computing and drawing is not included.
+        """
+        return self.latency + block_duration + refresh_interval
+
+    @abstractmethod
+    def compute(self, frames: npt.NDArray) -> npt.NDArray:
+        """
+        @Returns one value per frame (frames has shape (frame_count, frame_length))
+        """
+        pass
+
+
+class OnlineAmplitudeEnvelope(OnlineFeature):
+    """
+    Causal version of `calculate_amplitude_envelope(method='RMS')`.
+    """
+    name = "ENV_AMP"
+
+    def __init__(
+        self,
+        sr: float,
+        winLen: float = 0.025,
+        hopLen: float = 0.01,
+        outFiltCutOff: float | None = 12,
+        outFiltLen: int = 6,
+    ) -> None:
+        self.out_filter = None
+        if outFiltCutOff is not None:
+            self.out_filter = CausalFilter(1 / hopLen, outFiltCutOff, outFiltLen)
+
+        super().__init__(sr, winLen, hopLen)
+
+    @override
+    def reset(self) -> None:
+        super().reset()
+        if self.out_filter is not None:
+            self.out_filter.reset()
+
+    @property
+    @override
+    def latency(self) -> float:
+        if self.out_filter is None:
+            return super().latency
+        return super().latency + self.out_filter.delay
+
+    @override
+    def compute(self, frames: npt.NDArray) -> npt.NDArray:
+        amp = np.sqrt(np.mean(frames ** 2, axis=1))
+
+        if self.out_filter is not None:
+            amp = self.out_filter(amp)
+
+        return amp
+
+
+class OnlineMfccChange(OnlineFeature):
+    """
+    Causal version of `get_MFCCS_change`: the MFCCs of each new frame are
+    low-pass filtered with a carried `sosfilt` state, differentiated with a
+    backward difference and the total amount of change is filtered again.
+    """
+    name = "Mod_Cepstr"
+
+    def __init__(
+        self,
+        sr: float,
+        tStep: float = 0.005,
+        winLen: float = 0.025,
+        n_mfcc: int = 13,
+        minFreq: int = 100,
+        maxFreq: int = 10000,
+        removeFirst: int = 1,
+        filtCutoff: float = 12,
+        filtOrd: int = 6,
+    ) -> None:
+        self.n_mfcc = n_mfcc
+        self.min_freq = minFreq
+        self.max_freq = min(maxFreq, sr / 2)
+        self.remove_first = removeFirst
+
+        self.mfcc_filter = CausalFilter(1 / tStep, filtCutoff, filtOrd)
+        self.change_filter = CausalFilter(1 / tStep, filtCutoff, filtOrd)
+
+        super().__init__(sr, winLen, tStep)
+        self.n_fft = int(2 ** np.ceil(np.log2(self.win_length)))
+
+    @override
+    def reset(self) -> None:
+        super().reset()
+        self.mfcc_filter.reset()
+        self.change_filter.reset()
+        self._previous = None
+
+    @property
+    @override
+    def frame_length(self) -> int:
+        return self.n_fft
+
+    @property
+    @override
+    def latency(self) -> float:
+        # a sudden change gives a pulse, shown at the peak of the impulse
+        # response of both filters (later than the sum of their group delays)
+        impulse = np.zeros(int(self.sr / self.hop_length))
+        impulse[0] = 1
+        response = sosfilt(np.concatenate((self.mfcc_filter.sos, self.change_filter.sos)), impulse)
+        return super().latency + float(np.argmax(response)) * self.hop_length / self.sr
+
+    @override
+    def compute(self, frames: npt.NDArray) -> npt.NDArray:
+        # frames overlap, rebuild the contiguous signal they were cut from
+        signal = np.concatenate((frames[0], frames[1:, -self.hop_length:].reshape(-1)))
+
+        mel = melspectrogram(
+            y=signal, sr=self.sr, n_fft=self.n_fft,
+            win_length=self.win_length, hop_length=self.hop_length,
+            center=False, fmin=self.min_freq, fmax=self.max_freq,
+        )[:, :len(frames)]
+
+        # no top_db clipping: it would depend on the loudest frame of the block
+        my_mfccs = mfccSpectr(S=power_to_db(mel, top_db=None), n_mfcc=self.n_mfcc)
+
+        if self.remove_first:
+            my_mfccs = my_mfccs[1:, :]
+
+        filt_mfccs = self.mfcc_filter(my_mfccs)
+
+        previous = filt_mfccs[:, :1] if self._previous is None else self._previous
+        my_diff = np.diff(np.concatenate((previous, filt_mfccs), axis=1), axis=1)
+        self._previous = filt_mfccs[:, -1:]
+
+        tot_change = np.sqrt(np.sum(my_diff ** 2, 0)) / np.shape(filt_mfccs)[0]
+
+        return self.change_filter(tot_change)
+
+
+class OnlineF0(OnlineFeature):
+    """
+    Frame-wise f0 from the normalised autocorrelation of each frame, computed
+    for all the frames of a block at once through the FFT. Unvoiced frames are NaN.
+
+    The period is the shortest lag whose autocorrelation peak reaches
+    peakRatio times the highest peak: multiples of the period correlate
+    about as well as the period itself and taking the highest one would
+    give octave errors.
+    """
+    name = "F0"
+
+    def __init__(
+        self,
+        sr: float,
+        hopSize: float = 0.01,
+        minPitch: float = 75,
+        maxPitch: float = 600,
+        voicingThresh: float = 0.45,
+        silenceThresh: float = 0.03,
+        peakRatio: float = 0.9,
+    ) -> None:
+        self.min_pitch = minPitch
+        self.max_pitch = maxPitch
+        self.voicing_thresh = voicingThresh
+        self.silence_thresh = silenceThresh
+        self.peak_ratio = peakRatio
+
+        # three periods of the lowest pitch, as Praat does
+        super().__init__(sr, 3 / minPitch, hopSize)
+
+        self.min_lag = max(1, int(sr / maxPitch))
+        self.max_lag = min(self.win_length - 1, int(np.ceil(sr / minPitch)))
+        self.n_fft = int(2 ** np.ceil(np.log2(2 * self.win_length)))
+        self.window = np.hanning(self.win_length)
+        self.window_acf = self._autocorrelation(self.window[None, :])[0]
+        self._peak = 0.0
+
+    @override
+    def reset(self) -> None:
+        super().reset()
+        self._peak = 0.0
+
+    def _autocorrelation(self, frames: npt.NDArray) -> npt.NDArray:
+        spectrum = np.fft.rfft(frames, n=self.n_fft, axis=1)
+        return np.fft.irfft(np.abs(spectrum) ** 2, n=self.n_fft, axis=1)[:, :self.max_lag + 2]
+
+    @override
+    def compute(self, frames: npt.NDArray) -> npt.NDArray:
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        acf = self._autocorrelation(frames * self.window)
+
+        energy = acf[:, 0]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            acf = acf / energy[:, None] / (self.window_acf / self.window_acf[0])
+
+        # local maxima within the searched lags
+        candidates = acf[:, self.min_lag:self.max_lag + 1]
+        previous = acf[:, self.min_lag - 1:self.max_lag]
+        following = acf[:, self.min_lag + 1:self.max_lag + 2]
+        peaks = (candidates >= previous) & (candidates > following)
+
+        highest = np.max(np.where(peaks, candidates, -np.inf), axis=1, keepdims=True)
+        first = np.argmax(peaks & (candidates >= self.peak_ratio * highest), axis=1)
+        # no local maximum: the correlation grows up to an end of the range
+        best = self.min_lag + np.where(peaks.any(axis=1), first, np.argmax(candidates, axis=1))
+        rows = np.arange(len(frames))
+        strength = acf[rows, best]
+
+        # parabolic interpolation around the best lag
+        left = acf[rows, best - 1]
+        right = acf[rows, best + 1]
+        denominator = left - 2 * strength + right
+        with np.errstate(invalid='ignore', divide='ignore'):
+            shift = np.where(denominator != 0, 0.5 * (left - right) / denominator, 0)
+
+        f0 = self.sr / (best + np.clip(shift, -0.5, 0.5))
+
+        peak = np.sqrt(energy.max(initial=0) / self.win_length)
+        self._peak = max(self._peak, peak)
+        level = np.sqrt(energy / self.win_length)
+
+        voiced = (strength > self.voicing_thresh) & (level > self.silence_thresh * self._peak)
+        f0[~voiced] = np.nan
+
+        return f0
+
+
+class FeatureTrack:
+    """
+    Growing time series of feature frames, with amortised appends: the whole
+    recording is kept while only the new frames are drawn at each refresh.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._times = np.empty(capacity)
+        self._values = np.empty(capacity)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, frames: FeatureFrames) -> None:
+        new_size = self._size + len(frames)
+
+        if new_size > len(self._times):
+            capacity = max(new_size, 2 * len(self._times))
+            self._times = np.resize(self._times, capacity)
+            self._values = np.resize(self._values, capacity)
+
+        self._times[self._size:new_size] = frames.times
+        self._values[self._size:new_size] = frames.values
+        self._size = new_size
+
+    def get_data(self) -> tuple[npt.NDArray, npt.NDArray]:
+        return self._times[:self._size], self._values[:self._size]
+
+    def clear(self) -> None:
+        self._size = 0
+
+
+class OnlineFeatureExtractor:
+    """
+    Feeds the blocks of an audio stream to a set of online features and
+    accumulates the emitted frames in one `FeatureTrack` per feature.
+    """
+    features: list[OnlineFeature]
+    tracks: dict[str, FeatureTrack]
+
+    def __init__(self, sr: float, features: list[OnlineFeature] | None = None) -> None:
+        if features is None:
+            features = [
+                OnlineMfccChange(sr),
+                OnlineF0(sr),
+                OnlineAmplitudeEnvelope(sr),
+            ]
+
+        self.sr = sr
+        self.features = features
+        self.tracks = {feature.name: FeatureTrack() for feature in features}
+
+    @property
+    def latency(self) -> float:
+        return max(feature.latency for feature in self.features)
+
+    def process(self, block: npt.NDArray) -> dict[str, FeatureFrames]:
+        emitted = {}
+
+        for feature in self.features:
+            frames = feature.process(block)
+            self.tracks[feature.name].append(frames)
+            emitted[feature.name] = frames
+
+        return emitted
+
+    def reset(self) -> None:
+        for feature in self.features:
+            feature.reset()
+
+        for track in self.tracks.values():
+            track.clear()
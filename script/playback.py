@@ -0,0 +1,133 @@
+import numpy as np
+import numpy.typing as npt
+import sounddevice as sd
+from scipy.io import wavfile
+
+from PyQt5 import QtCore
+
+
+class PlaybackEngine(QtCore.QObject):
+    """
+    Plays regions of an audio file through a `sd.OutputStream` callback.
+
+    The file is memory-mapped once when loaded, so starting a playback only
+    opens the output stream. The playback position is derived from the
+    stream's own clock (the DAC time of the last buffer) and is published on
+    the GUI thread by a QTimer, so listeners can touch Qt items directly.
+    """
+    position_changed = QtCore.pyqtSignal(float)
+    finished = QtCore.pyqtSignal()
+
+    audio_data: npt.NDArray | None
+    sample_rate: int
+
+    def __init__(self, refresh_interval: int = 16, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+
+        self.audio_data = None
+        self.sample_rate = 0
+        self.scale = 1.0
+
+        self._stream = None
+        self._start = 0
+        self._end = 0
+        self._position = 0
+        # (first sample of the last buffer, DAC time at which it is heard)
+        self._clock = None
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(refresh_interval)
+        self.timer.timeout.connect(self._publish_position)
+
+    def load(self, audio_path: str) -> None:
+        self.stop()
+
+        try:
+            sample_rate, audio_data = wavfile.read(audio_path, mmap=True)
+        except ValueError:
+            # e.g. 24 bit files cannot be memory-mapped
+            sample_rate, audio_data = wavfile.read(audio_path)
+        if audio_data.ndim > 1:
+            audio_data = audio_data[:, 0]
+
+        self.sample_rate = sample_rate
+        self.audio_data = audio_data
+
+        # integer samples are converted to float32 block by block
+        if np.issubdtype(audio_data.dtype, np.integer):
+            self.scale = 1.0 / np.iinfo(audio_data.dtype).max
+        else:
+            self.scale = 1.0
+
+    @property
+    def is_playing(self) -> bool:
+        return self._stream is not None
+
+    def play(self, start: float, end: float) -> None:
+        if self.audio_data is None:
+            return
+
+        self.stop()
+
+        self._start = max(0, int(start * self.sample_rate))
+        self._end = min(len(self.audio_data), int(end * self.sample_rate))
+        self._position = self._start
+        self._clock = None
+
+        if self._end <= self._start:
+            return
+
+        self._stream = sd.OutputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            latency="low",
+            callback=self._callback,
+        )
+        self._stream.start()
+        self.timer.start()
+
+    def stop(self) -> None:
+        self.timer.stop()
+
+        if self._stream is None:
+            return
+
+        self._stream.abort()
+        self._stream.close()
+        self._stream = None
+
+        self.finished.emit()
+
+    def current_time(self) -> float:
+        """Time in seconds of the sample being heard right now."""
+        if self._stream is None or self._clock is None:
+            return self._start / self.sample_rate if self.sample_rate else 0.0
+
+        buffer_position, dac_time = self._clock
+        elapsed = max(0.0, self._stream.time - dac_time)
+        position = min(buffer_position + elapsed * self.sample_rate, self._end)
+
+        return position / self.sample_rate
+
+    def _callback(self, outdata, frames, time, status) -> None:
+        # Runs on the audio thread: no Qt calls here.
+        position = self._position
+        count = max(0, min(frames, self._end - position))
+
+        outdata[:count, 0] = self.audio_data[position:position + count] * self.scale
+        outdata[count:] = 0
+
+        self._clock = (position, time.outputBufferDacTime)
+        self._position = position + count
+
+        if count < frames:
+            raise sd.CallbackStop
+
+    def _publish_position(self) -> None:
+        if self._stream is not None and not self._stream.active:
+            self.position_changed.emit(self._end / self.sample_rate)
+            self.stop()
+            return
+
+        self.position_changed.emit(self.current_time())
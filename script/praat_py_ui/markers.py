@@ -1,10 +1,13 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
 from functools import total_ordering
+from operator import attrgetter
 from typing import override
 from dataclasses import dataclass
 
 
 @total_ordering
-@dataclass
+@dataclass(slots=True)
 class Marker:
     position: float
     name: str = ""
@@ -42,49 +45,121 @@ class Marker:
 
 
 class MarkerList:
+    """
+    Markers sorted by position. `positions` mirrors the positions of
+    `elements` so that lookups and insertions use `bisect`.
+    """
     elements: list[Marker]
+    positions: list[float]
 
-    def __init__(self):
+    def __init__(self, markers: Iterable[Marker] = ()):
         self.elements = []
+        self.positions = []
+        self.add_markers(markers)
 
     def __repr__(self):
         return str(self.elements)
 
+    def __len__(self) -> int:
+        return len(self.elements)
+
     def __contains__(self, element: Marker) -> bool:
-        return element.position in (m.position for m in self.elements)
+        return self._find_position(element.position) is not None
+
+    def _find_position(self, position: float) -> int | None:
+        idx = bisect_left(self.positions, position)
+        if idx < len(self.positions) and self.positions[idx] == position:
+            return idx
+        return None
+
+    def _insert(self, marker: Marker) -> None:
+        idx = bisect_right(self.positions, marker.position)
+        self.positions.insert(idx, marker.position)
+        self.elements.insert(idx, marker)
 
     def add_marker(self, marker: Marker) -> Marker:
-        if marker in self:
-            m = self.elements[self.elements.index(marker)]
+        idx = self._find_position(marker.position)
+        if idx is not None:
+            m = self.elements[idx]
             m.name = marker.name
             return m
 
-        self.elements.append(marker)
-        self.notify_marker_changed()
+        self._insert(marker)
 
         return marker
 
+    def add_markers(self, markers: Iterable[Marker]) -> list[Marker]:
+        """
+        Adds all the markers with a single merge, same result as calling
+        `add_marker` on each of them.
+
+        @Returns the marker stored for each given marker
+        """
+        stored = []
+        new_markers = {}
+
+        for marker in markers:
+            idx = self._find_position(marker.position)
+            if idx is not None:
+                m = self.elements[idx]
+            else:
+                m = new_markers.setdefault(marker.position, marker)
+
+            m.name = marker.name
+            stored.append(m)
+
+        if new_markers:
+            # both runs are sorted, timsort merges them in linear time
+            self.elements.extend(sorted(new_markers.values(), key=attrgetter("position")))
+            self.elements.sort(key=attrgetter("position"))
+            self.positions = [m.position for m in self.elements]
+
+        return stored
+
     def remove_marker(self, marker: Marker) -> Marker:
-        self.elements.remove(marker)
-        self.notify_marker_changed()
-        return marker
+        return self.remove_marker_by_idx(self.get_marker_idx(marker))
 
     def remove_marker_by_idx(self, marker_idx: int) -> Marker:
-        res = self.elements.pop(marker_idx)
-        self.notify_marker_changed()
-        return res
+        return self._pop(marker_idx)
+
+    def _pop(self, marker_idx: int) -> Marker:
+        self.positions.pop(marker_idx)
+        return self.elements.pop(marker_idx)
+
+    def move_marker(self, marker: Marker, new_position: float) -> None:
+        """Changes the position of a marker and keeps the list sorted."""
+        self._pop(self.get_marker_idx(marker))
+        marker.position = float(new_position)
+        self._insert(marker)
 
     def get_marker(self, marker_idx: int) -> Marker:
         return self.elements[marker_idx]
 
     def get_marker_idx(self, marker: Marker) -> int:
-        return self.elements.index(marker)
+        idx = bisect_left(self.positions, marker.position)
+
+        if idx < len(self.elements) and self.elements[idx] is marker:
+            return idx
+
+        # markers are equal when their rounded positions are
+        for neighbour_idx in (idx - 1, idx):
+            if 0 <= neighbour_idx < len(self.elements) and self.elements[neighbour_idx] == marker:
+                return neighbour_idx
+
+        raise ValueError(f"{marker} is not in the list")
+
+    def get_marker_before(self, position: float) -> Marker | None:
+        """Last marker at or before the position."""
+        idx = bisect_right(self.positions, position)
+        return self.elements[idx - 1] if idx > 0 else None
 
     def get_markers(self) -> list[Marker]:
         return self.elements.copy()
 
     def notify_marker_changed(self) -> None:
-        self.elements.sort()
+        """Sorts the list again after positions were changed on the markers directly."""
+        self.elements.sort(key=attrgetter("position"))
+        self.positions = [m.position for m in self.elements]
 
 
 @dataclass
@@ -127,8 +202,8 @@ class IntervalMarkerList(MarkerList):
 
     @override
     def remove_marker(self, marker: Marker) -> Marker:
-        marker_idx = self.elements.index(marker)
-        self.remove_marker_by_idx(marker_idx)
+        marker_idx = self.get_marker_idx(marker)
+        return self.remove_marker_by_idx(marker_idx)
 
     @override
     def remove_marker_by_idx(self, marker_idx: int) -> Marker:
@@ -143,17 +218,38 @@ class IntervalMarkerList(MarkerList):
         previous_marker_idx = marker_idx % len(self.elements)
         self.elements[previous_marker_idx].name += marker_to_remove.name
 
-    def add_interval(self, interval: IntervalMarker):
-        has_marker_between = any(
-            (interval.start_time < m < interval.end_time for m in self.elements)
-        )
+        return marker_to_remove
+
+    def has_marker_between(self, start: float, end: float) -> bool:
+        idx = bisect_right(self.positions, start)
+        return idx < len(self.positions) and self.positions[idx] < end
 
-        if has_marker_between:
+    def add_interval(self, interval: IntervalMarker):
+        if self.has_marker_between(interval.start_time.position, interval.end_time.position):
             raise ValueError("Impossible to add interval")
 
         interval.start_time = self.add_marker(interval.start_time)
         interval.end_time = self.add_marker(interval.end_time)
 
+    def add_intervals(self, intervals: list[IntervalMarker]) -> None:
+        """
+        Adds sorted, non-overlapping intervals (e.g. those of a TextGrid tier)
+        with a single merge of their boundaries.
+        """
+        starts = [interval.start_time.position for interval in intervals]
+        ends = [interval.end_time.position for interval in intervals]
+
+        overlapping = any(end > next_start for end, next_start in zip(ends, starts[1:]))
+        if overlapping or any(map(self.has_marker_between, starts, ends)):
+            raise ValueError("Impossible to add interval")
+
+        boundaries = [m for interval in intervals for m in (interval.start_time, interval.end_time)]
+        stored = self.add_markers(boundaries)
+
+        for interval, start, end in zip(intervals, stored[0::2], stored[1::2]):
+            interval.start_time = start
+            interval.end_time = end
+
     def get_interval(self, interval_idx: int) -> IntervalMarker:
 
         index = interval_idx % len(self.elements)
@@ -3,6 +3,8 @@ from dataclasses import dataclass, field
 import numpy
 import parselmouth
 
+from praat_py_ui.praat_cache import analysis, file_sound
+
 @dataclass
 class Sound:
     timestamps: list[int] = field(default_factory=list)
@@ -22,14 +24,15 @@ class Parselmouth:
     __sound_data : parselmouth.Sound
 
     def __init__(self, filepath: str):
-        self.__sound_data = parselmouth.Sound(filepath)
+        self.__sound_data = file_sound(filepath)
 
     def get_sound(self) -> Sound:
-       return Sound(self.__sound_data.xs(), self.__sound_data.values)
+       # values is a view on the samples of the shared sound
+       return Sound(self.__sound_data.xs(), self.__sound_data.values.copy())
        #return Sound(self.__sound_data.xs(), self.__sound_data.values[0])
 
     def get_spectrogram(self):
-        spectrogram = self.__sound_data.to_spectrogram()
+        spectrogram = analysis(self.__sound_data, "To Spectrogram", 0.005, 5000, 0.002, 20, "Gaussian")
         linear_values = 10 * numpy.log10(spectrogram.values)
 
         spect = Spectrogram(
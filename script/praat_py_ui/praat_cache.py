@@ -0,0 +1,96 @@
+import hashlib
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import numpy.typing as npt
+import parselmouth
+from parselmouth.praat import call
+
+
+# Analysis objects kept per sound, least recently used dropped first.
+MAX_OBJECTS = 16
+# Sounds kept per kind of source (files, sample arrays).
+MAX_SOUNDS = 4
+
+# reentrant: dropping a sound under the lock runs _forget in the same thread
+_lock = threading.RLock()
+# id of the sound -> OrderedDict of (command, arguments) -> Praat object.
+# An entry is dropped when its sound is garbage collected.
+_objects: dict[int, OrderedDict] = {}
+_file_sounds: OrderedDict[tuple, parselmouth.Sound] = OrderedDict()
+_sample_sounds: OrderedDict[tuple, parselmouth.Sound] = OrderedDict()
+
+
+def _remember(sounds: OrderedDict, key: tuple, sound: parselmouth.Sound) -> parselmouth.Sound:
+    sounds[key] = sound
+    if len(sounds) > MAX_SOUNDS:
+        sounds.popitem(last=False)
+    return sound
+
+
+def file_sound(audio_path: str) -> parselmouth.Sound:
+    """
+    The Sound of a file, read once while the file is unchanged, so that the
+    analysis objects computed from it are shared by every curve of the file.
+    """
+    status = os.stat(audio_path)
+    key = (os.path.realpath(audio_path), status.st_mtime_ns, status.st_size)
+    with _lock:
+        if key in _file_sounds:
+            _file_sounds.move_to_end(key)
+            return _file_sounds[key]
+
+    sound = parselmouth.Sound(audio_path)
+    with _lock:
+        return _remember(_file_sounds, key, _file_sounds.get(key, sound))
+
+
+def samples_sound(x: npt.NDArray, sr: float) -> parselmouth.Sound:
+    """
+    The Sound of a signal starting at time 0, one per signal content: the
+    analyses of the same samples, even read separately, share their objects.
+    """
+    x = np.ascontiguousarray(x)
+    digest = hashlib.blake2b(x.view(np.uint8), digest_size=16).hexdigest()
+    key = (digest, x.dtype.str, x.shape, float(sr))
+    with _lock:
+        if key in _sample_sounds:
+            _sample_sounds.move_to_end(key)
+            return _sample_sounds[key]
+
+    sound = parselmouth.Sound(values=x, sampling_frequency=sr, start_time=0.0)
+    with _lock:
+        return _remember(_sample_sounds, key, _sample_sounds.get(key, sound))
+
+
+def analysis(sound: parselmouth.Sound, command: str, *args):
+    """
+    Result of the Praat `command` with `args` applied to sound, computed once
+    per sound. The object is shared: it must not be modified.
+    """
+    key = (command, args)
+    with _lock:
+        objects = _objects.get(id(sound))
+        if objects is None:
+            objects = _objects[id(sound)] = OrderedDict()
+            weakref.finalize(sound, _forget, id(sound), objects)
+        elif key in objects:
+            objects.move_to_end(key)
+            return objects[key]
+
+    result = call(sound, command, *args)
+    with _lock:
+        objects[key] = result
+        if len(objects) > MAX_OBJECTS:
+            objects.popitem(last=False)
+    return result
+
+
+def _forget(sound_id: int, objects: OrderedDict) -> None:
+    with _lock:
+        # the id may already be reused by a newer sound
+        if _objects.get(sound_id) is objects:
+            del _objects[sound_id]
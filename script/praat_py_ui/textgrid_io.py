@@ -0,0 +1,327 @@
+import codecs
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+import numpy.typing as npt
+import tgt
+
+
+# Long and short TextGrid files hold the same values in the same order, only
+# the long format adds "key =" prefixes and "[n]" item indices. Reading the
+# string, number and flag tokens (and skipping the indices) parses both.
+TOKEN_PATTERN = re.compile(
+    r'"[^"]*(?:""[^"]*)*"'
+    r'|\[\d*\]'
+    r'|<\w+>'
+    r'|[-\d.][\d.eE+-]*'
+)
+
+
+def _unquote(token: str) -> str:
+    return token[1:-1].replace('""', '"')
+
+
+def _quote(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _label_table(texts: list[str]) -> tuple[npt.NDArray, npt.NDArray]:
+    """Distinct labels in order of appearance, and the label index of each text."""
+    table = {}
+    label_ids = np.fromiter(
+        (table.setdefault(text, len(table)) for text in texts),
+        dtype=np.int32, count=len(texts),
+    )
+    labels = np.empty(len(table), dtype=object)
+    labels[:] = list(table)
+    return labels, label_ids
+
+
+@dataclass
+class ColumnarIntervalTier:
+    """
+    Interval tier stored as arrays: interval i spans [starts[i], ends[i]] and
+    is labelled labels[label_ids[i]]. Intervals are sorted by time.
+    """
+    name: str
+    start_time: float
+    end_time: float
+    starts: npt.NDArray
+    ends: npt.NDArray
+    label_ids: npt.NDArray
+    labels: npt.NDArray
+    _tgt: tgt.core.IntervalTier | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_texts(cls, name, start_time, end_time, starts, ends, texts) -> "ColumnarIntervalTier":
+        labels, label_ids = _label_table(texts)
+        return cls(
+            name, float(start_time), float(end_time),
+            np.asarray(starts, dtype=float), np.asarray(ends, dtype=float),
+            label_ids, labels,
+        )
+
+    @classmethod
+    def from_tgt(cls, tier: tgt.core.IntervalTier) -> "ColumnarIntervalTier":
+        return cls.from_texts(
+            tier.name, tier.start_time, tier.end_time,
+            [interval.start_time for interval in tier.intervals],
+            [interval.end_time for interval in tier.intervals],
+            [interval.text for interval in tier.intervals],
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def tier_type(self) -> str:
+        return "IntervalTier"
+
+    @property
+    def texts(self) -> npt.NDArray:
+        return self.labels[self.label_ids]
+
+    def interval_at(self, times: npt.ArrayLike) -> npt.NDArray:
+        """
+        Index of the interval containing each time, -1 outside of every interval.
+        A time on the boundary between two intervals belongs to the first one.
+        """
+        times = np.asarray(times, dtype=float)
+
+        # first interval ending at or after each time
+        index = np.searchsorted(self.ends, times, side='left')
+        inside = index < len(self.ends)
+        inside[inside] &= self.starts[index[inside]] <= times[inside]
+
+        return np.where(inside, index, -1)
+
+    def label_at(self, times: npt.ArrayLike, empty: str = "") -> npt.NDArray:
+        index = self.interval_at(times)
+        if len(self) == 0:
+            return np.full(len(index), empty, dtype=object)
+
+        labels = np.append(self.labels, empty).astype(object)
+        # -1 picks the empty label appended at the end
+        return labels[np.where(index >= 0, self.label_ids[index], -1)]
+
+    def to_tgt(self) -> tgt.core.IntervalTier:
+        """Equivalent `tgt` tier, built on the first call."""
+        if self._tgt is None:
+            tier = tgt.core.IntervalTier(self.start_time, self.end_time, self.name)
+            tier.add_intervals([
+                tgt.core.Interval(start, end, text)
+                for start, end, text in zip(self.starts.tolist(), self.ends.tolist(), self.texts)
+            ])
+            self._tgt = tier
+        return self._tgt
+
+
+@dataclass
+class ColumnarPointTier:
+    """Point tier stored as arrays, point i is at times[i] and labelled labels[label_ids[i]]."""
+    name: str
+    start_time: float
+    end_time: float
+    times: npt.NDArray
+    label_ids: npt.NDArray
+    labels: npt.NDArray
+    _tgt: tgt.core.PointTier | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def from_texts(cls, name, start_time, end_time, times, texts) -> "ColumnarPointTier":
+        labels, label_ids = _label_table(texts)
+        return cls(
+            name, float(start_time), float(end_time),
+            np.asarray(times, dtype=float), label_ids, labels,
+        )
+
+    @classmethod
+    def from_tgt(cls, tier: tgt.core.PointTier) -> "ColumnarPointTier":
+        return cls.from_texts(
+            tier.name, tier.start_time, tier.end_time,
+            [point.time for point in tier.points],
+            [point.text for point in tier.points],
+        )
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def tier_type(self) -> str:
+        return "TextTier"
+
+    @property
+    def texts(self) -> npt.NDArray:
+        return self.labels[self.label_ids]
+
+    def to_tgt(self) -> tgt.core.PointTier:
+        if self._tgt is None:
+            tier = tgt.core.PointTier(self.start_time, self.end_time, self.name)
+            tier.add_points([
+                tgt.core.Point(time, text)
+                for time, text in zip(self.times.tolist(), self.texts)
+            ])
+            self._tgt = tier
+        return self._tgt
+
+
+ColumnarTier = ColumnarIntervalTier | ColumnarPointTier
+
+
+@dataclass
+class ColumnarTextGrid:
+    start_time: float
+    end_time: float
+    tiers: list[ColumnarTier]
+
+    @classmethod
+    def from_tgt(cls, textgrid: tgt.core.TextGrid) -> "ColumnarTextGrid":
+        tiers = []
+        for tier in textgrid.tiers:
+            if isinstance(tier, tgt.core.IntervalTier):
+                tiers.append(ColumnarIntervalTier.from_tgt(tier))
+            else:
+                tiers.append(ColumnarPointTier.from_tgt(tier))
+        return cls(textgrid.start_time, textgrid.end_time, tiers)
+
+    def get_tier_names(self) -> list[str]:
+        return [tier.name for tier in self.tiers]
+
+    def get_tier_by_name(self, name: str) -> ColumnarTier:
+        for tier in self.tiers:
+            if tier.name == name:
+                return tier
+        raise ValueError(f"TextGrid has no tier named '{name}'")
+
+    def interval_tiers(self) -> list[ColumnarIntervalTier]:
+        return [tier for tier in self.tiers if isinstance(tier, ColumnarIntervalTier)]
+
+    def to_tgt(self) -> tgt.core.TextGrid:
+        textgrid = tgt.core.TextGrid()
+        for tier in self.tiers:
+            textgrid.add_tier(tier.to_tgt())
+        return textgrid
+
+
+def _decode(raw: bytes) -> str:
+    if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return raw.decode("utf-16")
+    if raw.startswith(codecs.BOM_UTF8):
+        return raw.decode("utf-8-sig")
+
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def parse_textgrid(content: str) -> ColumnarTextGrid:
+    """Parses the content of a long or short text TextGrid file."""
+    tokens = [
+        token for token in TOKEN_PATTERN.findall(content)
+        if token[0] != "["
+    ]
+
+    if len(tokens) < 2 or _unquote(tokens[1]) != "TextGrid":
+        raise ValueError("Not a TextGrid file")
+
+    start_time, end_time = float(tokens[2]), float(tokens[3])
+    if tokens[4] != "<exists>":
+        return ColumnarTextGrid(start_time, end_time, [])
+
+    tier_count = int(tokens[5])
+    position = 6
+    tiers = []
+
+    for _ in range(tier_count):
+        tier_class = _unquote(tokens[position])
+        name = _unquote(tokens[position + 1])
+        tier_start, tier_end = float(tokens[position + 2]), float(tokens[position + 3])
+        count = int(tokens[position + 4])
+        position += 5
+
+        if tier_class == "IntervalTier":
+            values = tokens[position:position + 3 * count]
+            position += 3 * count
+            tiers.append(ColumnarIntervalTier.from_texts(
+                name, tier_start, tier_end,
+                np.array(values[0::3], dtype=float),
+                np.array(values[1::3], dtype=float),
+                [_unquote(text) for text in values[2::3]],
+            ))
+        elif tier_class == "TextTier":
+            values = tokens[position:position + 2 * count]
+            position += 2 * count
+            tiers.append(ColumnarPointTier.from_texts(
+                name, tier_start, tier_end,
+                np.array(values[0::2], dtype=float),
+                [_unquote(text) for text in values[1::2]],
+            ))
+        else:
+            raise ValueError(f"Unknown tier class '{tier_class}'")
+
+    return ColumnarTextGrid(start_time, end_time, tiers)
+
+
+def read_textgrid(path: str) -> ColumnarTextGrid:
+    with open(path, "rb") as file:
+        return parse_textgrid(_decode(file.read()))
+
+
+def _format_time(time: float) -> str:
+    return repr(float(time))
+
+
+def format_textgrid(textgrid: ColumnarTextGrid, short: bool = False) -> str:
+    """Content of the TextGrid in Praat's long (default) or short text format."""
+    lines = ['File type = "ooTextFile"', 'Object class = "TextGrid"', ""]
+
+    def header(values: list[tuple[str, str]], indent: str) -> None:
+        if short:
+            lines.extend(value for _, value in values)
+        else:
+            lines.extend(f"{indent}{key} = {value} " for key, value in values)
+
+    header([("xmin", _format_time(textgrid.start_time)), ("xmax", _format_time(textgrid.end_time))], "")
+    if short:
+        lines.extend(["<exists>", str(len(textgrid.tiers))])
+    else:
+        lines.extend(["tiers? <exists> ", f"size = {len(textgrid.tiers)} ", "item []: "])
+
+    for tier_number, tier in enumerate(textgrid.tiers, start=1):
+        is_interval = isinstance(tier, ColumnarIntervalTier)
+        element = "intervals" if is_interval else "points"
+
+        if not short:
+            lines.append(f"    item [{tier_number}]:")
+        header([
+            ("class", _quote(tier.tier_type())),
+            ("name", _quote(tier.name)),
+            ("xmin", _format_time(tier.start_time)),
+            ("xmax", _format_time(tier.end_time)),
+        ], " " * 8)
+        if short:
+            lines.append(str(len(tier)))
+        else:
+            lines.append(f"        {element}: size = {len(tier)} ")
+
+        texts = [_quote(text) for text in tier.texts]
+        if is_interval:
+            columns = [map(_format_time, tier.starts.tolist()), map(_format_time, tier.ends.tolist()), texts]
+            keys = ("xmin", "xmax", "text")
+        else:
+            columns = [map(_format_time, tier.times.tolist()), texts]
+            keys = ("number", "mark")
+
+        if short:
+            lines.extend(value for row in zip(*columns) for value in row)
+        else:
+            for number, row in enumerate(zip(*columns), start=1):
+                lines.append(f"        {element} [{number}]:")
+                lines.extend(f"            {key} = {value} " for key, value in zip(keys, row))
+
+    return "\n".join(lines) + "\n"
+
+
+def write_textgrid(textgrid: ColumnarTextGrid, path: str, short: bool = False) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(format_textgrid(textgrid, short))
@@ -72,9 +72,10 @@ class IntervalTierTGTConvert(TextgridConverter):
     def from_textgrid(self, it: tgt.core.IntervalTier) -> IntervalTier:
         interval_tier = IntervalTier(it.name, it.start_time, it.end_time, self)
 
-        for el in it.intervals:
-            interval = IntervalMarker.new_interval(el.start_time, el.end_time, el.text)
-            interval_tier.add_element(interval)
+        interval_tier.add_elements([
+            IntervalMarker.new_interval(el.start_time, el.end_time, el.text)
+            for el in it.intervals
+        ])
 
         return interval_tier
 
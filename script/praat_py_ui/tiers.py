@@ -1,3 +1,4 @@
+from bisect import bisect_left, bisect_right
 from typing import Callable, override
 from abc import ABC, abstractmethod
 from enum import Enum
@@ -10,6 +11,7 @@ import pyqtgraph as pg
 from pyqtgraph.GraphicsScene.mouseEvents import HoverEvent
 
 from bidict import bidict
+import numpy as np
 
 from .markers import Marker, IntervalMarker, MarkerList, IntervalMarkerList
 
@@ -161,8 +163,7 @@ class PointTier(Tier):
     @override
     def change_element_position(self, marker: Marker, new_value: float) -> None:
         previous_value = marker.position
-        marker.position = new_value
-        self.mlist.notify_marker_changed()
+        self.mlist.move_marker(marker, new_value)
         self.ELEMENT_POSITION_CHANGED.emit(previous_value, new_value)
 
     @override
@@ -188,20 +189,45 @@ class PointTier(Tier):
 
 
 class IntervalTier(Tier):
-    mlist: IntervalMarker
+    """
+    Interval tier whose boundaries can be dragged and labels typed in.
+
+    Lines and labels only exist for the boundaries inside the view: they
+    are created when they come into view and removed when they leave it.
+    While more than `max_lines` boundaries are in view they are drawn as a
+    single curve, too dense to be dragged. Moving a boundary only updates
+    its line and the labels of the two intervals around it.
+    """
+    mlist: IntervalMarkerList
     marker_to_display: bidict[Marker, pg.InfiniteLine]
-    display_change_events: dict[pg.InfiniteLine]
     marker_label: dict[Marker, pg.TextItem]
+    fixed_markers: set[Marker]
     last_mouse_position = None
 
-    def __init__(self, name: str, start_time: float, end_time: float, converter):
+    def __init__(
+        self,
+        name: str,
+        start_time: float,
+        end_time: float,
+        converter,
+        max_lines: int = 1000,
+        max_labels: int = 300,
+    ):
         super().__init__(name, TierType.POINT_TIER, start_time, end_time, converter)
 
         self.mlist = IntervalMarkerList()
         self.marker_to_display = bidict()
-        self.display_change_events = {}
         self.marker_label = {}
+        self.fixed_markers = set()
         self.last_mouse_position = None
+        self.max_lines = max_lines
+        self.max_labels = max_labels
+
+        self.overview = pg.PlotCurveItem(pen=THEME_PEN, connect="pairs")
+        self.overview.setVisible(False)
+        self.addItem(self.overview, ignoreBounds=True)
+
+        self.getViewBox().sigXRangeChanged.connect(self.update_view)
 
         self.add_element(
             IntervalMarker.new_interval(start_time, end_time), movable=False
@@ -224,11 +250,11 @@ class IntervalTier(Tier):
 
         my = self.plotItem.vb.mapSceneToView(self.last_mouse_position).x()
 
-        last_smaller = max(
-            (m for m in self.mlist.get_markers() if m.position <= my), default=None
-        )
+        last_smaller = self.mlist.get_marker_before(my)
 
-        text_label = self.marker_label[last_smaller]
+        text_label = self.marker_label.get(last_smaller)
+        if text_label is None:
+            return
 
         old_text = text_label.toPlainText()
 
@@ -242,27 +268,19 @@ class IntervalTier(Tier):
 
         last_smaller.name = text_label.toPlainText()
 
-    def __change_pos(self, line):
-        m1 = self.marker_to_display.inverse[line]
-        m1.position = line.value()
-        self.mlist.notify_marker_changed()
-        self.ELEMENT_POSITION_CHANGED.emit(previous_value, new_value)
+    def __visible_range(self) -> tuple[int, int]:
+        """Indices [first, last) of the boundaries in view, with the one before the view."""
+        (xmin, xmax), _ = self.viewRange()
+        first = max(bisect_left(self.mlist.positions, xmin) - 1, 0)
+        last = bisect_right(self.mlist.positions, xmax)
+        return first, last
 
-    def __create_line(self, marker: Marker, movable: bool = True) -> pg.InfiniteLine:
+    def __create_line(self, marker: Marker) -> pg.InfiniteLine:
         if marker in self.marker_to_display:
             return self.marker_to_display[marker]
 
-        same_pos = filter(
-            lambda l: marker.compare_position(l.value()), self.marker_to_display.inverse
-        )
-
-        same_pos = list(same_pos)
-
-        if len(same_pos) > 0:
-            return same_pos[0]
-
         element_line = pg.InfiniteLine(
-            pos=marker.position, pen=THEME_PEN, movable=movable
+            pos=marker.position, pen=THEME_PEN, movable=marker not in self.fixed_markers
         )
 
         self.addItem(element_line)
@@ -276,70 +294,113 @@ class IntervalTier(Tier):
 
         return element_line
 
-    def __create_label(self, marker: Marker) -> pg.TextItem:
-        if marker in self.marker_label:
-            text_item = self.marker_label[marker]
-            text_item.setPlainText(marker.name)
+    def __update_label(self, marker_idx: int, create: bool = False) -> None:
+        """Places the label of the interval starting at the given boundary."""
+        if not 0 <= marker_idx < len(self.mlist) - 1:
             return
 
-        marker_idx = self.mlist.get_marker_idx(marker)
+        marker = self.mlist.get_marker(marker_idx)
+        neighboor = self.mlist.get_marker(marker_idx + 1)
 
-        if marker_idx >= len(self.mlist.get_markers()) - 1:
-            return
+        text_item = self.marker_label.get(marker)
+        if text_item is None:
+            if not create:
+                return
 
-        text_item = pg.TextItem(text=marker.name, color=(0, 0, 0), anchor=(0.5, 1))
-        text_item.setFont(pg.QtGui.QFont("Arial", 14))
+            text_item = pg.TextItem(text=marker.name, color=(0, 0, 0), anchor=(0.5, 1))
+            text_item.setFont(pg.QtGui.QFont("Arial", 14))
+            self.addItem(text_item)
+            self.marker_label[marker] = text_item
+        else:
+            text_item.setPlainText(marker.name)
 
-        self.addItem(text_item)
-        self.marker_label[marker] = text_item
+        text_item.setPos((marker.position + neighboor.position) / 2, 0.5)
 
-        self.__config_text_pos_change(marker)
+    def __remove_label(self, marker: Marker) -> None:
+        text_item = self.marker_label.pop(marker, None)
+        if text_item is not None:
+            self.removeItem(text_item)
 
-        return text_item
+    def __remove_hidden(self, lines: set[Marker], labels: set[Marker]) -> None:
+        """Removes the lines and labels of the boundaries not in the given sets."""
+        for marker in [marker for marker in self.marker_to_display if marker not in lines]:
+            self.removeItem(self.marker_to_display.pop(marker))
 
-    def __config_text_pos_change(self, marker: Marker) -> None:
-        line = self.marker_to_display[marker]
-        marker_idx = self.mlist.get_marker_idx(marker)
+        for marker in [marker for marker in self.marker_label if marker not in labels]:
+            self.__remove_label(marker)
 
-        text_item = self.marker_label[marker]
+    def update_view(self) -> None:
+        """Shows the lines and labels of the boundaries in view, or the overview curve."""
+        first, last = self.__visible_range()
 
-        neighboor = self.mlist.get_marker(marker_idx + 1)
-        nline = self.marker_to_display[neighboor]
+        if last - first > self.max_lines:
+            self.__remove_hidden(set(), set())
+            positions = self.mlist.positions[first:last]
+            self.overview.setData(np.repeat(positions, 2), np.tile([0.0, 1.0], len(positions)))
+            self.overview.setVisible(True)
+            return
 
-        text_item.setPos((line.value() + nline.value()) / 2, 0.5)
-        line.sigPositionChanged.connect(
-            lambda l: text_item.setPos((line.value() + nline.value()) / 2, 0.5)
-        )
-        nline.sigPositionChanged.connect(
-            lambda l: text_item.setPos((line.value() + nline.value()) / 2, 0.5)
-        )
+        self.overview.setVisible(False)
+        visible = self.mlist.elements[first:last]
+        show_labels = last - first <= self.max_labels
+        self.__remove_hidden(set(visible), set(visible) if show_labels else set())
+
+        for marker in visible:
+            self.__create_line(marker)
 
-    def __config_event_listeners(self):
-        for m, text_item in self.marker_label.items():
-            l = self.marker_to_display[m]
-            self.__config_text_pos_change(m)
+        if not show_labels:
+            return
+
+        for marker_idx in range(first, last):
+            if self.mlist.get_marker(marker_idx) not in self.marker_label:
+                self.__update_label(marker_idx, create=True)
+
+    def __update_around(self, marker: Marker) -> None:
+        marker_idx = self.mlist.get_marker_idx(marker)
+        first, last = self.__visible_range()
+
+        for idx in (marker_idx - 1, marker_idx):
+            self.__update_label(idx, create=first <= idx < last)
 
     @override
     def add_element(self, element: IntervalMarker, movable: bool = True):
         self.mlist.add_interval(element)
 
-        l1 = self.__create_line(element.start_time, movable)
-        l2 = self.__create_line(element.end_time, movable)
+        if not movable:
+            self.fixed_markers.update((element.start_time, element.end_time))
 
-        tl = self.__create_label(element.start_time)
-        t2 = self.__create_label(element.end_time)
+        for marker in (element.start_time, element.end_time):
+            self.__update_around(marker)
+        self.update_view()
 
-        self.__config_event_listeners()
+    def add_elements(self, elements: list[IntervalMarker]) -> None:
+        """Adds sorted, non-overlapping intervals, e.g. all those of a TextGrid tier."""
+        self.mlist.add_intervals(elements)
+
+        # labels of the intervals split by the new boundaries
+        for text_item in self.marker_label.values():
+            self.removeItem(text_item)
+        self.marker_label.clear()
+
+        self.update_view()
 
     @override
     def remove_element_by_idx(self, index: int) -> None:
         removed_marker = self.mlist.remove_marker_by_idx(index)
         self.remove_element(removed_marker)
 
+        # the neighbouring intervals were merged
+        first, last = self.__visible_range()
+        for idx in (index - 1, index):
+            self.__update_label(idx, create=first <= idx < last)
+        self.update_view()
+
     @override
     def remove_element(self, element: Marker) -> None:
-        marker_line = self.marker_to_display.pop(element)
-        self.removeItem(marker_line)
+        marker_line = self.marker_to_display.pop(element, None)
+        if marker_line is not None:
+            self.removeItem(marker_line)
+        self.__remove_label(element)
 
     @override
     def get_element(self, index: int) -> IntervalMarker:
@@ -369,8 +430,9 @@ class IntervalTier(Tier):
             return
 
         previous_value = marker.position
-        marker.position = new_value
-        self.mlist.notify_marker_changed()
+        self.mlist.move_marker(marker, new_value)
+        self.__update_around(marker)
+        self.update_view()
         self.ELEMENT_POSITION_CHANGED.emit(previous_value, new_value)
 
 
@@ -0,0 +1,226 @@
+import numpy as np
+import numpy.typing as npt
+from PyQt5 import QtCore
+
+from calc import calc_formants, calculate_amplitude_envelope, get_f0, get_velocity, postprocess_f0
+from mfcc import get_MFCCs, get_MFCCs_change_from
+from praat_py_ui.praat_cache import file_sound
+from region_analysis import crop, load_region, read_region
+from sweep import f0_postprocessing
+
+
+class StalePreview(Exception):
+    """Raised between two stages of a preview which is not wanted anymore."""
+
+
+class PreviewCalculator:
+    """
+    Curves of the custom analyses over one region of a file, for previewing
+    their parameters.
+
+    The region is analysed with some padding so that the filters do not
+    show edge effects. The intermediate stages (samples, resampled samples,
+    MFCC matrix, raw pitch track) are kept, keyed by the parameters they
+    depend on, so that editing a later parameter only computes the later
+    stages again.
+    """
+    max_entries = 8  # per stage
+
+    def __init__(self, audio_path: str, start: float, end: float, padding: float = 0.5) -> None:
+        self.audio_path = audio_path
+        self.start = start
+        self.end = end
+        self.padding = padding
+        self.stages = {}
+
+    def stage(self, name: str, key: tuple, compute, is_stale=None):
+        entries = self.stages.setdefault(name, {})
+        if key in entries:
+            # most recently used last
+            entries[key] = entries.pop(key)
+            return entries[key]
+
+        if is_stale is not None and is_stale():
+            raise StalePreview()
+
+        value = compute()
+        entries[key] = value
+        if len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+        return value
+
+    def samples(self, is_stale=None) -> tuple[npt.NDArray, int, float]:
+        """First channel of the padded region, at the sample rate of the file."""
+        def compute():
+            signal, sample_rate, offset = read_region(
+                self.audio_path, self.start - self.padding, self.end + self.padding
+            )
+            if signal.ndim > 1:
+                signal = signal[:, 0]
+            return signal, sample_rate, offset
+
+        return self.stage("samples", (), compute, is_stale)
+
+    def calculate(self, analysis: str, params: dict, is_stale=None) -> tuple[npt.NDArray, npt.NDArray]:
+        """
+        @Param analysis: key of the configuration ("mfcc", "amplitude",
+        "formant1"...) as in UnifiedConfigDialog.get_parameters
+        @Param is_stale: tells whether the result is still wanted, checked
+        before each stage computed
+        """
+        if analysis.startswith("formant"):
+            x, y = self.formant(int(analysis[-1]), params, is_stale)
+        else:
+            x, y = getattr(self, analysis)(params, is_stale)
+
+        x, y = crop(x, y, self.start, self.end)
+        if params["derivation_type"]:
+            y = get_velocity(
+                y,
+                sr=1.0,
+                difference=params["derivation_type"],
+                method=params["derivative_method"],
+                width=params["sg_width"],
+                accOrder=params["fin_diff_acc_order"],
+                polyOrder=params["sg_poly_order"],
+            )
+        return x, y
+
+    def mfcc(self, params: dict, is_stale=None) -> tuple[npt.NDArray, npt.NDArray]:
+        sample_rate = params["signal_sample_rate"]
+
+        def resample():
+            signal, offset = load_region(
+                self.audio_path, self.start - self.padding, self.end + self.padding, sample_rate
+            )
+            if signal.ndim > 1:
+                signal = signal[0]
+            return signal, offset
+
+        signal, offset = self.stage("resampled", (sample_rate,), resample, is_stale)
+
+        key = (sample_rate, params["tStep"], params["winLen"], params["n_fft"], params["n_mfcc"])
+        mfccs, times = self.stage(
+            "mfcc", key,
+            lambda: get_MFCCs(
+                signal, sample_rate,
+                tStep=params["tStep"], winLen=params["winLen"],
+                n_mfcc=params["n_mfcc"], n_fft=params["n_fft"],
+            ),
+            is_stale,
+        )
+
+        if is_stale is not None and is_stale():
+            raise StalePreview()
+
+        change = get_MFCCs_change_from(
+            mfccs,
+            params["tStep"],
+            removeFirst=params["removeFirst"],
+            filtCutoff=params["filtCutoff"],
+            filtOrd=params["filtOrd"],
+            diffMethod=params["diffMethod"],
+            outFilter=params["outFilter"],
+            outFiltType=params["outFiltType"],
+            outFiltCutOff=params["outFiltCutOff"],
+            outFiltLen=params["outFiltLen"],
+            outFiltPolyOrd=params["outFiltPolyOrd"],
+        )
+        return times + offset, change
+
+    def amplitude(self, params: dict, is_stale=None) -> tuple[npt.NDArray, npt.NDArray]:
+        signal, sample_rate, offset = self.samples(is_stale)
+
+        if is_stale is not None and is_stale():
+            raise StalePreview()
+
+        amplitude, times = calculate_amplitude_envelope(
+            signal,
+            sample_rate,
+            method=params["method"],
+            winLen=params["winLen"],
+            hopLen=params["hopLen"],
+            center=params["center"],
+            outFilter=params["outFilter"],
+            outFiltType=params["outFiltType"],
+            outFiltCutOff=params["outFiltCutOff"],
+            outFiltLen=params["outFiltLen"],
+            outFiltPolyOrd=params["outFiltPolyOrd"],
+            outSr=params["outSr"],
+        )
+        return np.asarray(times) + offset, amplitude
+
+    def f0(self, params: dict, is_stale=None) -> tuple[npt.NDArray, npt.NDArray]:
+        signal, sample_rate, offset = self.samples(is_stale)
+
+        key = (params["method"], params["hopSize"], params["minPitch"], params["maxPitch"])
+        f0, times = self.stage(
+            "pitch", key,
+            lambda: get_f0(
+                signal, sample_rate,
+                method=params["method"], hopSize=params["hopSize"],
+                minPitch=params["minPitch"], maxPitch=params["maxPitch"],
+                interpUnvoiced=None, outFilter=None,
+            ),
+            is_stale,
+        )
+
+        if is_stale is not None and is_stale():
+            raise StalePreview()
+
+        return times + offset, postprocess_f0(f0, **f0_postprocessing(params))
+
+    def formant(self, number: int, params: dict, is_stale=None) -> tuple[npt.NDArray, npt.NDArray]:
+        # the whole sound, so that the frames and the energy gate are those of the applied curve
+        sound = file_sound(self.audio_path)
+
+        if is_stale is not None and is_stale():
+            raise StalePreview()
+
+        times, *formants = calc_formants(
+            sound,
+            self.start,
+            self.end,
+            energy_threshold=params["energy_threshold"],
+            time_step=params["time_step"],
+            max_number_of_formants=params["max_num_formants"],
+            maximum_formant=params["max_formant"],
+            window_length=params["window_length"],
+            pre_emphasis_from=params["pre_emphasis_from"],
+            method=params["method"],
+            spans=[(self.start - self.padding, self.end + self.padding)],
+        )
+        return np.asarray(times), formants[number - 1]
+
+
+class PreviewWorker(QtCore.QObject):
+    """
+    Computes previews in its own thread. Only the most recent request is
+    computed: the requests which became stale are skipped, or abandoned at
+    their next stage when they are already running.
+    """
+    finished = QtCore.pyqtSignal(int, object, object)
+    failed = QtCore.pyqtSignal(int, str)
+
+    def __init__(self, calculator: PreviewCalculator) -> None:
+        super().__init__()
+        self.calculator = calculator
+        self.latest = 0
+
+    @QtCore.pyqtSlot(int, str, object)
+    def calculate(self, generation: int, analysis: str, params: dict) -> None:
+        def is_stale() -> bool:
+            return generation != self.latest
+
+        if is_stale():
+            return
+
+        try:
+            x, y = self.calculator.calculate(analysis, params, is_stale)
+        except StalePreview:
+            return
+        except Exception as error:
+            self.failed.emit(generation, str(error))
+            return
+
+        self.finished.emit(generation, x, y)
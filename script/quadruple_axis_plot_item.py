@@ -1,13 +1,16 @@
 from typing import override
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import ClassVar
 from enum import Enum
 
 from PyQt5 import QtWidgets, QtCore, QtGui
 import pyqtgraph as pg
 import numpy as np
 from bidict import bidict
-import tgt
 
+from curve_statistics import StatisticsIndex
+from level_of_detail import MinMaxPyramid
+from praat_py_ui.textgrid_io import ColumnarPointTier, ColumnarTier
 from praat_py_ui.parselmouth_calc import Sound, Spectrogram, Parselmouth
 from praat_py_ui import spectrogram as display_spect
 
@@ -198,6 +201,16 @@ class CalculationValues:
     toolbar: "ManualPointManagement"  # Reference to the toolbar instance
     threshold: float = 0.2  # Define a threshold for proximity
     default_range: tuple[float, float] | None = None
+    _statistics: tuple | None = field(default=None, init=False, repr=False)
+    _data: tuple | None = field(default=None, init=False, repr=False)
+    _sorted: tuple | None = field(default=None, init=False, repr=False)
+    _pyramid: MinMaxPyramid | None = field(default=None, init=False, repr=False)
+    _bounds: list | None = field(default=None, init=False, repr=False)
+    _buffers: tuple | None = field(default=None, init=False, repr=False)
+    _view: pg.ViewBox | None = field(default=None, init=False, repr=False)
+
+    # curves longer than this are drawn through min/max decimation levels
+    lod_threshold: ClassVar[int] = 10_000
 
     def __post_init__(self) -> None:
         if not isinstance(
@@ -220,6 +233,14 @@ class CalculationValues:
         if isinstance(self.curve, pg.PlotDataItem):
             self.curve.setCurveClickable(True)
 
+        # auto range on the whole curve, not only on the part drawn
+        self.curve.dataBounds = self.data_bounds
+
+        x, y = self.curve.getData()
+        if x is None or y is None:
+            x, y = np.zeros(0), np.zeros(0)
+        self.set_data(x, y)
+
         self.connect_signals()
 
     def connect_signals(self) -> None:
@@ -239,6 +260,167 @@ class CalculationValues:
     def __hash__(self) -> int:
         return hash(self.curve)
 
+    def statistics(self) -> StatisticsIndex:
+        """Statistics index of the curve data, rebuilt when the data changes."""
+        x, y = self.data()
+
+        if self._statistics is not None:
+            cached_x, cached_y, index = self._statistics
+            if cached_x is x and cached_y is y:
+                return index
+
+        index = StatisticsIndex(x, y)
+        self._statistics = (x, y, index)
+        return index
+
+    def data(self) -> tuple[np.ndarray, np.ndarray]:
+        """Full resolution data of the curve, whatever part of it is drawn."""
+        return self._data
+
+    def set_data(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Replaces the data of the curve, keeping its items in their plot."""
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self._data = (x, y)
+        self._buffers = None
+
+        if np.all(x[1:] >= x[:-1]):
+            self._sorted = self._data
+        else:
+            order = np.argsort(x, kind="stable")
+            self._sorted = (x[order], y[order])
+
+        self._bounds = []
+        for values in (x, y):
+            finite = values[np.isfinite(values)]
+            self._bounds.append(
+                (finite.min(), finite.max()) if len(finite) else (None, None)
+            )
+
+        if len(x) > self.lod_threshold:
+            self._pyramid = MinMaxPyramid(x, y)
+            self.update_view()
+        else:
+            self._pyramid = None
+            self.curve.setData(x=x, y=y)
+
+    def append(self, x: np.ndarray, y: np.ndarray) -> None:
+        """
+        Adds samples at the end of the curve, e.g. the frames of a live
+        feature, in a time proportional to their number: the data is kept
+        in buffers grown by doubling and its bounds and decimation levels
+        are extended rather than computed again.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) == 0:
+            return
+
+        old_x, old_y = self._data
+        size = len(old_x) + len(x)
+        if self._buffers is None or size > len(self._buffers[0]):
+            capacity = max(size, 2 * len(old_x), 1024)
+            self._buffers = (np.resize(old_x, capacity), np.resize(old_y, capacity))
+        buffer_x, buffer_y = self._buffers
+        buffer_x[len(old_x):size] = x
+        buffer_y[len(old_x):size] = y
+
+        in_order = self._sorted is self._data and (len(old_x) == 0 or x[0] >= old_x[-1])
+        self._data = (buffer_x[:size], buffer_y[:size])
+        if in_order and np.all(x[1:] >= x[:-1]):
+            self._sorted = self._data
+        else:
+            order = np.argsort(self._data[0], kind="stable")
+            self._sorted = (self._data[0][order], self._data[1][order])
+
+        for axis, values in enumerate((x, y)):
+            finite = values[np.isfinite(values)]
+            if len(finite) == 0:
+                continue
+            low, high = self._bounds[axis]
+            self._bounds[axis] = (
+                finite.min() if low is None else min(low, finite.min()),
+                finite.max() if high is None else max(high, finite.max()),
+            )
+
+        if self._pyramid is not None:
+            self._pyramid.extend(*self._data)
+            self.update_view()
+        elif size > self.lod_threshold:
+            self._pyramid = MinMaxPyramid(*self._data)
+            self.update_view()
+        else:
+            self.curve.setData(x=self._data[0], y=self._data[1])
+
+    def value_at(self, time: float) -> float:
+        """Value of the sample nearest to `time`, NaN outside of the curve."""
+        x, y = self._sorted
+        if len(x) == 0 or not x[0] <= time <= x[-1]:
+            return np.nan
+
+        index = min(np.searchsorted(x, time), len(x) - 1)
+        if index > 0 and time - x[index - 1] < x[index] - time:
+            index -= 1
+        return y[index]
+
+    def data_bounds(self, ax: int, frac: float = 1.0, orthoRange=None) -> tuple:
+        """
+        dataBounds of the full resolution data: the bounds along ax of the
+        samples whose other coordinate is within orthoRange, or of their
+        central frac fraction.
+        """
+        if frac >= 1.0 and orthoRange is None:
+            return self._bounds[ax]
+
+        x, y = self._sorted
+        if orthoRange is not None:
+            if ax == 1:
+                first = np.searchsorted(x, orthoRange[0], side="left")
+                last = np.searchsorted(x, orthoRange[1], side="right")
+                x, y = x[first:last], y[first:last]
+            else:
+                inside = (orthoRange[0] <= y) & (y <= orthoRange[1])
+                x, y = x[inside], y[inside]
+
+        values = (x, y)[ax]
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return (None, None)
+        if frac >= 1.0:
+            return (values.min(), values.max())
+        return tuple(np.percentile(values, [50 * (1 - frac), 50 * (1 + frac)]))
+
+    def attach_view(self, view: pg.ViewBox) -> None:
+        """Draws the level of detail matching the range and width of the view."""
+        self._view = view
+        view.sigXRangeChanged.connect(self.update_view)
+        view.sigResized.connect(self.update_view)
+        self.update_view()
+
+    def detach_view(self) -> None:
+        if self._view is None:
+            return
+        self._view.sigXRangeChanged.disconnect(self.update_view)
+        self._view.sigResized.disconnect(self.update_view)
+        self._view = None
+
+    def update_view(self) -> None:
+        if self._pyramid is None:
+            return
+
+        if self._view is None:
+            x, y = self._pyramid.select(-np.inf, np.inf, 2000)
+        else:
+            start, end = self._view.viewRange()[0]
+            pixels = int(self._view.width()) or 2000
+            x, y = self._pyramid.select(start, end, pixels)
+
+        self.curve.setData(x=x, y=y)
+
+    def clear_markers(self) -> None:
+        self.min.setData([], [])
+        self.max.setData([], [])
+
     def on_curve_click(self, event: QtGui.QMouseEvent) -> None:
         if event.button() != QtCore.Qt.LeftButton:
             return
@@ -276,7 +458,7 @@ class CalculationValues:
         self, x: float, y: float
     ) -> tuple[float, float] | tuple[None, None]:
         """Find the nearest point on the curve to the given coordinates within a threshold."""
-        existing_x, existing_y = self.curve.getData()
+        existing_x, existing_y = self.data()
 
         # Convert to numpy arrays for easier manipulation
         existing_x = np.array(existing_x)
@@ -400,6 +582,14 @@ class Panel(QuadrupleAxisPlotItem):
 
         super().set_range(axis_to_be_added_to, item.default_range)
 
+        item.attach_view(self.axes[axis_to_be_added_to]["vb"])
+
+    def reset_range(self, item: CalculationValues) -> None:
+        """Gives the axis of the curve its default range again."""
+        axis_id = self.get_item_axis(item)
+        if axis_id is not None:
+            super().set_range(axis_id, item.default_range)
+
     def remove_curve(self, item: CalculationValues) -> None:
         if self.item_count == 0:
             raise ValueError("This Panel does not have any curves")
@@ -411,6 +601,7 @@ class Panel(QuadrupleAxisPlotItem):
             raise ValueError("This curve is is not displayed in any axis")
 
         self.rotation.pop(axis_to_be_removed_from)
+        item.detach_view()
 
         super().remove_item(axis_to_be_removed_from, item.curve)
         super().remove_item(axis_to_be_removed_from, item.min)
@@ -446,7 +637,7 @@ class PanelWidget(QtWidgets.QWidget):
 
 class SoundInformation(pg.GraphicsLayoutWidget):
     sound_data: Sound
-    spectrogram_data: Spectrogram
+    spectrogram_data: Spectrogram | None
 
     selection_region: pg.LinearRegionItem
 
@@ -460,6 +651,7 @@ class SoundInformation(pg.GraphicsLayoutWidget):
 
     def __init__(self) -> None:
         super().__init__()
+        self.spectrogram_data = None
         self.selection_region = pg.LinearRegionItem(swapMode="sort")
         for line in self.selection_region.lines:
             line.setPen(pg.mkPen(color='b', width=5))  
@@ -504,11 +696,17 @@ class SoundInformation(pg.GraphicsLayoutWidget):
         else:
             self.spectrogram_plot.hide()
 
-    def set_data(self, data: Parselmouth) -> None:
+    def set_data(self, data: Parselmouth, spectrogram: Spectrogram | None = None) -> None:
+        """
+        @Param spectrogram: spectrogram of the sound when already known, it
+        is computed otherwise
+        """
         self.selection_region.show()
 
         sound = data.get_sound()
-        spectrogram = data.get_spectrogram()
+        if spectrogram is None:
+            spectrogram = data.get_spectrogram()
+        self.spectrogram_data = spectrogram
 
         self.sound_plot_data_item.setData(sound.timestamps, sound.amplitudes[0])
 
@@ -537,69 +735,100 @@ class SoundInformation(pg.GraphicsLayoutWidget):
             self.sound_plot.setXRange(0, x_max, padding=0)
 
 
-class Interval:
-    name: str
-    parent_plot: pg.PlotItem
-
-    start_line: pg.InfiniteLine
-    end_line: pg.InfiniteLine
-    text_item: pg.TextItem
+class DisplayInterval:
+    """
+    Draws the intervals of a tier over the waveform.
+
+    Only the intervals inside the current view are drawn: their boundaries
+    as one curve of vertical segments, and their labels with `pg.TextItem`s
+    taken from a pool that is recycled whenever the view range changes.
+    When too many intervals are visible for their labels to be readable,
+    only the boundaries are drawn.
+    """
+    audio_widget: SoundInformation
+    tier: ColumnarTier | None
+    labels: list[pg.TextItem]
 
-    def __init__(self, interval: tgt.core.Interval, parent_plot: pg.PlotItem) -> None:
+    def __init__(self, audio_widget: SoundInformation, max_labels: int = 300) -> None:
+        self.audio_widget = audio_widget
+        self.max_labels = max_labels
 
-        self.name = interval.text
-        self.parent_plot = parent_plot
+        self.tier = None
+        self.starts = np.zeros(0)
+        self.ends = np.zeros(0)
+        self.texts = np.zeros(0, dtype=object)
+        self.label_y = 0.0
 
-        self.start_line = pg.InfiniteLine(
-            pos=interval.start_time,
-            angle=90,
-            pen=pg.mkPen("m", style=QtCore.Qt.DashLine, width=2),
+        self.boundaries = pg.PlotCurveItem(
+            pen=pg.mkPen("m", style=QtCore.Qt.DashLine, width=2), connect="pairs"
         )
+        self.boundaries.setVisible(False)
+        self.audio_widget.sound_plot.addItem(self.boundaries, ignoreBounds=True)
 
-        self.end_line = pg.InfiniteLine(
-            pos=interval.end_time,
-            angle=90,
-            pen=pg.mkPen("m", style=QtCore.Qt.DashLine, width=2),
-        )
+        self.labels = []
+        self.label_font = QtGui.QFont("Arial", 12, QtGui.QFont.Bold)
+
+        view_box = self.audio_widget.sound_plot.getViewBox()
+        view_box.sigXRangeChanged.connect(self.update_view)
+        view_box.sigYRangeChanged.connect(self.update_view)
 
-        mid_time = (interval.start_time + interval.end_time) / 2
-        ymax = max(self.parent_plot.listDataItems()[0].yData)
+    def display(self, tier: ColumnarTier) -> None:
+        self.tier = tier
 
-        self.text_item = pg.TextItem(interval.text, anchor=(0.5, 0.5), color="r")
-        self.text_item.setPos(mid_time, ymax * 0.9)
-        self.text_item.setFont(QtGui.QFont("Arial", 12, QtGui.QFont.Bold))
+        if isinstance(tier, ColumnarPointTier):
+            self.starts = self.ends = tier.times
+        else:
+            self.starts, self.ends = tier.starts, tier.ends
+        self.texts = tier.texts
 
-    def add_to_plot_item(self) -> None:
-        self.parent_plot.addItem(self.start_line)
-        self.parent_plot.addItem(self.end_line)
-        self.parent_plot.addItem(self.text_item)
+        # labels are drawn at 90% of the waveform maximum
+        y_data = self.audio_widget.sound_plot_data_item.yData
+        self.label_y = 0.9 * np.max(y_data) if y_data is not None and len(y_data) else 0.0
 
-    def removed_from_plot_item(self) -> None:
-        self.parent_plot.removeItem(self.start_line)
-        self.parent_plot.removeItem(self.end_line)
-        self.parent_plot.removeItem(self.text_item)
+        self.update_view()
 
-    def __hash__(self) -> int:
-        return hash(self.name)
+    def update_view(self) -> None:
+        if self.tier is None:
+            return
 
+        (x_min, x_max), (y_min, y_max) = self.audio_widget.sound_plot.viewRange()
+        first = np.searchsorted(self.ends, x_min, side='left')
+        last = np.searchsorted(self.starts, x_max, side='right')
 
-class DisplayInterval:
-    audio_widget: SoundInformation
-    intervals: list[Interval]
+        starts = self.starts[first:last]
+        ends = self.ends[first:last]
 
-    def __init__(self, audio_widget: SoundInformation) -> None:
-        self.audio_widget = audio_widget
-        self.intervals = []
+        # one vertical segment per boundary
+        positions = np.unique(np.concatenate((starts, ends)))
+        x = np.repeat(positions, 2)
+        y = np.tile([y_min, y_max], len(positions))
+        self.boundaries.setData(x, y)
+        self.boundaries.setVisible(True)
+
+        if len(starts) > self.max_labels:
+            self.show_labels(np.zeros(0), np.zeros(0, dtype=object))
+        else:
+            self.show_labels((starts + ends) / 2, self.texts[first:last])
+
+    def show_labels(self, positions: np.ndarray, texts: np.ndarray) -> None:
+        plot = self.audio_widget.sound_plot
+
+        while len(self.labels) < len(positions):
+            label = pg.TextItem(anchor=(0.5, 0.5), color="r")
+            label.setFont(self.label_font)
+            plot.addItem(label, ignoreBounds=True)
+            self.labels.append(label)
 
-    def display(self, tier: tgt.core.TextGrid) -> None:
-        self.clear()
+        for label, position, text in zip(self.labels, positions, texts):
+            label.setText(text)
+            label.setPos(position, self.label_y)
+            label.setVisible(True)
 
-        for interval in tier:
-            interv = Interval(interval, self.audio_widget.sound_plot)
-            interv.add_to_plot_item()
-            self.intervals.append(interv)
+        for label in self.labels[len(positions):]:
+            label.setVisible(False)
 
     def clear(self) -> None:
-        for interval in self.intervals:
-            interval.removed_from_plot_item()
-        self.intervals.clear()
+        self.tier = None
+        self.boundaries.setVisible(False)
+        for label in self.labels:
+            label.setVisible(False)
@@ -0,0 +1,158 @@
+import numpy as np
+import numpy.typing as npt
+import parselmouth
+from scipy.io import wavfile
+from librosa.core import load as audioLoad
+
+
+def align_start(start: float, step: float | None) -> float:
+    """Start of a region moved back onto the analysis grid of the whole file."""
+    start = max(0.0, start)
+    if step:
+        start = np.floor(start / step + 1e-9) * step
+    return start
+
+
+def read_region(
+    audio_path: str, start: float, end: float, step: float | None = None
+) -> tuple[npt.NDArray, int, float]:
+    """
+    Samples of [start, end] of a wav file, read through a memory map so that
+    only the region is loaded.
+
+    @Param step: the start is aligned on a multiple of step, so that frames
+    computed on the region fall on the frames computed on the whole file
+    @Returns signal (all channels), sample rate, time of the first sample
+    """
+    try:
+        sample_rate, audio_data = wavfile.read(audio_path, mmap=True)
+    except ValueError:
+        # e.g. 24 bit files cannot be memory-mapped
+        sample_rate, audio_data = wavfile.read(audio_path)
+
+    start = align_start(start, step)
+    first = int(round(start * sample_rate))
+    last = min(len(audio_data), int(np.ceil(end * sample_rate)))
+
+    return np.array(audio_data[first:last]), sample_rate, first / sample_rate
+
+
+def load_region(
+    audio_path: str, start: float, end: float, sample_rate: float, step: float | None = None
+) -> tuple[npt.NDArray, float]:
+    """
+    Same as `read_region` for analyses working on resampled audio (librosa).
+
+    @Returns signal (channels first), time of the first sample
+    """
+    start = align_start(start, step)
+    signal, _ = audioLoad(
+        audio_path, sr=sample_rate, mono=False, offset=start, duration=end - start
+    )
+    return signal, start
+
+
+def frame_aligned_part(
+    sound: parselmouth.Sound,
+    start: float,
+    end: float,
+    time_step: float,
+    window_duration: float,
+    origin: float | None = None,
+) -> parselmouth.Sound:
+    """
+    Part of the sound covering [start, end] for a Praat short-term analysis.
+
+    Praat centres the analysis frames in the sound, so the frames of parts
+    extracted at arbitrary times would not line up. The part is cut so that
+    its frames fall on origin + k * time_step, the same grid for every part
+    of the sound. origin is best the time of a frame of the analysis of the
+    whole sound, xmin + window_duration / 2 by default.
+    """
+    if origin is None:
+        origin = sound.xmin + window_duration / 2
+    first = max(0, int(np.floor((start - origin) / time_step)))
+    last = max(first, int(np.ceil((end - origin) / time_step)))
+
+    # a quarter of a step of slack on both sides keeps the frame count exact
+    part_start = origin + first * time_step - window_duration / 2 - time_step / 4
+    part_end = part_start + window_duration + (last - first + 0.5) * time_step
+
+    return sound.extract_part(
+        from_time=part_start, to_time=part_end, preserve_times=True
+    )
+
+
+def crop(
+    x: npt.ArrayLike, y: npt.ArrayLike, start: float, end: float
+) -> tuple[npt.NDArray, npt.NDArray]:
+    x = np.asarray(x)
+    y = np.asarray(y)
+    keep = (x >= start) & (x <= end)
+    return x[keep], y[keep]
+
+
+class IntervalCache:
+    """
+    Samples of a curve computed over separate time spans.
+
+    `missing` tells which parts of a span still have to be computed and `add`
+    merges the samples of a newly computed span, replacing the ones it covers.
+    """
+    spans: list[tuple[float, float]]
+
+    def __init__(self) -> None:
+        self.spans = []
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def missing(self, start: float, end: float) -> list[tuple[float, float]]:
+        """Parts of [start, end] not covered by the computed spans."""
+        missing = []
+        position = start
+
+        for span_start, span_end in self.spans:
+            if span_end < position:
+                continue
+            if span_start > end:
+                break
+            if span_start > position:
+                missing.append((position, span_start))
+            position = max(position, span_end)
+
+        if position < end:
+            missing.append((position, end))
+
+        return missing
+
+    def add(self, start: float, end: float, x: npt.ArrayLike, y: npt.ArrayLike) -> None:
+        x, y = crop(x, y, start, end)
+
+        # the new span replaces the samples it covers
+        first = np.searchsorted(self.x, start, side='left')
+        last = np.searchsorted(self.x, end, side='right')
+
+        self.x = np.concatenate((self.x[:first], x, self.x[last:]))
+        self.y = np.concatenate((self.y[:first], y, self.y[last:]))
+
+        spans = sorted(self.spans + [(start, end)])
+        merged = [spans[0]]
+        for span_start, span_end in spans[1:]:
+            if span_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], span_end))
+            else:
+                merged.append((span_start, span_end))
+        self.spans = merged
+
+    def get(self, start: float = -np.inf, end: float = np.inf) -> tuple[npt.NDArray, npt.NDArray]:
+        first = np.searchsorted(self.x, start, side='left')
+        last = np.searchsorted(self.x, end, side='right')
+        return self.x[first:last], self.y[first:last]
+
+    def clear(self) -> None:
+        self.spans.clear()
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+import numpy.typing as npt
+
+
+# File layout: a fixed prelude, a JSON header, then the arrays. Each array
+# starts on an ALIGNMENT boundary so it can be memory-mapped as it is.
+MAGIC = b"PPUISESS"
+VERSION = 1
+PRELUDE = struct.Struct("<8sIQQ")  # magic, version, header length, data start
+ALIGNMENT = 64
+CHUNK_SIZE = 1 << 20  # elements written at a time
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of the content of a file."""
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def _aligned(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} cannot be stored in a session header")
+
+
+def write_session(path: str, header: dict, arrays: dict[str, npt.ArrayLike]) -> None:
+    """
+    Writes the header (JSON values) and the named arrays to `path`.
+
+    The file is written next to its destination and then moved over it, so
+    that the previous session is left intact when writing fails. On Windows
+    a file cannot be replaced while it is memory-mapped: a session whose
+    arrays from read_session are still in use fails to be overwritten there
+    (OSError), it has to be saved under another name.
+    """
+    arrays = {name: np.asarray(values) for name, values in arrays.items()}
+
+    layout = {}
+    offset = 0
+    for name, values in arrays.items():
+        if values.dtype.hasobject:
+            raise ValueError(f"Array '{name}' holds Python objects")
+        layout[name] = {
+            "offset": offset,
+            "dtype": values.dtype.str,
+            "shape": list(values.shape),
+        }
+        offset = _aligned(offset + values.nbytes)
+
+    content = json.dumps(
+        {**header, "arrays": layout}, default=_json_default
+    ).encode("utf-8")
+    data_start = _aligned(PRELUDE.size + len(content))
+
+    temporary_path = f"{path}.tmp"
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(PRELUDE.pack(MAGIC, VERSION, len(content), data_start))
+            file.write(content)
+
+            for name, values in arrays.items():
+                file.seek(data_start + layout[name]["offset"])
+                flat = values.reshape(-1)
+                for start in range(0, len(flat), CHUNK_SIZE):
+                    file.write(np.ascontiguousarray(flat[start:start + CHUNK_SIZE]).tobytes())
+
+            # the last array may end before its aligned size
+            file.truncate(data_start + offset)
+
+        os.replace(temporary_path, path)
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def read_session(path: str) -> tuple[dict, dict[str, np.memmap]]:
+    """
+    @Returns the header and the arrays, memory-mapped read-only: their
+    content is only read from the disk when it is used. On Windows the file
+    cannot be replaced while they are in use (see write_session).
+    """
+    with open(path, "rb") as file:
+        prelude = file.read(PRELUDE.size)
+        if len(prelude) < PRELUDE.size:
+            raise ValueError("Not a session file")
+
+        magic, version, header_length, data_start = PRELUDE.unpack(prelude)
+        if magic != MAGIC:
+            raise ValueError("Not a session file")
+        if version > VERSION:
+            raise ValueError(f"Session file version {version} is not supported")
+
+        header = json.loads(file.read(header_length).decode("utf-8"))
+
+    arrays = {}
+    for name, description in header.pop("arrays").items():
+        shape = tuple(description["shape"])
+        dtype = np.dtype(description["dtype"])
+        if np.prod(shape) == 0:
+            arrays[name] = np.zeros(shape, dtype=dtype)
+            continue
+        arrays[name] = np.memmap(
+            path, dtype=dtype, mode="r",
+            offset=data_start + description["offset"], shape=shape,
+        )
+
+    return header, arrays
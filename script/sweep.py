@@ -0,0 +1,164 @@
+import itertools
+from concurrent.futures import Future
+
+import numpy as np
+import numpy.typing as npt
+from librosa.core import load as audioLoad
+from scipy.io import wavfile
+
+from calc import get_f0, postprocess_f0
+from mfcc import get_MFCCs, get_MFCCs_change_from
+from worker_pool import executor
+
+
+# Parameters which can be swept, per analysis, with the type of their values.
+SWEEP_PARAMETERS = {
+    "mfcc": {
+        "tStep": float,
+        "winLen": float,
+        "n_fft": int,
+        "n_mfcc": int,
+        "filtCutoff": float,
+        "filtOrd": int,
+        "outFiltCutOff": float,
+    },
+    "f0": {
+        "hopSize": float,
+        "minPitch": float,
+        "maxPitch": float,
+        "outFiltCutOff": float,
+    },
+}
+
+# Parameters of the expensive stage of each analysis: the combinations which
+# only differ by other parameters are computed from the same intermediate.
+SHARED_PARAMETERS = {
+    "mfcc": ("signal_sample_rate", "tStep", "winLen", "n_fft"),
+    "f0": ("method", "hopSize", "minPitch", "maxPitch"),
+}
+
+SweepResult = tuple[dict, npt.NDArray, npt.NDArray]
+
+
+def parse_values(text: str, kind: type = float) -> list:
+    """
+    Values of a swept parameter: either listed ("8 12 16") or given as an
+    inclusive range "start:stop:step" ("8:20:4" gives 8, 12, 16, 20).
+    """
+    text = text.strip()
+    if not text:
+        return []
+
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        if step <= 0:
+            raise ValueError("The step of a range must be positive")
+        values = np.arange(start, stop + step / 2, step)
+        return [kind(round(value, 10)) for value in values]
+
+    return [kind(value) for value in text.replace(",", " ").split()]
+
+
+def combinations(base: dict, values: dict[str, list]) -> list[dict]:
+    """Parameters of every combination of the swept values, the others taken from base."""
+    names = list(values)
+    variants = []
+    for combination in itertools.product(*values.values()):
+        variant = {**base, **dict(zip(names, combination))}
+        if "outFiltCutOff" in values:
+            variant["outFiltCutOff"] = [variant["outFiltCutOff"]]
+        variants.append(variant)
+    return variants
+
+
+def group_variants(analysis: str, variants: list[dict]) -> list[list[dict]]:
+    groups = {}
+    for variant in variants:
+        key = tuple(variant[name] for name in SHARED_PARAMETERS[analysis])
+        groups.setdefault(key, []).append(variant)
+    return list(groups.values())
+
+
+def sweep_mfcc(audio_path: str, variants: list[dict]) -> list[SweepResult]:
+    """
+    MFCC change curves of variants sharing their signal sample rate, time
+    step, window length and FFT size: the MFCC matrix is computed once, with
+    the largest number of coefficients, and each variant filters its rows.
+    """
+    first = variants[0]
+    audio, _ = audioLoad(audio_path, sr=first["signal_sample_rate"], mono=False)
+    if audio.ndim > 1:
+        audio = audio[0]
+
+    mfccs, times = get_MFCCs(
+        audio,
+        first["signal_sample_rate"],
+        tStep=first["tStep"],
+        winLen=first["winLen"],
+        n_mfcc=max(variant["n_mfcc"] for variant in variants),
+        n_fft=first["n_fft"],
+    )
+
+    results = []
+    for variant in variants:
+        change = get_MFCCs_change_from(
+            mfccs[:variant["n_mfcc"]],
+            variant["tStep"],
+            removeFirst=variant["removeFirst"],
+            filtCutoff=variant["filtCutoff"],
+            filtOrd=variant["filtOrd"],
+            diffMethod=variant["diffMethod"],
+            outFilter=variant["outFilter"],
+            outFiltType=variant["outFiltType"],
+            outFiltCutOff=variant["outFiltCutOff"],
+            outFiltLen=variant["outFiltLen"],
+            outFiltPolyOrd=variant["outFiltPolyOrd"],
+        )
+        results.append((variant, times, change))
+    return results
+
+
+def sweep_f0(audio_path: str, variants: list[dict]) -> list[SweepResult]:
+    """
+    F0 curves of variants sharing their method, hop size and pitch range:
+    the pitch is tracked once and each variant applies its own interpolation
+    and output filter, as get_f0 does.
+    """
+    first = variants[0]
+    sig_sr, audio = wavfile.read(audio_path)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+
+    f0, times = get_f0(
+        audio,
+        sig_sr,
+        method=first["method"],
+        hopSize=first["hopSize"],
+        minPitch=first["minPitch"],
+        maxPitch=first["maxPitch"],
+        interpUnvoiced=None,
+        outFilter=None,
+    )
+
+    return [(variant, times, postprocess_f0(f0, **f0_postprocessing(variant))) for variant in variants]
+
+
+def f0_postprocessing(params: dict) -> dict:
+    """Arguments of calc.postprocess_f0 among the parameters of a custom F0 curve."""
+    names = ("hopSize", "interpUnvoiced", "outFilter", "outFiltType", "outFiltCutOff", "outFiltLen", "outFiltPolyOrd")
+    return {name: params[name] for name in names}
+
+
+SWEEPS = {"mfcc": sweep_mfcc, "f0": sweep_f0}
+
+def submit_sweep(analysis: str, audio_path: str, variants: list[dict]) -> list[Future]:
+    """
+    Computes the variants in the worker pool, one task per group of variants
+    sharing their expensive stage.
+
+    @Returns futures whose result is a list of (parameters, times, values)
+    """
+    groups = group_variants(analysis, variants)
+    # the largest groups first, they take the longest
+    groups.sort(key=len, reverse=True)
+    return [executor().submit(SWEEPS[analysis], audio_path, group) for group in groups]
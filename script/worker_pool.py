@@ -0,0 +1,24 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+_executor = None
+
+
+def executor() -> ProcessPoolExecutor:
+    """
+    Pool of worker processes shared by the parallel analyses. It is started
+    on first use and kept, so that only the first task pays for starting the
+    workers.
+    """
+    global _executor
+    if _executor is None:
+        methods = multiprocessing.get_all_start_methods()
+        # Qt runs threads in this process, forking it is not safe
+        method = "forkserver" if "forkserver" in methods else "spawn"
+        _executor = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _executor